@@ -1,4 +1,6 @@
+import json
 import logging
+import os
 import threading
 from datetime import datetime
 
@@ -8,6 +10,7 @@ from backend.modules.pex import PolicyExecutor
 from backend.modules.mem import MemoryExtensionModule
 from backend.components.task_artifact import TaskArtifact
 from backend.components.prompt_engineer import PromptEngineer
+from backend.components import world as world_module
 from backend.components.world import World
 from backend.prompts.for_orchestrator import build_orchestrator_prompt
 
@@ -15,9 +18,9 @@ log = logging.getLogger(__name__)
 
 class Assistant:
 
-    def __init__(self, username: str):
+    def __init__(self, username: str, config=None):
         self.username = username
-        self.config = load_config()
+        self.config = config if config is not None else load_config()
         self.conversation_id: str | None = None
         self.system_prompt: str | None = None
 
@@ -31,12 +34,14 @@ class Assistant:
         self.pex.world = self.world
         self.mem.world = self.world
 
-    def take_turn(self, text:str, dax:str|None=None, payload:dict={}) -> dict:
+    def take_turn(self, text:str, dax:str|None=None, payload:dict={}, on_event=None) -> dict:
         """Run one turn with three async modules:
         * NLU's think (check → detect_flows → fill_slots → validate) runs on a worker thread.
         * The PEX Agent runs on main: prepare(), then one orchestrate() call while state.keep_going.
           Hook 3/5 reads force convergence, and the terminal round's return value is the reply.
-        * MEM stores the turn at the end, including Completed flows only."""
+        * MEM stores the turn at the end, including Completed flows only.
+        Pass `on_event` to receive the PEX Agent's stream events (reply deltas, tool-round progress)
+        while the turn runs; it is called from this thread."""
         def understand_user():
             try:
                 self.nlu.think(text, payload)
@@ -44,8 +49,11 @@ class Assistant:
                 nlu_error.append(ecp)
             finally:
                 self.world.nlu_done.set()  # PEX's waits always wake, even on a crash
+        self.pex.on_event = on_event
         try:
             self._init_session()
+            self.world.state.begin_turn()   # a fresh classify/detect memo for this utterance
+            self.mem.swap_in_compaction()   # a summary precomputed off the last reply, if one is due
             turn_type = 'action' if dax else 'utterance'
             content = {'text': text, 'dax': dax, 'payload': payload} if dax else {'text': text}
             self.world.context.add_turn('user', content, turn_type=turn_type)
@@ -72,10 +80,16 @@ class Assistant:
                 if nlu_error: raise nlu_error[0]
 
             self.mem.recap(reply, self.pex.last_prompt_tokens, self.pex.recently_finished)
+            memo = self.world.state.memo_turn
+            if any(tally['saved'] for tally in memo.values()):
+                log.info('  nlu memo saved llm calls: %s', memo)
             return self._build_payload(reply, self.world.artifacts[-1])
         except Exception as ecp:  # noqa: BLE001 — top-level safety net
             log.exception('take_turn failed: %s', ecp)
             return self._fallback_response("Something went wrong on my end. Please try again.")
+        finally:
+            self.pex.on_event = None
+            self.world.journal.commit()   # a failed turn still persists what it recorded
 
     def contemplation_requested(self):
         requests = self.world.scratchpad.read(origin='orchestrator', keys=['request'])
@@ -121,4 +135,38 @@ class Assistant:
         self.system_prompt = None  # Rebuild and refreeze for the next session.
 
     def close(self):
-        pass
+        self.mem.close()
+        self.world.journal.close()
+
+    # ── Parking (the Manager's session pool) ──────────────────────────
+
+    def park(self) -> str | None:
+        """Write what a reload cannot rebuild — the frozen system prompt, the flow stack and the
+        dialogue state — to the session's parked.json, and return the conversation_id to resume
+        from. The journal is committed first, so history is on disk (the scratchpad always is).
+        None when no session was opened."""
+        if self.system_prompt is None or self.world.conversation_id is None:
+            return None
+        self.world.journal.commit()
+        record = {'username': self.username, 'system_prompt': self.system_prompt,
+                  'flows': self.world.flows.to_list(), 'state': self.world.state.read_state()}
+        path = self.world.session_dir() / 'parked.json'
+        tmp = path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(record), encoding='utf-8')
+        os.replace(tmp, path)  # a crash mid-write never leaves a half record to resume from
+        return self.world.conversation_id
+
+    @classmethod
+    def rehydrate(cls, username:str, conversation_id:str, config=None) -> 'Assistant':
+        """Rebuild a parked Assistant: reopen its session, restore the flow stack and state, and
+        reuse the frozen system prompt so `_init_session` has nothing left to do."""
+        path = world_module._SESSIONS_DIR / conversation_id / 'parked.json'
+        record = json.loads(path.read_text(encoding='utf-8'))
+        assistant = cls(username, config)
+        assistant.world.open_session(conversation_id)
+        assistant.world.state.restore(record['state'])
+        assistant.world.flows.restore(record['flows'])
+        assistant.conversation_id = conversation_id
+        assistant.system_prompt = record['system_prompt']
+        path.unlink()
+        return assistant
@@ -1,6 +1,10 @@
 import json
+import logging
 
 from backend.utilities import services
+from backend.utilities.vector_index import VectorIndex
+
+log = logging.getLogger(__name__)
 
 
 FAQ_RERANK_SCHEMA = {
@@ -26,8 +30,8 @@ FAQ_RERANK_SCHEMA = {
 
 def build_rerank_prompt(query:str, candidates:list, top_k:int) -> str:
     """Rank a small candidate set against a user query. Returns up to `top_k` indices into
-    `candidates`, each with a 0.0-1.0 relevance score. The corpus is small enough to fit in a single
-    prompt, so we skip embeddings and let the LLM rank by semantic similarity."""
+    `candidates`, each with a 0.0-1.0 relevance score. Vector retrieval has already cut the corpus to
+    its nearest entries, so the set fits in a single prompt and the LLM ranks by semantic similarity."""
     rows = [f"  [{idx}] {entry['question']}" for idx, entry in enumerate(candidates)]
     index_block = '\n'.join(rows) if rows else '  (corpus empty)'
     return (
@@ -42,27 +46,61 @@ def build_rerank_prompt(query:str, candidates:list, top_k:int) -> str:
 
 class BusinessKnowledge:
     """MEM's L3 tier — the single interface for business-knowledge retrieval, including FAQs. Loads
-    the in-RAM corpus once and serves LLM-rerank queries through the engineer. The corpus is small
-    enough (<50 entries) that whole-corpus rerank in one prompt is cheaper than embeddings. Reached
-    as `memory.business`.
+    the in-RAM corpus once and serves queries in two stages: embedding search picks the nearest
+    `retrieval_top_k` entries scoring at least `similarity_threshold`, then the engineer reranks those
+    down to at most `rerank_top_n` (all from `memory.business_context`, as is `embedding_model`). The vector index persists
+    beside faqs.json and only embeds entries it has not seen. Reached as `memory.business`.
 
-    Vector/embedding retrieval + agent.md cold-start ingestion are designed-not-built."""
+    Without the embedding model installed, retrieval falls back to the whole corpus (capped at
+    top_k). agent.md cold-start ingestion is designed-not-built."""
 
-    def __init__(self, engineer):
+    def __init__(self, engineer, config=None):
         self._engineer = engineer
-        path = services._DB_DIR / 'faq_data' / 'faqs.json'
+        settings = ((config or {}).get('memory') or {}).get('business_context') or {}
+        self.retrieval_top_k = settings.get('retrieval_top_k', 128)
+        self.rerank_top_n = settings.get('rerank_top_n', 10)
+        self.similarity_threshold = settings.get('similarity_threshold', 0.5)
+        faq_dir = services._DB_DIR / 'faq_data'
+        path = faq_dir / 'faqs.json'
         self._corpus = json.loads(path.read_text(encoding='utf-8')) if path.exists() else []
+        self._index = VectorIndex(faq_dir / 'faq_vectors.db', settings.get('embedding_model'))
+        self._keys:list[str] = []
+        self._synced = None        # (corpus identity, length) the keys were computed for
 
     def insert_record(self, record:dict):
         """Ingestion / promotion seam — append one record to the in-RAM corpus."""
         self._corpus.append(record)
 
-    def _candidates(self, query:str, top_k:int=1000) -> list:
-        """Candidate retrieval. Without a vector store this returns the whole corpus (capped at
-        top_k); a real embedding search lands here, using the shared model in
-        `backend.utilities.embeddings` (the same one the eval response scorer uses — one download,
-        not several). # designed-not-built (vector retrieval)"""
-        return self._corpus[:top_k]
+    def _candidates(self, query:str, top_k:int|None=None) -> list:
+        """Candidate retrieval: the `top_k` (default `retrieval_top_k`) entries nearest the query
+        by embedding, best first, dropping any below `similarity_threshold`. Uses the shared model
+        in `backend.utilities.embeddings` (the same one the eval response scorer uses — one
+        download, not several)."""
+        top_k = top_k or self.retrieval_top_k
+        if not self._corpus:
+            return []
+        keys = self._sync_index()
+        if keys is None:
+            return self._corpus[:top_k]
+        hits = self._index.search(query, keys, top_k, self.similarity_threshold)
+        return [self._corpus[pos] for pos, _ in hits]
+
+    def _sync_index(self) -> list | None:
+        """Keys aligned with the corpus, re-synced only when the corpus changed. None when the
+        embedding model cannot load; retrieval then stays on the whole-corpus path."""
+        if self._index is None:
+            return None
+        token = (id(self._corpus), len(self._corpus))
+        if token != self._synced:
+            texts = [f"{entry['question']}\n{entry.get('answer', '')}" for entry in self._corpus]
+            try:
+                self._keys = self._index.sync(texts)
+            except (ImportError, OSError) as ecp:
+                log.warning('vector retrieval unavailable, reranking the whole corpus: %s', ecp)
+                self._index = None
+                return None
+            self._synced = token
+        return self._keys
 
     def _rerank(self, query:str, candidates:list, top_k:int=10) -> dict:
         """LLM rerank of the given candidates down to the top_k matches."""
@@ -81,5 +119,10 @@ class BusinessKnowledge:
         return {'_success': True, 'matches': matches}
 
     def search_documents(self, query:str, top_k:int=3) -> dict:
-        """Rerank the whole document corpus (FAQs are one document type)."""
-        return self._rerank(query, self._corpus, top_k)
+        """Retrieve candidates from the document corpus (FAQs are one document type) and rerank
+        them to at most `top_k`, itself capped by `rerank_top_n`. When nothing clears the
+        similarity threshold the rerank call is skipped."""
+        candidates = self._candidates(query)
+        if self._corpus and not candidates:
+            return {'_success': True, 'matches': []}
+        return self._rerank(query, candidates, min(top_k, self.rerank_top_n))
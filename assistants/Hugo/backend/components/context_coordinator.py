@@ -1,9 +1,11 @@
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 
 from backend.prompts.for_compactor import END_OF_SUMMARY, SUMMARY_PREFIX
+from backend.utilities import checkpoint
 from utils.helper import dax2flow
 
 log = logging.getLogger(__name__)
@@ -50,7 +52,13 @@ class ContextCoordinator:
     surfaces, one per consumer: full_conversation() (every turn, all kinds), compile_history()
     (utterances for prompts), and compile_messages() (the on-demand API projection for the PEX
     agent). Turns persist to history.jsonl; compaction only appends (a summary turn plus an
-    event turn) and the projection applies the skip range at render time."""
+    event turn) and the projection applies the skip range at render time.
+
+    compile_messages() is memoized: the projection is kept as one flat message list plus the
+    offset where each turn's messages begin, and each call re-renders only the turns appended
+    since plus the previous protected tail (the only turns whose pruning can have flipped). The
+    compaction plan is likewise extended from newly appended turns; only a new compaction event
+    changes it, and only then is the whole projection rebuilt."""
 
     def __init__(self, config):
         self.config = config
@@ -58,8 +66,21 @@ class ContextCoordinator:
         self._history: list[Turn] = []
         self.num_utterances: int = 0
         self._history_path: Path|None = None
+        self._history_started = False   # history.jsonl holds the turns so far; later writes append
+        self.journal = None             # Attached by the World; None writes straight to disk
         # Last compaction summary, kept for iterative summary updates.
         self.previous_summary: str|None = None
+        self._epoch = 0                 # bumped by reset, reload and compaction: stales open plans
+        self._invalidate()
+
+    def _invalidate(self):
+        """Drop the memoized plan and projection — the history was replaced or cleared."""
+        self._plan: tuple[set, int|None, int|None] = (set(), None, None)
+        self._plan_scanned = 0          # turns already folded into the plan
+        self._compiled: list[dict] = []
+        self._turn_offsets: list[int] = []   # start of each compiled turn in `_compiled`
+        self._compiled_len = 0          # history length the projection was rendered against
+        self._compiled_tail = self.protect_tail
 
     # ── Writes ─────
 
@@ -91,8 +112,13 @@ class ContextCoordinator:
         self._history.clear()
         self.num_utterances = 0
         self.previous_summary = None
-        if self._history_path is not None and self._history_path.exists():
-            self._history_path.write_text('', encoding='utf-8')
+        self._epoch += 1
+        self._invalidate()
+        if self._history_path is not None and self._history_started:
+            if self.journal is not None:
+                self.journal.truncate(self._history_path)
+            elif self._history_path.exists():
+                self._history_path.write_text('', encoding='utf-8')
 
     # ── Reads ─────
 
@@ -113,16 +139,29 @@ class ContextCoordinator:
     def compile_messages(self) -> list[dict]:
         """The API projection for the PEX agent, computed on demand: per-kind rendering, the
         latest compaction's summary spliced over its skip range, old tool results rendered as
-        the pruning placeholder."""
-        skip, splice_start, summary_index = self._compaction_plan()
-        messages = []
-        for idx in range(len(self._history)):
+        the pruning placeholder. Returns a fresh list the caller may append to; the message dicts in it
+        are the memo's own and must be treated as read-only — annotate a copy instead, the way
+        `PromptEngineer._mark_scenario_prefix` adds its cache breakpoint."""
+        total = len(self._history)
+        if total < self._plan_scanned or self._compiled_tail != self.protect_tail:
+            self._invalidate()
+        if self._advance_plan():
+            self._compiled, self._turn_offsets, self._compiled_len = [], [], 0
+        skip, splice_start, summary_index = self._plan
+        # Turns inside the previous tail may have aged past the pruning boundary since.
+        redo = min(len(self._turn_offsets), max(0, self._compiled_len - self.protect_tail))
+        if redo < len(self._turn_offsets):
+            del self._compiled[self._turn_offsets[redo]:]
+            del self._turn_offsets[redo:]
+        for idx in range(redo, total):
+            self._turn_offsets.append(len(self._compiled))
             if idx == splice_start:
-                messages.append({'role': 'user', 'content': self._history[summary_index].text})
+                self._compiled.append({'role': 'user', 'content': self._history[summary_index].text})
             if idx in skip:
                 continue
-            messages.extend(self._render_turn(idx))
-        return messages
+            self._compiled.extend(self._render_turn(idx))
+        self._compiled_len = total
+        return list(self._compiled)
 
     # ── Projection internals ─────
 
@@ -130,15 +169,25 @@ class ContextCoordinator:
         """Skip set and splice point from the kind-6 compaction events. Summaries chain
         iteratively (each new one folds in previous_summary), so only the LATEST summary is
         emitted; every earlier summary turn is skipped outright."""
-        skip, splice_start, summary_index = set(), None, None
-        for turn in self._history:
+        self._advance_plan()
+        return self._plan
+
+    def _advance_plan(self) -> bool:
+        """Fold turns appended since the last call into the plan. Returns True when a new
+        compaction event changed it."""
+        skip, splice_start, summary_index = self._plan
+        changed = False
+        for turn in self._history[self._plan_scanned:]:
             if turn.turn_type == 'action' and turn.role == 'system' \
                     and turn.content.get('activity') == 'compaction':
                 result = turn.content['result']
-                skip.update(range(result['start'], result['cut']))
-                skip.add(result['summary_index'])
+                skip = skip | set(range(result['start'], result['cut'])) | {result['summary_index']}
                 splice_start, summary_index = result['start'], result['summary_index']
-        return skip, splice_start, summary_index
+                changed = True
+        self._plan_scanned = len(self._history)
+        if changed:
+            self._plan = (skip, splice_start, summary_index)
+        return changed
 
     def _render_turn(self, idx:int) -> list[dict]:
         """One turn's API messages. Kind 6 is invisible to the model; a kind-4 turn emits the
@@ -167,16 +216,27 @@ class ContextCoordinator:
 
     # ── Storage: history.jsonl ─────
 
-    def load_history(self, path):
+    def load_history(self, path, snapshot:dict|None=None) -> bool:
         """Bind the store to history.jsonl in the session dir (path passed in from World) and
         load it: an existing file rebuilds the turn list; a fresh path stays lazy — the first
-        write flushes everything, so disk matches memory from then on."""
+        write flushes everything, so disk matches memory from then on. A torn last line (a crash
+        mid-append) is cut off; every line before it was written whole.
+
+        A `snapshot` from a session checkpoint supplies the turns up to its mark, so only lines
+        appended since are parsed; returns True when it was used (False: a full parse)."""
         self._history_path = Path(path)
-        if not self._history_path.exists():
-            return
+        self._history_started = self._history_path.exists()
+        if not self._history_started:
+            return False
         self._history = []
-        for line in self._history_path.read_text(encoding='utf-8').splitlines():
-            entry = json.loads(line)
+        self._epoch += 1
+        self._invalidate()
+        used = snapshot is not None and checkpoint.mark_holds(self._history_path, snapshot['mark'])
+        if used:
+            entries = snapshot['turns'] + _read_records(self._history_path, snapshot['mark']['size'])
+        else:
+            entries = _read_records(self._history_path)
+        for entry in entries:
             turn = Turn(entry['role'], entry['turn_type'], entry['content'], entry['turn_id'])
             turn.timestamp = entry['timestamp']
             self._history.append(turn)
@@ -188,20 +248,29 @@ class ContextCoordinator:
                 body = turn.text[len(SUMMARY_PREFIX):].removesuffix(END_OF_SUMMARY)
                 self.previous_summary = body.strip()
                 break
+        return used
+
+    def snapshot_history(self) -> dict:
+        """Every turn plus a mark of history.jsonl, for the session checkpoint. Take it right
+        after a journal commit, when the file holds exactly these turns."""
+        return {'turns': [turn.to_dict() for turn in self._history],
+                'mark': checkpoint.mark(self._history_path) if self._history_path else {'size': 0}}
 
     def save_turn_to_disk(self, turn:Turn):
         """Strictly append-only — the first write flushes any pre-attach turns (the seed), and
-        nothing ever rewrites the file (revisions and compactions append)."""
+        nothing ever rewrites the file (revisions and compactions append). With a journal the
+        line is buffered and reaches disk within its flush interval, fsynced at turn end."""
         if self._history_path is None:
             return
-        if not self._history_path.exists():
-            self._history_path.parent.mkdir(parents=True, exist_ok=True)
-            lines = ''.join(json.dumps(entry.to_dict(), default=str) + '\n'
-                            for entry in self._history)
-            self._history_path.write_text(lines, encoding='utf-8')
+        turns = [turn] if self._history_started else self._history
+        self._history_started = True
+        lines = ''.join(json.dumps(entry.to_dict(), default=str) + '\n' for entry in turns)
+        if self.journal is not None:
+            self.journal.append(self._history_path, lines)
             return
+        self._history_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self._history_path, 'a', encoding='utf-8') as file:
-            file.write(json.dumps(turn.to_dict(), default=str) + '\n')
+            file.write(lines)
 
     # ── Context compaction ─────
     # Strategy: protect the head and the recent tail, summarize the middle on the cheap
@@ -215,10 +284,20 @@ class ContextCoordinator:
         """Middle-out compaction over the visible turns. `summarize(middle, previous_summary,
         budget)` is the auxiliary summarizer (LOW tier through PromptEngineer). Returns True
         when a compaction happened."""
+        plan = self.plan_compaction(protect_tail)
+        if plan is None:
+            return False
+        summary = summarize(plan['middle'], plan['previous_summary'], plan['budget'])
+        return self.apply_compaction(plan, summary, prompt_tokens)
+
+    def plan_compaction(self, protect_tail:int) -> dict | None:
+        """The middle-out cut `compact_messages` would summarize — turns [start, cut) rendered
+        for the summarizer, with its budget — or None when there is nothing to fold. No LLM call,
+        so MEM can hand the plan to a background summarizer and apply the result later."""
         skip = self._compaction_plan()[0]
         visible = [idx for idx in range(len(self._history)) if idx not in skip]
         if len(visible) <= _PROTECT_HEAD + protect_tail + 1:
-            return False
+            return None
         start = visible[_PROTECT_HEAD]
         cut = visible[-protect_tail]
         last_user = next((idx for idx in reversed(visible)
@@ -228,12 +307,22 @@ class ContextCoordinator:
             cut = min(cut, last_user)
         middle = [idx for idx in visible if start <= idx < cut]
         if not middle:
-            return False
+            return None
         rendered = [message for idx in middle for message in self._render_turn(idx)]
         budget = max(_MIN_SUMMARY_TOKENS,
                      min(int(self._estimate_tokens(rendered) * _SUMMARY_RATIO),
                          _MAX_SUMMARY_TOKENS))
-        summary = summarize(rendered, self.previous_summary, budget)
+        return {'start': start, 'cut': cut, 'middle': rendered, 'budget': budget,
+                'previous_summary': self.previous_summary, 'epoch': self._epoch}
+
+    def apply_compaction(self, plan:dict, summary:str, prompt_tokens:int=0) -> bool:
+        """Splice the summary of `plan` in as one summary turn plus its compaction event. Turns
+        appended since the plan sit past its cut and stay verbatim; a reset, reload or another
+        compaction since then stales the plan, and it is refused (False, nothing written)."""
+        if plan['epoch'] != self._epoch:
+            return False
+        self._epoch += 1
+        start, cut = plan['start'], plan['cut']
         self.previous_summary = summary
         self.add_turn('system', {'text': f'{SUMMARY_PREFIX}\n{summary}{END_OF_SUMMARY}'})
         self.add_turn('system', {
@@ -268,6 +357,11 @@ class ContextCoordinator:
     def turn_count(self) -> int:
         return len(self._history)
 
+    @property
+    def epoch(self) -> int:
+        """Bumped by reset, reload and compaction; a plan from an older epoch is stale."""
+        return self._epoch
+
     @property
     def last_user_utt(self) -> str | None:
         for turn in reversed(self._history):
@@ -292,3 +386,23 @@ class ContextCoordinator:
             content = message['content']
             chars += len(content) if isinstance(content, str) else len(json.dumps(content, default=str))
         return chars // _CHARS_PER_TOKEN
+
+
+def _read_records(path:Path, offset:int=0) -> list[dict]:
+    """Parse a JSONL log from `offset`, truncating a torn final line in place so later appends
+    start clean."""
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        data = file.read()
+    tail = data.rpartition(b'\n')[2]
+    if tail:
+        try:
+            json.loads(tail)
+        except ValueError:
+            log.warning('dropping torn tail of %s (%d bytes)', path, len(tail))
+            data = data[:len(data) - len(tail)]
+            os.truncate(path, offset + len(data))
+        else:
+            with open(path, 'ab') as file:
+                file.write(b'\n')
+    return [json.loads(line) for line in data.decode('utf-8').splitlines() if line]
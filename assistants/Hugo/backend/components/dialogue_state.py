@@ -1,12 +1,18 @@
+import copy
+import hashlib
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from backend.prompts.for_experts import (build_flow_prompt, render_flow_ontology,
                                          INTENT_CRITERIA, INTENT_QUESTION, NOUL_THRESHOLD,
                                          PLAN_NOUL, CLARIFY_NOUL)
 from backend.prompts.for_nlu import build_slot_filling_prompt, build_shown_candidates
+from backend.utilities import latency
 from backend.utilities.services import PostService
 from schemas.ontology import FLOW_ONTOLOGY, INTENTS
 from utils.helper import flow2dax, dax2flow
@@ -17,6 +23,40 @@ ENTITY_PARTS = ('post', 'sec', 'snip', 'chl', 'ver')
 
 _ENTITY_MAPPER = {'snippet': 'snip', 'post': 'post', 'section': 'sec', 'channel': 'chl'}
 
+_HIGH_FAMILIES = ('gemini', 'claude')   # the round-2 escalation voters
+
+
+def _memo_key(kind:str, utterance:str, history:str, *extra) -> str:
+    """(utterance, history hash) plus whatever else shapes the request — the Continue criterion,
+    the detection hint and snippet."""
+    digest = hashlib.sha256(history.encode('utf-8')).hexdigest()
+    blob = json.dumps([kind, utterance, digest, *extra], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def _no_detection() -> dict:
+    """Every voter failed: a low-confidence chat so the turn still routes somewhere."""
+    return {
+        'flows': ['chat'], 'confidence': 0.3,
+        'pred_flows': [{'name': 'chat', 'dax': flow2dax('chat'), 'confidence': 0.3}],
+    }
+
+# Quorum-mode outcomes across the process (detections, early exits, stragglers ignored, speculative
+# escalations started / used); served next to the voter latency histograms by `voter_stats`.
+_QUORUM_COUNTS:Counter = Counter()
+_QUORUM_LOCK = threading.Lock()
+
+
+def _count(event:str, amount:int=1):
+    with _QUORUM_LOCK:
+        _QUORUM_COUNTS[event] += amount
+
+
+def voter_stats() -> dict:
+    with _QUORUM_LOCK:
+        quorum = dict(_QUORUM_COUNTS)
+    return {'latency': latency.snapshot('voter/'), 'quorum': quorum}
+
 
 def _flow_detection_schema(candidate_flow_names:list[str]) -> dict:
     return {
@@ -105,6 +145,9 @@ class DialogueState:
     def __init__(self, config):
         self.config = config
         self._posts = PostService()
+        self._memo_lock = threading.Lock()
+        self._spent = threading.local()      # LLM calls launched by the current thread's request
+        self.memo_totals:dict[str, int] = {'requests': 0, 'shared': 0, 'llm_calls': 0, 'saved': 0}
         self.reset()
 
     def reset(self):
@@ -129,6 +172,13 @@ class DialogueState:
         self.has_plan = False # signals that multiple flows are valid
         self.has_issues = False  # signals need for contemplation
         self.turn_id = 0  # snapshot of Context.num_utterances, recorded by MEM at save time (a consumer)
+        self.begin_turn()
+
+    def begin_turn(self):
+        """Open a fresh per-turn memo for classify_intent / detect_flows (see `_single_flight`)."""
+        with self._memo_lock:
+            self._memo:dict[str, list] = {}       # key -> [future, LLM calls the leader made]
+            self.memo_turn:dict[str, dict] = {}   # per request kind: requests, shared, llm_calls, saved
 
     def flow_name(self, string=True, threshold=0.0):
         candidates = [flow for flow in self.pred_flows if flow['confidence'] > threshold]
@@ -136,27 +186,36 @@ class DialogueState:
             return None
         return candidates[0]['name'] if string else candidates[0]['dax']
 
-    def save(self, path):
-        """Rewrite state.json — the single document form, one write per write_state."""
-        Path(path).write_text(json.dumps(self.read_state(), indent=2), encoding='utf-8')
+    def save(self, path, journal=None):
+        """Rewrite state.json — the single document form, one write per write_state. With a
+        journal the rewrite is buffered and lands at its next flush or commit."""
+        text = json.dumps(self.read_state(), indent=2)
+        if journal is not None:
+            journal.write(Path(path), text)
+        else:
+            Path(path).write_text(text, encoding='utf-8')
 
     @classmethod
     def load(cls, path):
         """Rebuild a past session's state from its state.json — a MEM read of the disk record
         (a throwaway view object), never a rebind of the live world.state."""
-        data = json.loads(Path(path).read_text(encoding='utf-8'))
-        session, beliefs = data['session'], data['beliefs']
         state = cls(config={})
-        state.pred_intent = beliefs['intent']
-        state.pred_flows = beliefs['flows']
-        state.conversation_id = session['convo_id']
-        state.username = session['username']
-        state.has_plan = session['has_plan']
-        state.has_issues = session['has_issues']
-        state.turn_id = session['turn_id']
-        state.grounding = data['grounding']
+        state.restore(json.loads(Path(path).read_text(encoding='utf-8')))
         return state
 
+    def restore(self, data:dict):
+        """Write a `read_state` document back into this object in place (a parked session
+        coming back keeps the live world.state)."""
+        session, beliefs = data['session'], data['beliefs']
+        self.pred_intent = beliefs['intent']
+        self.pred_flows = beliefs['flows']
+        self.conversation_id = session['convo_id']
+        self.username = session['username']
+        self.has_plan = session['has_plan']
+        self.has_issues = session['has_issues']
+        self.turn_id = session['turn_id']
+        self.grounding = data['grounding']
+
     # ── read_state / write_state tool surfaces ─────────
     # These methods are the callable surface for the tool catalog.
 
@@ -219,8 +278,12 @@ class DialogueState:
         document = {'history': context.compile_history(), 'utterance': context.last_user_utt}
         questions = {'intent': {'type': 'choice', 'instructions': INTENT_QUESTION, 'criteria': criteria},
                      'has_plan': PLAN_NOUL, 'needs_clarify': CLARIFY_NOUL}
+        key = _memo_key('classify_intent', document['utterance'] or '', document['history'], criteria)
+        def ask() -> dict:
+            self._spend(1)
+            return engineer.typesafe(document, questions)
         try:
-            answers = engineer.typesafe(document, questions)
+            answers = self._single_flight('classify_intent', key, ask)
             plan, clarify = answers['has_plan']['noul'], answers['needs_clarify']['noul']
             if plan >= NOUL_THRESHOLD or clarify >= NOUL_THRESHOLD:
                 intent = 'Plan' if plan >= clarify else 'Clarify'
@@ -246,9 +309,15 @@ class DialogueState:
         the extra prompt block check() picked; `working` is the flow already in progress
         (check() reads it off the stack the belief no longer carries last turn's detection). 
         A working flow narrows candidates to that flow + its edges and seeds the vote; 
-        any other hint narrows to the intent's flows."""
+        any other hint narrows to the intent's flows. Repeats within a turn share one detection."""
         hint = working or self.pred_intent
         convo_history = context.compile_history()
+        key = _memo_key('detect_flows', user_text, convo_history, hint, snippet)
+        detection = self._single_flight('detect_flows', key, lambda: self._detect(
+            engineer, user_text, hint, convo_history, snippet))
+        return copy.deepcopy(detection)   # callers write pred_flows into the belief
+
+    def _detect(self, engineer, user_text:str, hint:str, convo_history:str, snippet:str) -> dict:
         prompt = self._detection_prompt(user_text, hint, convo_history)
         if snippet:
             prompt += '\n\n' + snippet
@@ -260,16 +329,16 @@ class DialogueState:
             pex_family = self._orchestrator_family()
             votes.append({'flows': [hint], '_model': pex_family, '_tier': 'med'})
             med_families = tuple(fam for fam in med_families if fam != pex_family)
+        thresholds = self.config.get('thresholds', {})
+        confidence_min = thresholds.get('nlu_confidence_min', 0.64)
+        if thresholds.get('nlu_quorum', False):
+            return self._quorum_detect(engineer, votes, med_families, prompt, schema, confidence_min)
         votes += self._collect_votes(engineer, med_families, 'med', prompt, schema)
         if not votes:
-            return {
-                'flows': ['chat'], 'confidence': 0.3,
-                'pred_flows': [{'name': 'chat', 'dax': flow2dax('chat'), 'confidence': 0.3}],
-            }
+            return _no_detection()
         detection = self._tally_votes(votes)
-        confidence_min = self.config.get('thresholds', {}).get('nlu_confidence_min', 0.64)
         if detection['confidence'] < confidence_min:
-            votes += self._collect_votes(engineer, ('gemini', 'claude'), 'high', prompt, schema)
+            votes += self._collect_votes(engineer, _HIGH_FAMILIES, 'high', prompt, schema)
             detection = self._tally_votes(votes)
         return detection
 
@@ -360,37 +429,169 @@ class DialogueState:
                 return family
         raise ValueError(f'orchestrator model {model_id!r} maps to no voter family')
 
-    def _collect_votes(self, engineer, families:tuple, level:str, prompt:str, schema:dict) -> list[dict]:
-        def _call_voter(family:str) -> dict | None:
-            try:
-                parsed = engineer(prompt, task='detect_flow', family=family, tier=level,
-                                  max_tokens=1024, schema=schema)
-                parsed['_model'] = family
-                parsed['_tier'] = level
-                return parsed
-            except Exception as ecp:
-                log.warning('NLU vote error (%s %s): %s', family, level, ecp)
-                # Provider-side losses degrade the ensemble by design — debug re-raise is for
-                # schema/code bugs, not outages: quota loss (429 RESOURCE_EXHAUSTED) or output
-                # the provider truncated/mangled into unparseable JSON.
-                recoverable = ('RESOURCE_EXHAUSTED' in str(ecp) or '429' in str(ecp)
-                               or 'unparseable JSON' in str(ecp))
-                if not recoverable and self.config.get('debug', False):
-                    raise ecp
-                return None
+    # ── Per-turn single flight ──
+
+    def _single_flight(self, kind:str, key:str, compute):
+        """`compute()` once per key per turn. A caller arriving while the same request is in flight
+        waits on its future, a later one reuses the result; either way the LLM calls the first
+        caller made count as saved. Failures are never kept — only callers already waiting see it."""
+        with self._memo_lock:
+            tally = self.memo_turn.setdefault(kind, {'requests': 0, 'shared': 0, 'llm_calls': 0, 'saved': 0})
+            tally['requests'] += 1
+            self.memo_totals['requests'] += 1
+            entry = self._memo.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._memo[key] = [Future(), 0]
+            else:
+                tally['shared'] += 1
+                self.memo_totals['shared'] += 1
+        if not leader:
+            result = entry[0].result()
+            with self._memo_lock:
+                tally['saved'] += entry[1]
+                self.memo_totals['saved'] += entry[1]
+            return result
+        before = getattr(self._spent, 'calls', 0)
+        try:
+            result = compute()
+        except BaseException as ecp:
+            with self._memo_lock:
+                if self._memo.get(key) is entry:
+                    del self._memo[key]
+            entry[0].set_exception(ecp)
+            raise
+        with self._memo_lock:
+            entry[1] = getattr(self._spent, 'calls', 0) - before
+            tally['llm_calls'] += entry[1]
+            self.memo_totals['llm_calls'] += entry[1]
+        entry[0].set_result(result)
+        return result
+
+    def _spend(self, calls:int):
+        self._spent.calls = getattr(self._spent, 'calls', 0) + calls
+
+    def _call_voter(self, engineer, family:str, level:str, prompt:str, schema:dict) -> dict | None:
+        start = time.perf_counter()
+        try:
+            parsed = engineer(prompt, task='detect_flow', family=family, tier=level,
+                              max_tokens=1024, schema=schema)
+            parsed['_model'] = family
+            parsed['_tier'] = level
+            return parsed
+        except Exception as ecp:
+            log.warning('NLU vote error (%s %s): %s', family, level, ecp)
+            # Provider-side losses degrade the ensemble by design — debug re-raise is for
+            # schema/code bugs, not outages: quota loss (429 RESOURCE_EXHAUSTED) or output
+            # the provider truncated/mangled into unparseable JSON.
+            recoverable = ('RESOURCE_EXHAUSTED' in str(ecp) or '429' in str(ecp)
+                           or 'unparseable JSON' in str(ecp))
+            if not recoverable and self.config.get('debug', False):
+                raise ecp
+            return None
+        finally:
+            latency.histogram(f'voter/{family}/{level}').record((time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    def _admit_vote(votes:list[dict], result:dict | None):
+        if result and isinstance(result.get('flows'), list):
+            # An empty list is a deliberate abstention — a vote for nothing that still
+            # counts in the majority denominators (round 3.5).
+            result['flows'] = [flow for flow in result['flows'] if flow in FLOW_ONTOLOGY]
+            votes.append(result)
 
+    def _collect_votes(self, engineer, families:tuple, level:str, prompt:str, schema:dict) -> list[dict]:
         votes: list[dict] = []
+        self._spend(len(families))
         with ThreadPoolExecutor(max_workers=len(families)) as pool:
-            futures = [pool.submit(_call_voter, family) for family in families]
+            futures = [pool.submit(self._call_voter, engineer, family, level, prompt, schema)
+                       for family in families]
             for future in as_completed(futures):
-                result = future.result()
-                if result and isinstance(result.get('flows'), list):
-                    # An empty list is a deliberate abstention — a vote for nothing that still
-                    # counts in the majority denominators (round 3.5).
-                    result['flows'] = [flow for flow in result['flows'] if flow in FLOW_ONTOLOGY]
-                    votes.append(result)
+                self._admit_vote(votes, future.result())
         return votes
 
+    def _quorum_detect(self, engineer, votes:list[dict], med_families:tuple, prompt:str,
+                       schema:dict, confidence_min:float) -> dict:
+        """`thresholds.nlu_quorum`: the same two rounds as the full ensemble, but each returns as
+        soon as the votes in hand decide it (`_decided`) — stragglers are cancelled if not yet
+        started, otherwise left to finish unread. The high voters start speculatively the moment
+        two votes name different primaries, so an escalation overlaps the last medium call instead
+        of following it; an unneeded speculative round is simply ignored."""
+        pool = ThreadPoolExecutor(max_workers=len(med_families) + len(_HIGH_FAMILIES))
+        _count('detections')
+
+        def launch(families:tuple, level:str) -> dict:
+            self._spend(len(families))
+            return {pool.submit(self._call_voter, engineer, family, level, prompt, schema): family
+                    for family in families}
+        try:
+            med = launch(med_families, 'med')
+            high:dict = {}
+            pending = dict(med)
+            for future in as_completed(med):
+                pending.pop(future)
+                self._admit_vote(votes, future.result())
+                if not high and len({vote['flows'][0] for vote in votes if vote['flows']}) > 1:
+                    high = launch(_HIGH_FAMILIES, 'high')
+                    _count('speculative_started')
+                if pending and (detection := self._decided(votes, pending, 'med', confidence_min)):
+                    _count('early_exits')
+                    _count('stragglers_ignored', len(pending))
+                    return detection
+            if not votes:
+                return _no_detection()
+            detection = self._tally_votes(votes)
+            if detection['confidence'] >= confidence_min:
+                return detection
+            if high:
+                _count('speculative_used')
+            else:
+                high = launch(_HIGH_FAMILIES, 'high')
+            pending = dict(high)
+            for future in as_completed(high):
+                pending.pop(future)
+                self._admit_vote(votes, future.result())
+                if pending and (detection := self._decided(votes, pending, 'high', confidence_min)):
+                    _count('early_exits')
+                    _count('stragglers_ignored', len(pending))
+                    return detection
+            return self._tally_votes(votes)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _decided(self, votes:list[dict], pending:dict, level:str, confidence_min:float) -> dict | None:
+        """The detection the full round would produce, if no outcome of the `pending` voters can
+        change its flows or push its confidence under `confidence_min` — else None. Flows: every
+        majority survivor already holds a majority of the whole panel, no other flow can still
+        reach one, and at most one survivor's place is left to support order (Claude's list is
+        canonical). Confidence: the floor of `_score_votes` with every straggler dissenting into a
+        fresh intent; the returned detection carries that floor and tallies stragglers as
+        abstentions."""
+        panel = len(votes) + len(pending)
+        support = Counter(flow for vote in votes for flow in vote['flows'])
+        locked = [flow for flow, count in support.items() if count * 2 > panel]
+        if not locked or len(pending) * 2 > panel:   # an unnamed flow could still win a majority
+            return None
+        if any((count + len(pending)) * 2 > panel for flow, count in support.items() if flow not in locked):
+            return None
+        claude = next((vote['flows'] for vote in votes if vote['_model'] == 'claude'), [])
+        if sum(1 for flow in locked if flow not in claude) > 1:
+            return None
+        absent = [{'flows': [], '_model': family, '_tier': level} for family in pending.values()]
+        detection = self._tally_votes(votes + absent)
+        best = detection['flows'][0]
+        fresh = {FLOW_ONTOLOGY[vote['flows'][0]]['intent']: None for vote in votes if vote['flows']}
+        for name, cat in FLOW_ONTOLOGY.items():
+            fresh.setdefault(cat['intent'], name)     # one flow per intent no vote has named yet
+        rivals = [name for name in fresh.values() if name] + [name for name in FLOW_ONTOLOGY if name != best]
+        dissent = [{'flows': [rivals[idx]], '_model': family, '_tier': level}
+                   for idx, family in enumerate(pending.values())]
+        floor = self._score_votes(votes + dissent, best)
+        if floor < confidence_min:
+            return None
+        detection['confidence'] = floor
+        return detection
+
     def _tally_votes(self, votes:list[dict]) -> dict:
         """Per-flow majority tally over list votes (round 3.5 defaults, revisit later):
         every flow any voter names goes through the tally; majority support survives.
@@ -117,6 +117,19 @@ class FlowStack:
     def to_list(self) -> list[dict]:
         return [e.to_dict() for e in self._stack]
 
+    def restore(self, entries:list[dict]):
+        """Rebuild the stack in place from `to_list` entries (a parked session coming back):
+        instantiate each flow, restore its lifecycle fields, refill its slots."""
+        self._stack.clear()
+        for entry in entries:
+            flow = self._push(entry['flow_name'])
+            flow.flow_id = entry['flow_id']
+            flow.status = entry['status']
+            flow.stage = entry['stage']
+            flow.turn_ids = list(entry['turn_ids'])
+            flow.fill_slot_values(entry['slots'])
+            flow.is_filled()  # recompute every slot's .filled after the refill
+
     # ── Internal ────────────────────────────────────────────────────
 
     def _push(self, flow_name:str):
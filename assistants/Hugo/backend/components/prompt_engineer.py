@@ -1,11 +1,13 @@
+import asyncio
 import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import anthropic
-import requests
 from google import genai
 import openai
 
@@ -14,6 +16,9 @@ from pydantic import BaseModel
 
 from backend.prompts.general import build_system
 from backend.prompts.for_pex import build_flow_system, build_flow_messages
+from backend.utilities.prompt_registry import prompt_registry
+from backend.utilities.response_cache import ResponseCache, request_key
+from backend.utilities.typesafe_client import typesafe_client
 
 log = logging.getLogger(__name__)
 
@@ -52,6 +57,71 @@ _TYPESAFE_ENDPOINT = 'https://api.typesafe.ai/v1/systemone'
 _TYPESAFE_MODEL = 'speed_latest'
 
 
+class ToolDispatcher:
+    """Runs the tool calls from one model response and hands the results back in model order.
+
+    Calls to tools declared `read_only` in tools.yaml fan out on a bounded thread pool; any other
+    tool is a barrier — it waits for the reads issued before it, runs alone, and the reads after it
+    start only once it returns. Writes therefore keep the order the model asked for, and the follow-up
+    message is assembled in that same order whatever finished first, so the prompt prefix (and its
+    cache) stays byte-identical across runs. Calling the dispatcher directly runs one tool inline.
+
+    A `call_tool` that logs its calls can expose `claim(name, args)`, which reserves the call's log
+    slot and returns the call as a no-argument callable. The reads of a batch are claimed in model
+    order on the calling thread before any of them starts, so the log keeps that order too."""
+
+    def __init__(self, call_tool, read_only=(), max_workers:int=4):
+        self.call_tool = call_tool
+        self.read_only = frozenset(read_only)
+        self.max_workers = max(1, max_workers)
+
+    def __call__(self, tool_name:str, tool_input:dict) -> dict:
+        return self.call_tool(tool_name, tool_input)
+
+    def run(self, calls:list[tuple[str, dict]]) -> list[dict]:
+        results:list = [None] * len(calls)
+        batch:list[int] = []
+        for idx, (name, args) in enumerate(calls):
+            if name in self.read_only:
+                batch.append(idx)
+                continue
+            self._run_batch(calls, batch, results)
+            results[idx] = self.call_tool(name, args)
+        self._run_batch(calls, batch, results)
+        return results
+
+    def _run_batch(self, calls, batch:list[int], results:list):
+        if len(batch) == 1 or self.max_workers == 1:
+            for idx in batch:
+                results[idx] = self.call_tool(*calls[idx])
+        elif batch:
+            claim = getattr(self.call_tool, 'claim', None)
+            with ThreadPoolExecutor(max_workers=min(len(batch), self.max_workers)) as pool:
+                futures = [(idx, pool.submit(claim(*calls[idx])) if claim
+                            else pool.submit(self.call_tool, *calls[idx])) for idx in batch]
+                for idx, future in futures:
+                    results[idx] = future.result()
+        batch.clear()
+
+    @classmethod
+    def wrap(cls, call_tool) -> 'ToolDispatcher':
+        """A raw `call_tool` callable runs every call in sequence."""
+        return call_tool if isinstance(call_tool, cls) else cls(call_tool)
+
+
+# Provider SDK clients are thread-safe and hold connection pools, so every engineer in the process
+# shares one per (provider, key) — a new Assistant reuses warm connections instead of opening its own.
+_PROVIDER_CLIENTS:dict[tuple[str, str], object] = {}
+_PROVIDER_LOCK = threading.Lock()
+
+# Provider-shaped tool payloads, keyed by shape and the identity of the PEX definition dicts they
+# were built from (PEX memoizes those per audience). Each entry pins its source dicts, so an id is
+# never reused while its entry lives.
+_TOOL_PAYLOADS:dict[tuple, tuple] = {}
+_TOOL_PAYLOADS_LOCK = threading.Lock()
+_TOOL_PAYLOAD_LIMIT = 256
+
+
 class PromptEngineer:
 
     VERSION = 'v1'
@@ -71,6 +141,10 @@ class PromptEngineer:
         self.persona = config.get('persona', {})
         self._limits = config['limits']
         self._clients: dict[str, object] = {}
+        self.response_cache = ResponseCache.from_config(config.get('llm_cache'))
+        # Flow and skill prompts load (and validate) once per process; debug turns on mtime reload.
+        for prompt_dir in (self._FLOW_DIR, self._SKILL_DIR):
+            prompt_registry(prompt_dir, hot_reload=config.get('debug', False))
 
     def _get_client(self, provider:str):
         if provider in self._clients:
@@ -81,14 +155,18 @@ class PromptEngineer:
         api_key = next((os.getenv(e) for e in envars if os.getenv(e)), None)
         if not api_key:
             raise RuntimeError(f'{envars[0]} not set. Set it in .env or environment.')
-        if provider == 'anthropic':
-            client = anthropic.Anthropic(api_key=api_key)
-        elif provider == 'google':
-            client = genai.Client(api_key=api_key)
-        elif provider == 'openai':
-            client = openai.OpenAI(api_key=api_key)
-        elif provider == 'together':
-            client = openai.OpenAI(api_key=api_key, base_url='https://api.together.xyz/v1')
+        with _PROVIDER_LOCK:
+            client = _PROVIDER_CLIENTS.get((provider, api_key))
+            if client is None:
+                if provider == 'anthropic':
+                    client = anthropic.Anthropic(api_key=api_key)
+                elif provider == 'google':
+                    client = genai.Client(api_key=api_key)
+                elif provider == 'openai':
+                    client = openai.OpenAI(api_key=api_key)
+                elif provider == 'together':
+                    client = openai.OpenAI(api_key=api_key, base_url='https://api.together.xyz/v1')
+                _PROVIDER_CLIENTS[(provider, api_key)] = client
         self._clients[provider] = client
         return client
 
@@ -128,48 +206,41 @@ class PromptEngineer:
     def typesafe(self, document:dict, questions:dict) -> dict:
         """One TypeSafe System-1 call — typed questions evaluated against a document, typed
         answers back (no prompt, no JSON to coax out of prose). Returns the `answers` dict;
-        raises on a missing key or a failed request — the caller owns the fallback."""
-        key = os.getenv('TYPESAFE_API_KEY')
-        if not key:
-            raise RuntimeError('TYPESAFE_API_KEY not set. Add it to .env or environment.')
-        payload = {'document': document, 'model': _TYPESAFE_MODEL, 'questions': questions}
-        headers = {'Authorization': f'Bearer {key}', 'Content-Type': 'application/json'}
-        resp = requests.post(_TYPESAFE_ENDPOINT, json=payload, headers=headers, timeout=30)
-        resp.raise_for_status()
-        return resp.json()['answers']
+        raises on a missing key or a failed request — the caller owns the fallback. Rides the
+        process-wide pooled client, so a repeat of the same request within the turn shares the
+        first one's round trip."""
+        return typesafe_client(_TYPESAFE_ENDPOINT, _TYPESAFE_MODEL).ask(document, questions)
+
+    async def atypesafe(self, document:dict, questions:dict) -> dict:
+        """Async sibling of `typesafe` on the same pooled client."""
+        return await typesafe_client(_TYPESAFE_ENDPOINT, _TYPESAFE_MODEL).aask(document, questions)
 
     def __call__(self, prompt:str, messages:list|None=None, task:str='skill', tier:str='med',
-                 max_tokens:int=1024, schema=None, family:str='', tools:list|None=None):
+                 max_tokens:int=1024, schema=None, family:str='', tools:list|None=None, on_text=None):
         """One model round — the single round primitive both loops share (round 2.16). Two
         shapes: with `messages`, `prompt` is a full system prompt and the raw provider response
         returns (PEX's orchestrator rounds; `flow_execute` loops this same call); without it,
         `prompt` is the user message, `task` picks the system suffix, and the reply text (or
-        the schema-validated object) returns."""
+        the schema-validated object) returns. Pass `on_text` to stream: it receives each text
+        delta as the provider sends it, and the return value is unchanged."""
         family = family or ACTIVE_FAMILY
         model_id = self._resolve_model(tier, family)
         schema_dict = self._to_json_schema(schema) if schema is not None else None
         if messages is not None:
             log.info('  round model=%s  tools=%d', model_id, len(tools or []))
-            match family:
-                case 'claude':
-                    return self._call_claude(prompt, messages, model_id, tools=tools,
-                                             max_tokens=max_tokens, schema_dict=schema_dict)
-                case 'gemini':   return self._call_gemini(prompt, messages, model_id, max_tokens, schema_dict=schema_dict)
-                case 'together': return self._call_together(prompt, messages, model_id, max_tokens, schema_dict=schema_dict)
-                case 'gpt':      return self._call_gpt(prompt, messages, model_id, max_tokens, schema_dict=schema_dict)
+            return self._cached(task,
+                lambda: self._round(family, prompt, messages, model_id, tools, max_tokens,
+                                    schema_dict, on_text), on_text,
+                family=family, model=model_id, system=prompt, messages=messages, tools=tools,
+                max_tokens=max_tokens, schema=schema_dict)
         messages = [{'role': 'user', 'content': prompt}]
         system = self._system_for_task(task)
         log.info('  task=%s  model=%s', task, model_id)
-        match family:
-            case 'claude':
-                response = self._call_claude(system, messages, model_id, max_tokens=max_tokens, schema_dict=schema_dict)
-                text = ''.join(block.text for block in response.content if block.type == 'text')
-            case 'gemini':
-                text = self._call_gemini(system, messages, model_id, max_tokens, schema_dict=schema_dict)
-            case 'together':
-                text = self._call_together(system, messages, model_id, max_tokens, schema_dict=schema_dict)
-            case 'gpt':
-                text = self._call_gpt(system, messages, model_id, max_tokens, schema_dict=schema_dict)
+        text = self._cached(task,
+            lambda: self._complete(family, system, messages, model_id, max_tokens, schema_dict,
+                                   on_text), on_text,
+            family=family, model=model_id, system=system, messages=messages,
+            max_tokens=max_tokens, schema=schema_dict)
         if schema is None:
             return text
         parsed = self.parse(text, format='json')
@@ -179,6 +250,69 @@ class PromptEngineer:
             return schema.model_validate(parsed)
         return parsed
 
+    def _round(self, family, system, messages, model_id, tools, max_tokens, schema_dict, on_text=None):
+        """Raw provider response for a full message list (the claude shape keeps tool_use blocks)."""
+        stream = {'on_text': on_text} if on_text else {}
+        match family:
+            case 'claude':
+                return self._call_claude(system, messages, model_id, tools=tools,
+                                         max_tokens=max_tokens, schema_dict=schema_dict, **stream)
+            case 'gemini':   return self._call_gemini(system, messages, model_id, max_tokens, schema_dict=schema_dict, **stream)
+            case 'together': return self._call_together(system, messages, model_id, max_tokens, schema_dict=schema_dict, **stream)
+            case 'gpt':      return self._call_gpt(system, messages, model_id, max_tokens, schema_dict=schema_dict, **stream)
+
+    def _complete(self, family, system, messages, model_id, max_tokens, schema_dict, on_text=None) -> str:
+        """Reply text for a single-prompt call."""
+        stream = {'on_text': on_text} if on_text else {}
+        match family:
+            case 'claude':
+                response = self._call_claude(system, messages, model_id, max_tokens=max_tokens,
+                                             schema_dict=schema_dict, **stream)
+                return ''.join(block.text for block in response.content if block.type == 'text')
+            case 'gemini':   return self._call_gemini(system, messages, model_id, max_tokens, schema_dict=schema_dict, **stream)
+            case 'together': return self._call_together(system, messages, model_id, max_tokens, schema_dict=schema_dict, **stream)
+            case 'gpt':      return self._call_gpt(system, messages, model_id, max_tokens, schema_dict=schema_dict, **stream)
+
+    # ── Response cache ───────────────────────────────────────────────
+
+    def _cached(self, task:str, produce, on_text=None, **request):
+        """Serve a repeated request from the response cache (when `llm_cache` is enabled and the
+        task's TTL allows it), otherwise call the provider and store what came back. Only plain
+        text and claude Messages are stored; any other response passes through uncached. A hit
+        still reaches a streaming caller, as one delta carrying the whole text."""
+        cache = self.response_cache
+        if cache is None or not cache.cacheable(task):
+            return produce()
+        key = request_key(version=self.VERSION, temperature=self._get_temperature(), **request)
+        payload = cache.get(key, task)
+        if payload is not None:
+            response = self._decode_response(payload)
+            text = response if isinstance(response, str) else ''.join(
+                block.text for block in response.content if block.type == 'text')
+            if on_text and text:
+                on_text(text)
+            return response
+        response = produce()
+        payload = self._encode_response(response)
+        if payload is not None:
+            cache.put(key, task, payload)
+        return response
+
+    @staticmethod
+    def _encode_response(response) -> str | None:
+        if isinstance(response, str):
+            return json.dumps({'text': response})
+        if isinstance(response, anthropic.types.Message):
+            return json.dumps({'claude': response.model_dump(mode='json')})
+        return None
+
+    @staticmethod
+    def _decode_response(payload:str):
+        stored = json.loads(payload)
+        if 'claude' in stored:
+            return anthropic.types.Message.model_validate(stored['claude'])
+        return stored['text']
+
     @staticmethod
     def _to_json_schema(schema) -> dict:
         if isinstance(schema, dict):
@@ -224,8 +358,10 @@ class PromptEngineer:
         extended = flow.name() in self._limits['extended_call_flows']
         max_num_calls = self._limits['extended_tool_calls' if extended else 'max_tool_calls']
 
+        read_only = [td['name'] for td in tool_defs if td.get('read_only')]
+        call_tool = ToolDispatcher(call_tool, read_only, self._limits.get('tool_workers', 4))
         family = ACTIVE_FAMILY
-        adapted = self._adapt_tool_defs(family, tool_defs)
+        adapted = self._tool_payload(family, tool_defs)
         match family:
             case 'claude':   return self._call_claude_with_tools(system, msgs, tier, adapted, call_tool, max_tokens, max_num_calls)
             case 'gemini':   return self._call_gemini_with_tools(system, msgs, model_id, adapted, call_tool, max_tokens, max_num_calls, schema_dict=schema)
@@ -255,7 +391,9 @@ class PromptEngineer:
             for tool_use in tool_uses:
                 log.info('  skill tool=%s  input=%s', tool_use.name,
                          {key: val for key, val in tool_use.input.items()} if tool_use.input else {})
-                result = call_tool(tool_use.name, tool_use.input)
+            results = ToolDispatcher.wrap(call_tool).run(
+                [(tool_use.name, tool_use.input) for tool_use in tool_uses])
+            for tool_use, result in zip(tool_uses, results):
                 tool_log.append({'tool': tool_use.name, 'input': tool_use.input, 'result': result})
                 tool_results.append({
                     'type': 'tool_result', 'tool_use_id': tool_use.id,
@@ -265,22 +403,27 @@ class PromptEngineer:
         return '\n'.join(text_parts), tool_log
 
     async def stream(self, prompt:str, task:str='skill', tier:str='med', max_tokens:int=4096):
-        """Token streaming. Same routing as __call__, yields text chunks."""
-        messages = [{'role': 'user', 'content': prompt}]
-        system = self._system_for_task(task)
-        model_id = self._resolve_model(tier)
-        log.info('  task=%s  model=%s  stream=true', task, model_id)
-        match ACTIVE_FAMILY:
-            case 'claude':
-                with self._get_client('anthropic').messages.stream(
-                    model=model_id, max_tokens=max_tokens,
-                    system=system, messages=messages,
-                ) as stm:
-                    for text in stm.text_stream:
-                        yield text
-            case _:
-                text = self(prompt, task=task, tier=tier, max_tokens=max_tokens)
-                yield text
+        """Token streaming for every family. Same routing as __call__; the blocking provider stream
+        runs on a worker thread and hands each delta to the event loop, so chunks are yielded as
+        they arrive. Provider errors re-raise once the stream ends."""
+        loop = asyncio.get_running_loop()
+        chunks:asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def emit(text:str):
+            loop.call_soon_threadsafe(chunks.put_nowait, text)
+
+        async def produce():
+            try:
+                await asyncio.to_thread(self, prompt, task=task, tier=tier, max_tokens=max_tokens,
+                                        on_text=emit)
+            finally:
+                chunks.put_nowait(done)
+
+        worker = asyncio.ensure_future(produce())
+        while (chunk := await chunks.get()) is not done:
+            yield chunk
+        await worker
 
     # ── Private provider methods ──────────────────────────────────────
 
@@ -296,7 +439,43 @@ class PromptEngineer:
                     time.sleep(min(backoff_base * (2 ** attempt), backoff_max))
         raise last_error
 
-    def _call_claude(self, system, messages, model_id, *, tools=None, max_tokens=4096, schema_dict=None):
+    def _retry_stream(self, run, on_text, retryable):
+        """`_retry` for a streaming call. `run(emit)` drives the provider stream and returns the
+        final response; a failure before the first delta retries like any call, but once text has
+        reached `on_text` it re-raises rather than replaying deltas the caller already holds."""
+        max_attempts, backoff_base, backoff_max = self._get_retry_config()
+        sent = False
+
+        def emit(text:str):
+            nonlocal sent
+            if text:
+                sent = True
+                on_text(text)
+        for attempt in range(max_attempts):
+            try:
+                return run(emit)
+            except retryable:
+                if sent or attempt == max_attempts - 1:
+                    raise
+                time.sleep(min(backoff_base * (2 ** attempt), backoff_max))
+
+    @staticmethod
+    def _mark_scenario_prefix(messages:list) -> list:
+        """Single-prompt calls (slot filling, flow detection) put a static prefix ahead of their
+        trailing <current_scenario> block; a third breakpoint right before it lets that prefix hit
+        the prompt cache across turns. Any other message list passes through unchanged."""
+        if len(messages) != 1 or not isinstance(messages[0].get('content'), str):
+            return messages
+        content = messages[0]['content']
+        cut = content.rfind('\n\n<current_scenario>')
+        if cut <= 0:
+            return messages
+        return [{**messages[0], 'content': [
+            {'type': 'text', 'text': content[:cut], 'cache_control': {'type': 'ephemeral'}},
+            {'type': 'text', 'text': content[cut:]}]}]
+
+    def _call_claude(self, system, messages, model_id, *, tools=None, max_tokens=4096, schema_dict=None,
+                     on_text=None):
         # Prompt caching: put a breakpoint at the end of the system prompt and at the end of tool
         # definitions. These are the stable prefix shared across turns within a flow; per-turn
         # content in `messages` sits after the cache boundary and is not cached.
@@ -307,30 +486,30 @@ class PromptEngineer:
         }] if system else []
         kwargs = {
             'model': model_id, 'max_tokens': max_tokens,
-            'system': system_blocks, 'messages': messages,
+            'system': system_blocks, 'messages': self._mark_scenario_prefix(messages),
         }
         temp = self._get_temperature()
         if temp > 0:
             kwargs['temperature'] = temp
         if tools:
-            tool_defs = [
-                {key: val for key, val in tool.items() if key in ('name', 'description', 'input_schema')}
-                for tool in tools
-            ]
-            if tool_defs:
-                # Cache breakpoint on the last tool definition.
-                tool_defs[-1] = {**tool_defs[-1], 'cache_control': {'type': 'ephemeral'}}
-            kwargs['tools'] = tool_defs
+            kwargs['tools'] = self._tool_payload('anthropic', tools)
         if schema_dict is not None:
             kwargs['output_config'] = {'format': {'type': 'json_schema', 'schema': schema_dict}}
         client = self._get_client('anthropic')
+        retryable = (anthropic.RateLimitError, anthropic.APITimeoutError, anthropic.InternalServerError)
+        if on_text:
+            def run(emit):
+                with client.messages.stream(**kwargs) as stm:
+                    for text in stm.text_stream:
+                        emit(text)
+                    return stm.get_final_message()
+            return self._retry_stream(run, on_text, retryable)
         try:
-            return self._retry(lambda: client.messages.create(**kwargs),
-                (anthropic.RateLimitError, anthropic.APITimeoutError, anthropic.InternalServerError))
+            return self._retry(lambda: client.messages.create(**kwargs), retryable)
         except anthropic.APIError:
             raise
 
-    def _call_gemini(self, system, messages, model_id, max_tokens=4096, schema_dict=None):
+    def _call_gemini(self, system, messages, model_id, max_tokens=4096, schema_dict=None, on_text=None):
         from google.genai import types
         temp = self._get_temperature()
         gemini_contents = [
@@ -351,6 +530,16 @@ class PromptEngineer:
             config.response_mime_type = 'application/json'
             config.response_json_schema = schema_dict
         client = self._get_client('google')
+        if on_text:
+            def run(emit):
+                parts = []
+                for chunk in client.models.generate_content_stream(
+                        model=model_id, contents=gemini_contents, config=config):
+                    if chunk.text:
+                        parts.append(chunk.text)
+                        emit(chunk.text)
+                return ''.join(parts)
+            return self._retry_stream(run, on_text, Exception)
         response = self._retry(
             lambda: client.models.generate_content(
                 model=model_id, contents=gemini_contents, config=config),
@@ -358,7 +547,7 @@ class PromptEngineer:
         )
         return response.text
 
-    def _call_gpt(self, system, messages, model_id, max_tokens=4096, schema_dict=None):
+    def _call_gpt(self, system, messages, model_id, max_tokens=4096, schema_dict=None, on_text=None):
         temp = self._get_temperature()
         oai_messages = [{'role': 'system', 'content': system}]
         oai_messages.extend({'role': msg['role'], 'content': msg['content']} for msg in messages)
@@ -374,14 +563,27 @@ class PromptEngineer:
                 'json_schema': {'name': 'response', 'schema': schema_dict, 'strict': True},
             }
         client = self._get_client('openai')
+        retryable = (openai.RateLimitError, openai.APITimeoutError, openai.InternalServerError)
+        if on_text:
+            return self._retry_stream(lambda emit: self._openai_stream_text(client, kwargs, emit),
+                                      on_text, retryable)
         try:
-            response = self._retry(lambda: client.chat.completions.create(**kwargs),
-                (openai.RateLimitError, openai.APITimeoutError, openai.InternalServerError))
+            response = self._retry(lambda: client.chat.completions.create(**kwargs), retryable)
             return response.choices[0].message.content or ''
         except openai.APIError:
             raise
 
-    def _call_together(self, system, messages, model_id, max_tokens=4096, schema_dict=None):
+    @staticmethod
+    def _openai_stream_text(client, kwargs, emit) -> str:
+        """Stream an OpenAI-compatible chat completion, emitting each content delta."""
+        parts = []
+        for chunk in client.chat.completions.create(**kwargs, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                emit(chunk.choices[0].delta.content)
+        return ''.join(parts)
+
+    def _call_together(self, system, messages, model_id, max_tokens=4096, schema_dict=None, on_text=None):
         temp = self._get_temperature()
         is_thinking = 'thinking' in model_id.lower()
         qwen_messages = [{'role': 'system', 'content': system}]
@@ -401,9 +603,12 @@ class PromptEngineer:
             }
         kwargs = {key: val for key, val in kwargs.items() if val is not None}
         client = self._get_client('together')
+        retryable = (openai.RateLimitError, openai.APITimeoutError, openai.InternalServerError)
+        if on_text and not is_thinking:   # thinking models stream their <think> block — hold those back
+            return self._retry_stream(lambda emit: self._openai_stream_text(client, kwargs, emit),
+                                      on_text, retryable)
         try:
-            response = self._retry(lambda: client.chat.completions.create(**kwargs),
-                (openai.RateLimitError, openai.APITimeoutError, openai.InternalServerError))
+            response = self._retry(lambda: client.chat.completions.create(**kwargs), retryable)
         except openai.APIError:
             raise
         raw_text = response.choices[0].message.content or ''
@@ -415,6 +620,8 @@ class PromptEngineer:
                 match = re.search(r'\{[^{}]*\}', raw_text)
                 if match:
                     raw_text = match.group()
+        if on_text and raw_text:
+            on_text(raw_text)
         return raw_text
 
     # ── Tool-use loops (per family) ──────────────────────────────────
@@ -436,6 +643,30 @@ class PromptEngineer:
             }} for t in tool_defs]
         raise ValueError(f'Unknown family for tool-def adapter: {family!r}')
 
+    @classmethod
+    def _tool_payload(cls, shape:str, tool_defs) -> list[dict]:
+        """Memoized provider payload for a tool list: a family from `_adapt_tool_defs`, or
+        'anthropic' for the request body itself (definition keys only, cache breakpoint on the last
+        tool). Repeat calls over the same definitions reuse the same dicts, byte for byte."""
+        tool_defs = tuple(tool_defs)
+        key = (shape, *map(id, tool_defs))
+        with _TOOL_PAYLOADS_LOCK:
+            entry = _TOOL_PAYLOADS.get(key)
+        if entry is None:
+            if shape == 'anthropic':
+                payload = [{field: val for field, val in tool.items()
+                            if field in ('name', 'description', 'input_schema')} for tool in tool_defs]
+                if payload:
+                    payload[-1] = {**payload[-1], 'cache_control': {'type': 'ephemeral'}}
+            else:
+                payload = cls._adapt_tool_defs(shape, tool_defs)
+            entry = (tool_defs, tuple(payload))
+            with _TOOL_PAYLOADS_LOCK:
+                if len(_TOOL_PAYLOADS) >= _TOOL_PAYLOAD_LIMIT:
+                    _TOOL_PAYLOADS.pop(next(iter(_TOOL_PAYLOADS)))   # oldest first
+                entry = _TOOL_PAYLOADS.setdefault(key, entry)
+        return list(entry[1])
+
     @staticmethod
     def _sanitize_for_gemini(schema):
         """Recursively trim JSON Schema features that Gemini's FunctionDeclaration rejects.
@@ -493,10 +724,13 @@ class PromptEngineer:
                 break
             contents.append(candidate.content)
             response_parts = []
+            calls = []
             for fc in function_calls:
                 args = dict(fc.args) if fc.args else {}
                 log.info('  skill tool=%s  input=%s', fc.name, args)
-                result = call_tool(fc.name, args)
+                calls.append((fc.name, args))
+            results = ToolDispatcher.wrap(call_tool).run(calls)
+            for fc, (_, args), result in zip(function_calls, calls, results):
                 tool_log.append({'tool': fc.name, 'input': args, 'result': result})
                 response_parts.append(types.Part.from_function_response(
                     name=fc.name, response={'result': result},
@@ -564,10 +798,13 @@ class PromptEngineer:
                     'function': {'name': tc.function.name, 'arguments': tc.function.arguments},
                 } for tc in tool_calls],
             })
+            calls = []
             for tc in tool_calls:
                 args = json.loads(tc.function.arguments) if tc.function.arguments else {}
                 log.info('  skill tool=%s  input=%s', tc.function.name, args)
-                result = call_tool(tc.function.name, args)
+                calls.append((tc.function.name, args))
+            results = ToolDispatcher.wrap(call_tool).run(calls)
+            for tc, (_, args), result in zip(tool_calls, calls, results):
                 tool_log.append({'tool': tc.function.name, 'input': args, 'result': result})
                 msgs.append({
                     'role': 'tool', 'tool_call_id': tc.id,
@@ -697,13 +934,20 @@ class PromptEngineer:
 
     @classmethod
     def load_flow_prompt(cls, flow_name:str) -> str:
-        """Full markdown instruction prompt for a flow sub-agent (pex/flows/<flow>.md)."""
-        return (cls._FLOW_DIR / f'{flow_name}.md').read_text(encoding='utf-8')
+        """Full markdown instruction prompt for a flow sub-agent (pex/flows/<flow>.md), served from
+        the in-memory prompt registry."""
+        return prompt_registry(cls._FLOW_DIR).get(flow_name)
 
     @classmethod
     def load_skill(cls, skill_name:str) -> str:
         """An agent-level skill body (pex/skills/<skill>.md) — currently only the Workflow Planner."""
-        return (cls._SKILL_DIR / f'{skill_name}.md').read_text(encoding='utf-8')
+        return prompt_registry(cls._SKILL_DIR).get(skill_name)
+
+    @classmethod
+    def prompt_stats(cls) -> dict:
+        """Estimated token counts per flow and skill prompt."""
+        return {'flows': prompt_registry(cls._FLOW_DIR).stats(),
+                'skills': prompt_registry(cls._SKILL_DIR).stats()}
 
     @staticmethod
     def extract_tool_result(tool_log:list, tool_name:str) -> dict:
@@ -1,6 +1,13 @@
 import json
+import os
+import threading
 from pathlib import Path
 
+from backend.utilities import checkpoint
+
+_DELTA = '_delta'          # reserved key marking a delta record (never an entry)
+_COMPACT_AFTER = 64        # delta records tolerated before the log is folded and rewritten
+
 
 class SessionScratchpad:
     """The open-ended working ledger — the cross-flow channel where the swarm shares findings within
@@ -9,10 +16,20 @@ class SessionScratchpad:
 
     One storage mode: an append-only JSONL file in the session dir, so every agent and sub-agent shares
     the same pad on disk. Entries are free-form dicts, each stamped with `origin` by this code rather than
-    from LLM input. When an origin is written more than once, the newest entry wins on read."""
+    from LLM input. When an origin is written more than once, the newest entry wins on read.
+
+    The file is a log: entry lines, plus delta lines carrying `_delta` that record consumption
+    (`consume`), NLU amendments (`amend`) and prunes (`prune`) against an entry's sequence number
+    (its position among entry lines). The pad keeps the folded view in memory and remembers the byte
+    offset it has read up to, so each call only parses lines appended since — by this instance or any
+    other writer. Once enough deltas pile up the log is compacted: the live entries are written to a
+    temp file and swapped in atomically, so a crash at any point leaves either the old log or the new
+    one, never a partial pad. A torn final line (a crash mid-append) is skipped on load."""
 
     def __init__(self, scratchpad_path:str|None=None):
         self._pathway = Path(scratchpad_path) if scratchpad_path else None
+        self._lock = threading.RLock()
+        self._reset_view(None, None)
 
     def append_entry(self, origin:str, entry:dict):
         """The write surface for PEX, the policies, and every sub-agent. Each entry contains:
@@ -21,11 +38,13 @@ class SessionScratchpad:
           * `used_count` - tracks how many times the entry has been read
         The session dir is created lazily on the first append if it does not already exist"""
         stamped = {'version': 1, 'used_count': 0, **entry, 'origin': origin}
-        self._pathway.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._pathway, 'a', encoding='utf-8') as file:
-            file.write(json.dumps(stamped) + '\n')
+        stamped.pop(_DELTA, None)
+        with self._lock:
+            self._sync()
+            self._append_record(stamped)
 
-    def read(self, origin:str|None=None, keys:list[str]|None=None, consume:bool=True) -> list[dict]:
+    def read(self, origin:str|None=None, keys:list[str]|None=None, consume:bool=True,
+             unseen:bool=False) -> list[dict]:
         """Entries in append order (newest last), optionally filtered by `origin` and/or by `keys`
         that must all be present on an entry.
 
@@ -34,66 +53,178 @@ class SessionScratchpad:
         refresh uses it as its seen-cursor (round 5.2). The returned dicts keep the pre-bump
         value so callers can still filter on it. Pass `consume=False` for maintenance scans
         and context renders that must not advance the cursor (NLU's review pass, the skill
-        prompt's pad view)."""
-        selected = entries = self._load()
-        if origin:
-            selected = [entry for entry in selected if entry['origin'] == origin]
-        if keys:
-            selected = [entry for entry in selected if all(name in entry for name in keys)]
-        consumed = {id(entry) for entry in selected if entry.get('used_count') == 0}
-        if consume and consumed:
-            returned = [dict(entry) for entry in selected]     # pre-bump copies for the caller
-            for entry in entries:
-                if id(entry) in consumed:
-                    entry['used_count'] += 1
-            self._rewrite(entries)
+        prompt's pad view). `unseen=True` narrows the read to entries still at `used_count == 0`
+        without walking the rest of the pad."""
+        with self._lock:
+            self._sync()
+            if unseen:
+                selected = [(seq, self._entries[seq]) for seq in self._unseen]
+            else:
+                selected = list(self._entries.items())
+            if origin:
+                selected = [(seq, entry) for seq, entry in selected if entry['origin'] == origin]
+            if keys:
+                selected = [(seq, entry) for seq, entry in selected
+                            if all(name in entry for name in keys)]
+            returned = [dict(entry) for _, entry in selected]     # pre-bump copies for the caller
+            consumed = [seq for seq, entry in selected if entry.get('used_count') == 0]
+            if consume and consumed:
+                self._append_record({_DELTA: 'consume', 'seqs': consumed})
             return returned
-        return selected
 
     def amend_entry(self, origin:str, turn_number:int, entry:dict, reset:bool=False):
         """NLU-only (the review pass): modify an EXISTING entry in place — origin + turn_number
         is the pad's unique ID. Everyone else appends; only NLU may amend history. The amender
         decides whether the entry becomes consumable again: `reset=True` restarts `used_count`
         at 0; by default the stored count is kept untouched (round 5.2)."""
-        entries = self._load()
-        idx = self._locate(entries, origin, turn_number)
-        count = 0 if reset else entries[idx].get('used_count', 0)
-        entries[idx] = {'version': 1, **entry, 'origin': origin, 'used_count': count}
-        self._rewrite(entries)
+        with self._lock:
+            self._sync()
+            seq = self._locate(origin, turn_number)
+            count = 0 if reset else self._entries[seq].get('used_count', 0)
+            amended = {'version': 1, **entry, 'origin': origin, 'used_count': count}
+            amended.pop(_DELTA, None)
+            self._append_record({_DELTA: 'amend', 'seq': seq, 'entry': amended})
 
     def prune_entry(self, origin:str, turn_number:int):
         """NLU-only (the review pass): remove the entry identified by origin + turn_number —
-        e.g. a stale note or a merged duplicate. The file is rewritten without it."""
-        entries = self._load()
-        entries.pop(self._locate(entries, origin, turn_number))
-        self._rewrite(entries)
-
-    def _load(self) -> list[dict]:
-        """All entries, no filtering, no consuming — the shared loader for read/amend/prune."""
-        if not self._pathway.exists():
-            return []
-        lines = self._pathway.read_text(encoding='utf-8').splitlines()
-        return [json.loads(line) for line in lines]
-
-    def _locate(self, entries:list, origin:str, turn_number:int) -> int:
-        """Index of the entry carrying the unique ID (the newest match, should duplicate appends
-        exist). Raises when no entry carries it."""
-        matches = [idx for idx, entry in enumerate(entries)
+        e.g. a stale note or a merged duplicate. Recorded as a prune delta; compaction drops it."""
+        with self._lock:
+            self._sync()
+            seq = self._locate(origin, turn_number)
+            self._append_record({_DELTA: 'prune', 'seq': seq})
+
+    def _locate(self, origin:str, turn_number:int) -> int:
+        """Sequence number of the entry carrying the unique ID (the newest match, should duplicate
+        appends exist). Raises when no entry carries it."""
+        matches = [seq for seq, entry in self._entries.items()
                    if entry['origin'] == origin and entry.get('turn_number') == turn_number]
         if not matches:
             raise KeyError(f'scratchpad: no entry with origin={origin!r} turn_number={turn_number!r}')
         return matches[-1]
 
-    def _rewrite(self, entries:list):
-        lines = [json.dumps(entry) for entry in entries]
-        self._pathway.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    # ── Log view ─────────────────────────────────────────────────────
+
+    def snapshot(self) -> dict:
+        """The folded view plus a mark of the log bytes it covers, for the session checkpoint."""
+        with self._lock:
+            self._sync()
+            return {'mark': checkpoint.mark(self._pathway, self._offset) if self._pathway else {'size': 0},
+                    'entries': list(self._entries.items()), 'unseen': list(self._unseen),
+                    'next_seq': self._next_seq, 'deltas': self._deltas}
+
+    def restore(self, view:dict) -> bool:
+        """Adopt a checkpointed view when the log still begins with the bytes it covers, so the
+        next read folds only lines appended since. False leaves the full re-read to `_sync`."""
+        with self._lock:
+            path = self._pathway
+            if path is None or not checkpoint.mark_holds(path, view['mark']):
+                return False
+            self._reset_view(path, path.stat().st_ino)
+            self._offset = view['mark']['size']
+            self._entries = {seq: entry for seq, entry in view['entries']}
+            self._unseen = dict.fromkeys(view['unseen'])
+            self._next_seq, self._deltas = view['next_seq'], view['deltas']
+            return True
+
+    def _reset_view(self, path:Path|None, file_id:int|None):
+        self._view_path = path
+        self._file_id = file_id
+        self._offset = 0            # bytes of the file already folded into the view
+        self._torn = False          # unread bytes without a trailing newline (crash mid-append)
+        self._entries:dict[int, dict] = {}
+        self._unseen:dict[int, None] = {}   # ordered set of seqs still at used_count == 0
+        self._next_seq = 0
+        self._deltas = 0
+
+    def _sync(self):
+        """Fold any lines appended since the last call. A different path, a new inode (compaction)
+        or a shrunken file (clear, session reset) drops the view and re-reads from the start."""
+        path = self._pathway
+        try:
+            stat = path.stat() if path else None
+        except FileNotFoundError:
+            stat = None
+        file_id = stat.st_ino if stat else None
+        if path != self._view_path or file_id != self._file_id or (stat and stat.st_size < self._offset):
+            self._reset_view(path, file_id)
+        if stat is None or stat.st_size == self._offset:
+            self._torn = False
+            return
+        with open(path, 'rb') as file:
+            file.seek(self._offset)
+            chunk = file.read()
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            self._fold(line)
+        self._offset += end
+        self._torn = end < len(chunk)
+
+    def _fold(self, line:bytes):
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return                  # a torn write from a crash — never a committed entry
+        op = record.get(_DELTA)
+        if op is None:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._entries[seq] = record
+            if record.get('used_count') == 0:
+                self._unseen[seq] = None
+            return
+        self._deltas += 1
+        if op == 'consume':
+            for seq in record['seqs']:
+                if seq in self._entries:
+                    self._entries[seq]['used_count'] = self._entries[seq].get('used_count', 0) + 1
+                    self._unseen.pop(seq, None)
+        elif op == 'amend' and record['seq'] in self._entries:
+            self._entries[record['seq']] = record['entry']
+            if record['entry'].get('used_count') == 0:
+                self._unseen[record['seq']] = None
+                self._unseen = dict.fromkeys(sorted(self._unseen))
+            else:
+                self._unseen.pop(record['seq'], None)
+        elif op == 'prune':
+            self._entries.pop(record['seq'], None)
+            self._unseen.pop(record['seq'], None)
+
+    def _append_record(self, record:dict):
+        """Append one line and fold it into the view (the caller holds the lock and has synced)."""
+        self._pathway.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(record) + '\n'
+        if self._torn:
+            line = '\n' + line      # fence off a torn tail so it cannot swallow this record
+        with open(self._pathway, 'a', encoding='utf-8') as file:
+            file.write(line)
+        self._sync()
+        if self._deltas >= max(_COMPACT_AFTER, len(self._entries)):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the log as just its live entries (temp + fsync + rename)."""
+        entries = list(self._entries.values())
+        tmp = self._pathway.with_suffix('.jsonl.tmp')
+        with open(tmp, 'w', encoding='utf-8') as file:
+            file.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+            file.flush()
+            os.fsync(file.fileno())
+        tmp.replace(self._pathway)
+        self._view_path = None      # force a clean re-read of the compacted file
+        self._sync()
 
     def clear(self):
         if self._pathway and self._pathway.exists():
-            self._pathway.write_text('', encoding='utf-8')
+            with self._lock:
+                self._pathway.write_text('', encoding='utf-8')
+                self._reset_view(None, None)
 
     @property
     def size(self) -> int:
-        if not self._pathway.exists():
+        if self._pathway is None:
             return 0
-        return len(self._pathway.read_text(encoding='utf-8').splitlines())
+        with self._lock:
+            self._sync()
+            return len(self._entries)
@@ -3,8 +3,11 @@ import threading
 from pathlib import Path
 
 from backend.components.task_artifact import TaskArtifact
+from backend.utilities import checkpoint
+from backend.utilities.journal import SessionJournal
 
 _SESSIONS_DIR = Path(__file__).resolve().parents[2] / 'database' / 'sessions'
+_CHECKPOINT = 'session.ckpt'
 
 
 class World:
@@ -22,6 +25,11 @@ class World:
         self.prefs = mem.user_preferences
         self.knowledge = mem.business_knowledge
 
+        # Session files are written behind through one journal and fsynced at turn end.
+        persistence = config.get('session', {}).get('persistence', {})
+        self.journal = SessionJournal(persistence.get('flush_interval_ms', 1000) / 1000)
+        self.context.journal = self.journal
+
         # Let PEX wait for NLU to finish without polling the scratchpad.
         self.nlu_done = threading.Event()
         self.nlu_done.set()
@@ -38,11 +46,24 @@ class World:
     # ── Session-dir lifecycle ─────
 
     def open_session(self, conversation_id:str):
-        """Bind the World to a session directory while preserving each component's live object."""
+        """Bind the World to a session directory while preserving each component's live object.
+        A valid session checkpoint restores history, scratchpad, flow stack and state in one read,
+        folding in only log lines appended since; otherwise history.jsonl is parsed in full."""
         self.conversation_id = conversation_id
         session_path = _SESSIONS_DIR / conversation_id
-        self.context.load_history(session_path / 'history.jsonl')
+        snapshot = checkpoint.load(session_path / _CHECKPOINT)
         self.scratchpad._pathway = Path(session_path / 'scratchpad.jsonl')
+        if self.context.load_history(session_path / 'history.jsonl', snapshot and snapshot['history']):
+            self.scratchpad.restore(snapshot['scratchpad'])
+            self.flows.restore(snapshot['flows'])
+            self.state.restore(snapshot['state'])
+
+    def write_checkpoint(self):
+        """Snapshot the session for a one-read resume. Runs at turn end, after the journal commit,
+        so the history mark covers exactly the turns in memory."""
+        checkpoint.save(self.session_dir() / _CHECKPOINT, {
+            'history': self.context.snapshot_history(), 'scratchpad': self.scratchpad.snapshot(),
+            'flows': self.flows.to_list(), 'state': self.state.read_state()})
 
     def session_dir(self) -> Path:
         """database/sessions/<conversation_id>/ — created lazily on first access."""
@@ -52,6 +73,7 @@ class World:
 
     def reset(self):
         """Reset every component in place and recreate the current session directory."""
+        self.journal.discard()
         self.state.reset()
         self.flows.reset()
         self.context.reset()
@@ -1,44 +1,326 @@
+"""Per-user Assistant pool behind the websocket.
+
+A disconnect detaches the user's Assistant instead of destroying it, so a reconnect within the idle
+window reuses the warm object. Detached Assistants are parked once they sit idle past
+`session.idle_timeout_ms`, or — least recently used first — when more than `session.pool_size` are
+live; parking writes the session's parked.json (`Assistant.park`) and drops the object. The next
+`get_or_create` for that user rehydrates it from disk lazily, skipping the system-prompt build. An
+Assistant that is connected or still running a turn (`begin_turn` / `end_turn`, since a websocket can
+drop while `take_turn` runs on a worker thread) is never parked, so the cap bounds idle memory, not
+active users.
+
+Building, rehydrating and parking read or write files, so none of them run under the pool lock: the
+user is reserved under the lock, the work happens outside it, and another `get_or_create` for that
+same user waits on the reservation while every other user's turns carry on. After a park, session
+directories untouched for `session.persistence.ttl_hours` are deleted, never a live or in-flight
+one. `stats` reports occupancy, churn and process memory.
+"""
 import gc
+import json
+import logging
+import resource
+import shutil
+import sys
 import threading
+import time
+from collections import OrderedDict
 
+from schemas.config import load_config
 from backend.assistant import Assistant
+from backend.components import world
+
+log = logging.getLogger(__name__)
+
+
+class _Slot:
+    __slots__ = ('assistant', 'last_used', 'connections', 'turns')
+
+    def __init__(self, assistant:Assistant):
+        self.assistant = assistant
+        self.last_used = time.monotonic()
+        self.connections = 0
+        self.turns = 0          # turns (or resets) in progress; a busy slot is never parked
+
+    @property
+    def idle(self) -> bool:
+        return self.connections == 0 and self.turns == 0
 
 
 class Manager:
 
-    def __init__(self):
-        self._assistants: dict[str, Assistant] = {}
-        self._write_lock = threading.Lock()
+    def __init__(self, config=None):
+        self._config = config
+        self._live:OrderedDict[str, _Slot] = OrderedDict()   # least recently used first
+        self._parked:dict[str, str] | None = None            # username -> conversation_id
+        self._parking:dict[str, tuple[threading.Event, str | None]] = {}   # username -> (done, convo)
+        self._building:dict[str, tuple[threading.Event, str | None]] = {}  # same, for a build or rehydrate
+        self._write_lock = threading.RLock()
+        self._sweeper:threading.Thread | None = None
+        self._counts = {'created': 0, 'reused': 0, 'rehydrated': 0, 'parked': 0, 'expired': 0}
 
-    def get_or_create(self, username:str) -> Assistant:
-        if username in self._assistants:
-            return self._assistants[username]
+    @property
+    def config(self):
+        if self._config is None:
+            self._config = load_config()   # once per process; every Assistant shares it
+        return self._config
 
-        with self._write_lock:
-            if username in self._assistants:
-                return self._assistants[username]
-            assistant = Assistant(username)
-            self._assistants[username] = assistant
-            return assistant
+    @property
+    def idle_timeout_s(self) -> float:
+        return self.config['session']['idle_timeout_ms'] / 1000
+
+    @property
+    def capacity(self) -> int:
+        return self.config['session']['pool_size']
+
+    @property
+    def ttl_s(self) -> float:
+        return self.config['session']['persistence']['ttl_hours'] * 3600
+
+    def get_or_create(self, username:str) -> Assistant:
+        while True:
+            with self._write_lock:
+                pending = self._parking.get(username) or self._building.get(username)
+                if pending is None:
+                    slot = self._live.get(username)
+                    if slot is None:       # reserve the user; the build runs outside the lock
+                        conversation_id = self._parked_index().pop(username, None)
+                        self._building[username] = (threading.Event(), conversation_id)
+                    else:
+                        self._counts['reused'] += 1
+                        evicted = self._attach(username, slot)
+                    break
+            pending[0].wait()       # parked.json must be on disk, or the other build published
+        if slot is None:
+            slot, evicted = self._build(username, conversation_id)
+        self._park_all(evicted)
+        self._start_sweeper()
+        return slot.assistant
 
     def cleanup(self, username:str, source:str='general') -> bool:
-        assistant = self._assistants.pop(username, None)
-        if assistant is None:
-            return False
-        if hasattr(assistant, 'close'):
-            try:
-                assistant.close()
-            except Exception:
-                pass
-        gc.collect()
+        """Detach one connection. The Assistant stays live for a reconnect until the sweeper
+        parks it; a `source` other than 'websocket' parks it right away unless a turn is running."""
+        with self._write_lock:
+            slot = self._live.get(username)
+            if slot is None:
+                return False
+            slot.connections = max(slot.connections - 1, 0)
+            slot.last_used = time.monotonic()
+            if source != 'websocket' and slot.idle:
+                evicted = [self._detach(username)]
+            else:
+                evicted = self._over_capacity()
+        self._park_all(evicted)
         return True
 
+    def begin_turn(self, username:str) -> bool:
+        """Mark the user's Assistant busy until the matching `end_turn`; False when it is not live."""
+        with self._write_lock:
+            slot = self._live.get(username)
+            if slot is None:
+                return False
+            slot.turns += 1
+            return True
+
+    def end_turn(self, username:str):
+        with self._write_lock:
+            slot = self._live.get(username)
+            if slot is None:
+                return
+            slot.turns = max(slot.turns - 1, 0)
+            slot.last_used = time.monotonic()
+            evicted = self._over_capacity()
+        self._park_all(evicted)
+
     def reset(self, username:str) -> dict:
-        if username not in self._assistants:
-            return {'message': 'No active session to reset'}
-        self._assistants[username].reset()
+        with self._write_lock:
+            slot = self._live.get(username)
+            if slot is None:
+                return {'message': 'No active session to reset'}
+            slot.turns += 1
+        try:
+            slot.assistant.reset()
+        finally:
+            self.end_turn(username)
         return {'message': 'Session reset successfully'}
 
+    def sweep(self) -> int:
+        """Park every idle, detached Assistant past the timeout; returns how many were parked."""
+        cutoff = time.monotonic() - self.idle_timeout_s
+        with self._write_lock:
+            idle = [name for name, slot in self._live.items() if slot.idle and slot.last_used <= cutoff]
+            evicted = [self._detach(username) for username in idle]
+            self._counts['expired'] += len(evicted)
+        self._park_all(evicted)
+        return len(evicted)
+
+    def stats(self) -> dict:
+        with self._write_lock:
+            slots = list(self._live.values())
+            parked = len(self._parked_index())
+            counts = dict(self._counts)
+        turns = sum(slot.assistant.world.context.turn_count for slot in slots)
+        return {'live': len(slots), 'connected': sum(1 for slot in slots if slot.connections),
+                'busy': sum(1 for slot in slots if slot.turns), 'parked': parked,
+                'capacity': self.capacity, 'created': counts['created'], 'reused': counts['reused'],
+                'rehydrated': counts['rehydrated'], 'parked_total': counts['parked'],
+                'expired': counts['expired'], 'history_turns': turns,
+                'rss_mb': _current_rss_mb(), 'peak_rss_mb': _peak_rss_mb()}
+
+    # -- Pool internals -----------------------------------------------------
+
+    def _build(self, username:str, conversation_id:str | None) -> tuple[_Slot, list]:
+        """Rehydrate the reserved user's parked session, or construct a fresh Assistant, outside the
+        lock; then publish the slot and release anyone waiting on the reservation."""
+        try:
+            assistant = self._rehydrate(username, conversation_id)
+            kind = 'rehydrated'
+            if assistant is None:
+                assistant, kind = Assistant(username, self.config), 'created'
+        except BaseException:
+            with self._write_lock:
+                if conversation_id is not None:   # still parked on disk; the next attempt retries
+                    self._parked_index().setdefault(username, conversation_id)
+                self._building.pop(username)[0].set()
+            raise
+        with self._write_lock:
+            self._counts[kind] += 1
+            slot = self._live[username] = _Slot(assistant)
+            evicted = self._attach(username, slot)
+            self._building.pop(username)[0].set()
+        return slot, evicted
+
+    def _rehydrate(self, username:str, conversation_id:str | None) -> Assistant | None:
+        if conversation_id is None:
+            return None
+        try:
+            return Assistant.rehydrate(username, conversation_id, self.config)
+        except (OSError, ValueError, KeyError) as ecp:
+            log.warning('could not rehydrate %s from %s: %s', username, conversation_id, ecp)
+            return None
+
+    def _attach(self, username:str, slot:_Slot) -> list[tuple[str, _Slot]]:
+        """Count a connection on a live slot. Caller holds the lock."""
+        self._live.move_to_end(username)
+        slot.connections += 1
+        slot.last_used = time.monotonic()
+        return self._over_capacity()
+
+    def _over_capacity(self) -> list[tuple[str, _Slot]]:
+        """Detach the least recently used idle slots beyond the cap. Caller holds the lock and
+        parks the result after releasing it."""
+        excess = len(self._live) - self.capacity
+        if excess <= 0:
+            return []
+        idle = [name for name, slot in self._live.items() if slot.idle]
+        return [self._detach(username) for username in idle[:excess]]
+
+    def _detach(self, username:str) -> tuple[str, _Slot]:
+        slot = self._live.pop(username)
+        self._parking[username] = (threading.Event(), slot.assistant.world.conversation_id)
+        return username, slot
+
+    def _park_all(self, evicted:list[tuple[str, _Slot]]):
+        if not evicted:
+            return
+        for username, slot in evicted:
+            self._park(username, slot)
+        self._prune_sessions()
+        gc.collect()
+
+    def _park(self, username:str, slot:_Slot):
+        """Write parked.json and close the Assistant — file I/O, so never under the pool lock."""
+        conversation_id = None
+        try:
+            conversation_id = slot.assistant.park()
+        except OSError as ecp:
+            log.warning('could not park %s: %s', username, ecp)
+        finally:
+            slot.assistant.close()
+            with self._write_lock:
+                if conversation_id is not None:
+                    self._parked_index()[username] = conversation_id
+                self._counts['parked'] += 1
+                self._parking.pop(username)[0].set()
+
+    def _prune_sessions(self):
+        """Delete session dirs nothing has written to for `ttl_s`, with their parked-index entries.
+        Live, mid-park and mid-rehydrate sessions always stay."""
+        root = world._SESSIONS_DIR
+        if not root.is_dir():
+            return
+        with self._write_lock:
+            keep = {slot.assistant.world.conversation_id for slot in self._live.values()}
+            keep |= {convo for _, convo in (*self._parking.values(), *self._building.values())}
+        cutoff = time.time() - self.ttl_s
+        stale = [path for path in root.iterdir()
+                 if path.is_dir() and path.name not in keep and _last_write(path) < cutoff]
+        if not stale:
+            return
+        dropped = {path.name for path in stale}
+        with self._write_lock:
+            index = self._parked_index()
+            for owner in [owner for owner, convo in index.items() if convo in dropped]:
+                del index[owner]
+        for path in stale:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _parked_index(self) -> dict[str, str]:
+        """username -> conversation_id of every parked session, scanned from disk on first use so a
+        restarted server still resumes sessions parked by the previous process."""
+        if self._parked is None:
+            self._parked = {}
+            found = sorted(world._SESSIONS_DIR.glob('*/parked.json'), key=lambda p: p.stat().st_mtime)
+            for path in found:   # oldest first, so a user's newest parked session wins
+                self._parked[_owner(path)] = path.parent.name
+        return self._parked
+
+    def _start_sweeper(self):
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        interval = min(self.idle_timeout_s / 4, 60.0)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception as ecp:  # noqa: BLE001 — the sweeper outlives one bad park
+                    log.warning('session sweep failed: %s', ecp)
+        self._sweeper = threading.Thread(target=run, name='session-sweeper', daemon=True)
+        self._sweeper.start()
+
+
+def _owner(path) -> str:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))['username']
+    except (OSError, ValueError, KeyError):
+        return path.parent.name.rsplit('_', 2)[0]   # <username>_<date>_<time>
+
+
+def _last_write(path) -> float:
+    """Newest mtime of a session dir and its files; appends to history.jsonl leave the dir's own
+    mtime alone."""
+    try:
+        return max([path.stat().st_mtime] + [child.stat().st_mtime for child in path.iterdir()])
+    except OSError:
+        return time.time()      # vanished or unreadable mid-scan: leave it for the next prune
+
+
+def _current_rss_mb() -> float | None:
+    """Resident memory now (Linux /proc), so a park's release shows up; None elsewhere."""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as handle:
+            pages = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * resource.getpagesize() / (1024 * 1024), 1)
+
+
+def _peak_rss_mb() -> float:
+    """High-water mark since process start; it never goes down."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
 
 _manager = Manager()
 
@@ -51,5 +333,17 @@ def cleanup_assistant(username:str, source:str='general') -> bool:
     return _manager.cleanup(username, source)
 
 
+def begin_assistant_turn(username:str) -> bool:
+    return _manager.begin_turn(username)
+
+
+def end_assistant_turn(username:str):
+    _manager.end_turn(username)
+
+
 def reset_assistant(username:str) -> dict:
     return _manager.reset(username)
+
+
+def session_pool_stats() -> dict:
+    return _manager.stats()
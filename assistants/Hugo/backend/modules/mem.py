@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from backend.components.context_coordinator import ContextCoordinator
 from backend.components.user_preferences import UserPreferences
@@ -10,18 +11,23 @@ log = logging.getLogger(__name__)
 class MemoryExtensionModule:
     """Own the three memory levels and expose `recap`, `recall`, and `retrieve` for L1, L2, and L3.
     The World shares MEM's components; level-specific operations run through context, preferences, and
-    business knowledge. `recap` wraps each turn with start → compaction → finish."""
+    business knowledge. `recap` wraps each turn with start → compaction → finish; the compaction
+    summary itself runs on a per-session background worker and lands at the start of a later turn."""
 
     def __init__(self, config, engineer, username:str):
         self.config = config
         self.engineer = engineer
         self.context_coordinator = ContextCoordinator(config)   # L1: append-only event stream
         self.user_preferences = UserPreferences(config, username)         # L2: account defaults
-        self.business_knowledge = BusinessKnowledge(engineer)    # L3: business knowledge and FAQs
+        self.business_knowledge = BusinessKnowledge(engineer, config)   # L3: business knowledge and FAQs
         self.world = None  # Attached by the Assistant after World construction.
+        self._compactor:ThreadPoolExecutor | None = None   # one summarizer thread per session, lazy
+        self._pending_compaction:tuple | None = None       # (plan, future) from the last schedule
+        self._compaction_due = 0                           # prompt tokens of the turn that hit threshold
 
     def recap(self, utterance:str, prompt_tokens:int=0, recently_finished:tuple=()):
-        """Record the agent turn, checkpoint and reset per-turn state, check compaction, then persist.
+        """Record the agent turn, checkpoint and reset per-turn state, check compaction, then persist
+        and write the binary session checkpoint that a resume loads in one read.
         `prompt_tokens` is PEX's actual usage; `recently_finished` contains every popped flow, of which
         MEM stores only Completed members."""
         completed = [flow for flow in recently_finished if flow.status == 'Completed']
@@ -30,6 +36,10 @@ class MemoryExtensionModule:
         # TODO: artifact long-term storage (save world.artifacts to artifacts.jsonl in the session dir)
         self._compaction_check(prompt_tokens)
         self.finish()
+        try:
+            self.world.write_checkpoint()
+        except OSError as ecp:   # the JSONL logs still hold the turn; resume just parses them
+            log.warning('session checkpoint not written: %s', ecp)
 
     def start(self, completed:tuple=()):
         """Save the turn-wrap checkpoint with Completed and Active flows and the grounded post, then reset
@@ -55,10 +65,12 @@ class MemoryExtensionModule:
             state.grounding['choices'] = []
 
     def finish(self):
-        """Check the live stack, copy Context's authoritative turn count, and save `state.json`."""
+        """Check the live stack, copy Context's authoritative turn count, save `state.json`, and
+        commit the session journal — the turn's one fsync point."""
         self._check_turn_end_shape(self.world.flows.to_list())
         self.world.state.turn_id = self.world.context.num_utterances
-        self.world.state.save(self.world.session_dir() / 'state.json')
+        self.world.state.save(self.world.session_dir() / 'state.json', self.world.journal)
+        self.world.journal.commit()
 
     @staticmethod
     def _check_turn_end_shape(stack:list):
@@ -69,16 +81,62 @@ class MemoryExtensionModule:
                         stack[-1]['flow_name'], stack[-1]['status'])
 
     def _compaction_check(self, prompt_tokens:int):
-        """Compact at turn end when PEX's actual prompt-token usage reaches the configured threshold.
-        A summarizer failure preserves the message list and does not prevent delivery of the reply."""
+        """Schedule compaction at turn end without waiting on it. From `precompute_ratio` x the
+        threshold on, the middle the next compaction would fold is planned here and summarized on
+        the background worker; once PEX's actual prompt-token usage reaches the threshold,
+        `swap_in_compaction` splices the summary at the start of a later turn.
+
+        One plan is kept until it is applied. Turns appended after it sit past its cut and stay
+        verbatim, so crossing the threshold does not re-plan; only a plan staled by a reset or
+        reload, or one whose summary failed, is replaced."""
         compaction = self.config['compaction']
-        if prompt_tokens < compaction['threshold_tokens']:
+        threshold = compaction['threshold_tokens']
+        if prompt_tokens >= threshold:
+            self._compaction_due = prompt_tokens
+        if prompt_tokens < threshold * compaction.get('precompute_ratio', 1.0):
+            return
+        pending = self._pending_compaction
+        if pending is not None:
+            plan, future = pending
+            failed = future.done() and not future.cancelled() and future.exception() is not None
+            if plan['epoch'] == self.context_coordinator.epoch and not failed:
+                return                                  # the plan in hand is still current
+            future.cancel()
+        plan = self.context_coordinator.plan_compaction(compaction['protect_tail'])
+        if plan is None:
+            self._pending_compaction = None
             return
+        if self._compactor is None:
+            self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='compactor')
+        future = self._compactor.submit(self._summarize_middle, plan['middle'],
+                                        plan['previous_summary'], plan['budget'])
+        self._pending_compaction = (plan, future)
+
+    def swap_in_compaction(self) -> bool:
+        """Start of turn: once compaction is due and its summary is ready, splice it in one step.
+        Nothing here waits on or calls the summarizer — a summary still in flight is swapped in a
+        turn later, and a failed or staled one is dropped for the next turn end to plan again."""
+        pending = self._pending_compaction
+        if not self._compaction_due or pending is None or not pending[1].done():
+            return False
+        self._pending_compaction = None
+        plan, future = pending
         try:
-            self.context_coordinator.compact_messages(self._summarize_middle,
-                                                      compaction['protect_tail'], prompt_tokens)
-        except Exception as ecp:  # noqa: BLE001 — aux-LLM failure must not eat the reply
-            log.warning('compaction aborted, messages unchanged: %s', ecp)
+            summary = future.result()
+        except Exception as ecp:  # noqa: BLE001 — aux-LLM failure must not eat the turn
+            log.warning('compaction summary failed, messages unchanged: %s', ecp)
+            return False
+        if not self.context_coordinator.apply_compaction(plan, summary, self._compaction_due):
+            return False
+        self._compaction_due = 0
+        return True
+
+    def close(self):
+        """Drop the summarizer thread; a summary still in flight is discarded."""
+        if self._compactor is not None:
+            self._compactor.shutdown(wait=False, cancel_futures=True)
+            self._compactor = None
+        self._pending_compaction = None
 
     def _summarize_middle(self, middle:list[dict], previous_summary:str|None, budget:int) -> str:
         """Summarize the middle context with PromptEngineer's low tier and the compactor prompt."""
@@ -89,13 +147,14 @@ class MemoryExtensionModule:
         """Return L2 user preferences matching `query`; `flow_name` is reserved for semantic lookup."""
         return self.user_preferences.read(query)
 
-    def retrieve(self, query:str, top_k:int=10, documents:list|None=None) -> dict:
-        """Retrieve L3 business knowledge, using the FAQ shortcut or reranking documents to `top_k`."""
+    def retrieve(self, query:str, top_k:int|None=None, documents:list|None=None) -> dict:
+        """Retrieve L3 business knowledge: vector search plus rerank over the corpus (also the 'faq'
+        shortcut), or a rerank of the given documents, down to `top_k` (default `rerank_top_n`)."""
         documents = documents or []
-        if documents and documents[0] == 'faq':
+        top_k = top_k or self.business_knowledge.rerank_top_n
+        if not documents or documents[0] == 'faq':
             return self.business_knowledge.search_documents(query, top_k=top_k)
-        candidates = documents if documents else self.business_knowledge._candidates(query, top_k=1000)
-        return self.business_knowledge._rerank(query, candidates, top_k=top_k)
+        return self.business_knowledge._rerank(query, documents, top_k=top_k)
 
 
 # Module alias — the module is MEM; the class name spells it out.
@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 from dataclasses import dataclass
 from types import MappingProxyType
 
@@ -39,6 +40,11 @@ _SPECIFIC_REASON = {'invalid_value', 'unclear_value', 'wrong_slot'}
 READ_ONLY_DOMAIN_TOOLS = ('find_posts', 'read_metadata', 'read_section', 'search_notes',
                           'list_channels', 'channel_status')
 
+# Tool-definition lists depend only on the frozen config, so each distinct list is built once per
+# process and shared by every PEX: (id(config tools), audience) -> (config tools, definitions).
+_TOOL_SETS:dict[tuple, tuple] = {}
+_TOOL_SETS_LOCK = threading.Lock()
+
 def _block_summaries(artifact) -> list:
     """Project artifact blocks for the orchestrator, evaluation harness, and logs without restating content.
     Each summary carries its type and data keys; selections and checklists also include option labels."""
@@ -150,6 +156,7 @@ class PolicyExecutor:
         self.errors = 0        # consecutive corrective tool failures
         self.nudged = False    # a thinking-only miss already nudged this turn
         self.last_call = None  # (name+args key, succeeded) — _guarded_call's dedupe memory
+        self.on_event = None   # per-turn stream listener set by Assistant.take_turn (see _emit)
         # Map exposed component tool names to underscored methods; tool definitions control caller access.
         self.component_tools = {
             'manage_flows':         self._manage_flows,
@@ -162,8 +169,7 @@ class PolicyExecutor:
             'store_preference':     self._store_preference,
         }
         self._policies: dict[str, object] = {}  # built when the world is attached (setter below)
-        for stale in self._content_service._snap_root.glob('snap_*.json'):   # wipe prior sessions
-            stale.unlink()
+        self._content_service.clear_snapshots()   # wipe prior sessions
 
     @property
     def world(self):
@@ -289,8 +295,8 @@ class PolicyExecutor:
         catalog = self.get_tools_for_orchestrator()
         messages = context.compile_messages()
         messages.append({'role': 'user', 'content': self.refresh()})   # Ephemeral round refresh.
-        response = self.engineer(system_prompt, messages, family='claude',
-                                 tier='high', tools=catalog, max_tokens=4096)
+        response = self.engineer(system_prompt, messages, family='claude', tier='high',
+                                 tools=catalog, max_tokens=4096, on_text=self._delta_sink())
         self._track_usage(response)
         text_parts = [block.text for block in response.content if block.type == 'text']
         tool_uses = [block for block in response.content if block.type == 'tool_use']
@@ -304,6 +310,7 @@ class PolicyExecutor:
                 if any(e['used_count'] == 0 and e['turn_number'] >= self._turn_start for e in fresh):
                     context.add_turn('agent', {'text': text, 'tool_uses': [],
                                                'tool_results': []}, turn_type='action')
+                    self._emit({'stream': 'progress', 'tools': []})
                     return ''                       # renders NLU's announcement
                 state.keep_going = False            # terminal round — the turn is worded
                 return text
@@ -315,6 +322,7 @@ class PolicyExecutor:
             return ''
 
         valid = {tool['name'] for tool in catalog}
+        self._emit({'stream': 'progress', 'tools': [tool_use.name for tool_use in tool_uses]})
         blocks = [{'type': 'tool_use', 'id': tu.id, 'name': tu.name,
                    'input': dict(tu.input or {})} for tu in tool_uses]
         results = []
@@ -354,7 +362,7 @@ class PolicyExecutor:
         context = self.world.context
         context.add_turn('system', {'text': _WRAP_UP_MESSAGE})
         response = self.engineer(system_prompt, context.compile_messages(), family='claude',
-                                 tier='high', max_tokens=1024)
+                                 tier='high', max_tokens=1024, on_text=self._delta_sink())
         self._track_usage(response)
         text_parts = [block.text for block in response.content if block.type == 'text']
         return '\n'.join(part for part in text_parts if part).strip() or _FALLBACK_MESSAGE
@@ -382,6 +390,19 @@ class PolicyExecutor:
                 self._reads += 1
         return result, (call, result['_success'])
 
+    def _emit(self, event:dict):
+        """Hand one stream event to the turn's listener, if any. Two kinds: `delta` carries reply
+        text as the model writes it; `progress` says the round became a tool round (naming the
+        tools) or otherwise continues, so any text streamed for it was not the reply. The final
+        reply still arrives as the turn's payload."""
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _delta_sink(self):
+        if self.on_event is None:
+            return None
+        return lambda text: self._emit({'stream': 'delta', 'text': text})
+
     def _track_usage(self, response):
         """Record actual agent-loop prompt-token usage, including cache reads and writes, for MEM compaction."""
         usage = response.usage
@@ -583,13 +604,28 @@ class PolicyExecutor:
         policy = self._policies[flow.intent]
         calls = []
 
+        def claim(name, params):
+            # Take the trace slot up front: ToolDispatcher claims a batch of parallel reads in model
+            # order, so `calls` keeps that order whichever read finishes first.
+            entry = {'tool': name, 'input': params, '_success': False, '_error': ''}
+            calls.append(entry)
+
+            def run():
+                # Defer a sub-agent's FlowStack change so the flow resurfaces for execution at the
+                # PEX layer.
+                call_params = {**params, 'defer': True} if name == 'manage_flows' else params
+                try:
+                    result = self.call_tool(name, call_params)
+                except Exception as ecp:
+                    entry['_error'] = f'{type(ecp).__name__}: {ecp}'
+                    raise
+                entry.update(_success=result['_success'], _error=result.get('_error', ''))
+                return result
+            return run
+
         def traced_tool(name, params):
-            # Defer a sub-agent's FlowStack change so the flow resurfaces for execution at the PEX layer.
-            call_params = {**params, 'defer': True} if name == 'manage_flows' else params
-            result = self.call_tool(name, call_params)
-            calls.append({'tool': name, 'input': params, '_success': result['_success'],
-                          '_error': result.get('_error', '')})
-            return result
+            return claim(name, params)()
+        traced_tool.claim = claim
 
         artifact = policy.execute(self.world.state, self.world.context, traced_tool)
         # Stamp violations from successful execution_error calls so verify() selects the error path.
@@ -601,8 +637,8 @@ class PolicyExecutor:
                 break
         record = {'turn_number': self.world.context.num_utterances, 'flow': flow.name(),
                   'status': flow.status, 'calls': calls, 'thoughts': artifact.thoughts}
-        with open(self.world.session_dir() / 'subagents.jsonl', 'a', encoding='utf-8') as file:
-            file.write(json.dumps(record, default=str) + '\n')
+        self.world.journal.append(self.world.session_dir() / 'subagents.jsonl',
+                                  json.dumps(record, default=str) + '\n')
         return artifact, policy.pop_completion()
 
     def refresh(self) -> str:
@@ -611,8 +647,8 @@ class PolicyExecutor:
         stack = ' | '.join(f"{item['flow_name']}·{item['status']}"
                            for item in reversed(self.flow_stack.to_list())) or '(empty)'
         lines = [f"[state] Live stack (top first): {stack}."]
-        for entry in self.session_scratchpad.read():          # read bumps used_count → seen
-            if entry['used_count'] != 0 or not entry.get('summary'):
+        for entry in self.session_scratchpad.read(unseen=True):   # read bumps used_count → seen
+            if not entry.get('summary'):
                 continue
             rationale = f" — {entry['rationale']}" if entry.get('rationale') else ''
             lines.append(f"- [{entry['origin']}] {entry['summary']}{rationale}")
@@ -680,29 +716,46 @@ class PolicyExecutor:
             'description': tool.get('description', ''),
             'input_schema': self._thaw(tool.get('input_schema', {})),
             'capabilities': self._thaw(tool.get('capabilities', {})),
+            'read_only': bool(tool.get('read_only', False)),
         }
 
-    def get_tools_for_flow(self, flow) -> list[dict]:
+    def get_tools_for_flow(self, flow) -> tuple[dict, ...]:
         """Build a policy sub-agent's component tools and append the flow's scoped domain tools.
         Its manage_flows surface includes stackon and fallback; update and pop remain at the PEX layer."""
-        tools = [self._def_manage_flows(sub_agent=True), self._def_view_policies(),
-                 self._def_scratchpad(), self._def_declare_ambiguity(),
-                 self._def_execution_error(), self._def_coordinate_context()]
-        for tool_name in flow.tools:
-            tool_def = self._get_tool_def(tool_name)
-            if tool_def:
-                tools.append(tool_def)
-        return tools
-
-    def get_tools_for_orchestrator(self) -> list[dict]:
+        def build():
+            tools = [self._def_manage_flows(sub_agent=True), self._def_view_policies(),
+                     self._def_scratchpad(), self._def_declare_ambiguity(),
+                     self._def_execution_error(), self._def_coordinate_context()]
+            for tool_name in flow.tools:
+                tool_def = self._get_tool_def(tool_name)
+                if tool_def:
+                    tools.append(tool_def)
+            return tools
+        return self._tool_set(('flow', *flow.tools), build)
+
+    def get_tools_for_orchestrator(self) -> tuple[dict, ...]:
         """Build the PEX Agent's planner, belief, scratchpad, context, preference, and read-only domain tools."""
-        tools = [self._def_manage_flows(), self._def_understand(), self._def_scratchpad(),
-                 self._def_coordinate_context(), self._def_store_preference()]
-        for tool_name in READ_ONLY_DOMAIN_TOOLS:
-            tool_def = self._get_tool_def(tool_name)
-            if tool_def:
-                tools.append(tool_def)
-        return tools
+        def build():
+            tools = [self._def_manage_flows(), self._def_understand(), self._def_scratchpad(),
+                     self._def_coordinate_context(), self._def_store_preference()]
+            for tool_name in READ_ONLY_DOMAIN_TOOLS:
+                tool_def = self._get_tool_def(tool_name)
+                if tool_def:
+                    tools.append(tool_def)
+            return tools
+        return self._tool_set(('orchestrator',), build)
+
+    def _tool_set(self, audience:tuple, build) -> tuple[dict, ...]:
+        """The memoized definition list for one audience. Every caller gets the same dicts, so the
+        payload stays byte-identical across rounds (Claude's tool cache breakpoint keeps hitting) —
+        filter into a new list, never mutate them."""
+        tools_config = self.config.get('tools', {})
+        key = (id(tools_config), audience)
+        with _TOOL_SETS_LOCK:
+            entry = _TOOL_SETS.get(key)
+            if entry is None or entry[0] is not tools_config:
+                entry = _TOOL_SETS[key] = (tools_config, tuple(build()))
+        return entry[1]
 
     # -- Tool definition builders (one per tool; menus shaped per audience) -----
 
@@ -293,7 +293,7 @@ class BasePolicy:
         Section ids are expected to be canonical slugs — `resolve_source_ids` already
         normalizes them via `resolve_sec_id`."""
         ent = content._require_entry(post_id)[0]
-        all_sections = content._extract_sections(content._read_content(ent['filename']))
+        all_sections = content._parsed(ent['filename']).sections()
 
         if sec_ids is None:
             sections = [{'sec_id': sec['sec_id'], 'lines': sec['lines']}
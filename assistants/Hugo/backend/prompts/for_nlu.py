@@ -30,6 +30,8 @@ Output shape is `{"reasoning": "...", "slots": {name: value}}`, enforced by a JS
 from the provider. Use `null` for any slot the user did not specify — inside entity
 dicts, set individual keys to `null` rather than omitting them."""
 
+import threading
+
 from backend.prompts.nlu import get_prompt
 
 
@@ -288,7 +290,40 @@ def build_shown_candidates(choices:list, question:str='', pending:bool=False) ->
     return '\n'.join(lines)
 
 
+# Rendered static prefixes — everything above <current_scenario> — per (flow class, filled-slot set).
+# The prefix is byte-identical on every turn that fills the same flow with the same slots grounded,
+# so a provider's prefix cache (Anthropic's breakpoint before <current_scenario>, OpenAI/Gemini
+# implicit caching) keeps hitting; only the scenario suffix is rendered per call.
+_PREFIXES:dict[tuple, str] = {}
+_PREFIX_LOCK = threading.Lock()
+_PREFIX_STATS = {'hits': 0, 'misses': 0}
+
+
 def build_slot_filling_prompt(flow, convo_block:str, active_post:dict) -> str:
+    # Already-filled slots are final — Phase 1a (FE payload) and Phase 2 (active_post grounding)
+    # have done their job, and re-asking the LLM only invites it to substitute worse data.
+    skip_names = frozenset(name for name, slot in flow.slots.items() if slot.filled)
+    key = (type(flow), skip_names)
+    with _PREFIX_LOCK:
+        prefix = _PREFIXES.get(key)
+        _PREFIX_STATS['hits' if prefix is not None else 'misses'] += 1
+    if prefix is None:
+        prefix = _render_static_prefix(flow, skip_names)
+        with _PREFIX_LOCK:
+            prefix = _PREFIXES.setdefault(key, prefix)
+
+    input_block = _render_input(active_post, flow)
+    current_scenario = f'## Conversation History\n\n{convo_block}\n\n{input_block}'
+    return f'{prefix}\n\n<current_scenario>\n{current_scenario}\n</current_scenario>'
+
+
+def prefix_cache_stats() -> dict:
+    with _PREFIX_LOCK:
+        return {**_PREFIX_STATS, 'entries': len(_PREFIXES)}
+
+
+def _render_static_prefix(flow, skip_names:frozenset) -> str:
+    """Role, task, slot schema and examples for `flow` with `skip_names` filtered out."""
     prompt_fields = get_prompt(flow.name())
     instructions = prompt_fields['instructions'].strip()
     rules = prompt_fields['rules'].strip()
@@ -300,9 +335,6 @@ def build_slot_filling_prompt(flow, convo_block:str, active_post:dict) -> str:
     slot_types = list(dict.fromkeys(slot.slot_type for slot in flow.slots.values()))
     type_guides = _build_type_guides(slot_types)
 
-    # Already-filled slots are final — Phase 1a (FE payload) and Phase 2 (active_post grounding)
-    # have done their job, and re-asking the LLM only invites it to substitute worse data.
-    skip_names = {name for name, slot in flow.slots.items() if slot.filled}
     if slots_md:
         slots_md = _filter_slot_sections(slots_md, skip_names)
     else:
@@ -315,14 +347,10 @@ def build_slot_filling_prompt(flow, convo_block:str, active_post:dict) -> str:
         f'## Slot Reference\n\n{PRIORITIES_DOC}\n\n### Slot Types\n\n{type_guides}'
     )
 
-    input_block = _render_input(active_post, flow)
-    current_scenario = f'## Conversation History\n\n{convo_block}\n\n{input_block}'
-
     parts = [
         f'<role>{ROLE}</role>',
         f'<task>\n{task_body}\n</task>',
         f'<slot_schema>\n{slot_schema_body}\n</slot_schema>',
         f'<example_scenarios>\n{examples}\n</example_scenarios>',
-        f'<current_scenario>\n{current_scenario}\n</current_scenario>',
     ]
     return '\n\n'.join(parts)
@@ -4,7 +4,8 @@ import traceback
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from backend.manager import get_or_create_assistant, cleanup_assistant, reset_assistant
+from backend.manager import (get_or_create_assistant, cleanup_assistant, reset_assistant,
+                             begin_assistant_turn, end_assistant_turn)
 from backend.utilities.services import PostService
 from backend.components.task_artifact import TaskArtifact, BuildingBlock
 
@@ -19,20 +20,27 @@ def _get_queue(username:str) -> asyncio.Queue:
         queues[username] = asyncio.Queue()
     return queues[username]
 
+def _post_list(body:dict|None=None, refresh:bool=False) -> dict:
+    """Block data for the posts sidebar. A client that sends back the `version` it last received
+    as `preview_version` gets only the changed rows (`delta` + `order`) instead of every preview."""
+    since = (body or {}).get('preview_version')
+    listing = PostService().list_preview(since=since, refresh=refresh)
+    data = {'title': 'Your Posts', 'items': listing['items'], 'sectioned': True, 'version': listing['version']}
+    if listing.get('delta'):
+        data.update(delta=True, order=listing['order'])
+    return data
 
 async def reset(username:str, queue:asyncio.Queue, first_name:str=''):
     reset_assistant(username)
-    items_r = PostService().list_preview()['items']
-    block = BuildingBlock(type='list', data={'title': 'Your Posts', 'items': items_r, 'sectioned': True})
+    block = BuildingBlock(type='list', data=_post_list())
     reset_artifact = TaskArtifact(blocks=[block]).to_dict()
     start_message = f"Hey {first_name}! What are we writing today?"
     reset_msg = {'message': start_message, 'raw_utterance': '', 'actions': [], 'artifact': reset_artifact}
     await queue.put(reset_msg)
 
 async def refresh_posts(body:dict, queue:asyncio.Queue):
-    items = PostService().list_preview()['items']
     frame_type = body.get('frame_type', 'list')
-    block = BuildingBlock(type=frame_type, data={'title': 'Your Posts', 'items': items, 'sectioned': True})
+    block = BuildingBlock(type=frame_type, data=_post_list(body, refresh=True))
     refresh_artifact = TaskArtifact(blocks=[block]).to_dict()
     refresh_msg = {'message': '', 'raw_utterance': '', 'actions': [], 'artifact': refresh_artifact}
     await queue.put(refresh_msg)
@@ -53,8 +61,7 @@ async def create_post(body:dict, queue:asyncio.Queue):
             result = post_service.create_post(title, type=post_type)
             list_type = 'list'
         if result['_success']:
-            all_items = post_service.list_preview()['items']
-            list_block = BuildingBlock(type=list_type, data={'title': 'Your Posts', 'items': all_items, 'sectioned': True})
+            list_block = BuildingBlock(type=list_type, data=_post_list(body))
             top_msg = {'message': '', 'raw_utterance': '', 'actions': [],
                        'artifact': TaskArtifact(blocks=[list_block]).to_dict()}
             await queue.put(top_msg)
@@ -108,8 +115,7 @@ async def update_post(body:dict, agent, queue:asyncio.Queue):
             if ent and sections:
                 # Snapshot pre-edit state so the user can undo their own manual save
                 # the same way they undo agent-driven mutations.
-                current_sections = post_service._extract_sections(
-                    post_service._read_content(ent['filename']))
+                current_sections = post_service._parsed(ent['filename']).sections()
                 if current_sections:
                     post_service.take_snapshot(
                         post_id=post_id, turn_id=agent.world.context.num_utterances,
@@ -147,8 +153,7 @@ async def delete_post(body:dict, queue:asyncio.Queue):
         list_type = 'grid' if was_note else 'list'
         result = post_service.delete_post(post_id)
         if result['_success']:
-            items = post_service.list_preview()['items']
-            list_block = BuildingBlock(type=list_type, data={'title': 'Your Posts', 'items': items, 'sectioned': True})
+            list_block = BuildingBlock(type=list_type, data=_post_list(body))
             top_msg = {'message': '', 'raw_utterance': '', 'actions': [],
                        'artifact': TaskArtifact(blocks=[list_block]).to_dict()}
         else:
@@ -159,9 +164,8 @@ async def delete_post(body:dict, queue:asyncio.Queue):
         await queue.put({'message': _ERROR_MESSAGE})
 
 
-async def _send_grid_refresh(queue:asyncio.Queue):
-    items = PostService().list_preview()['items']
-    grid_block = BuildingBlock(type='grid', data={'title': 'Your Posts', 'items': items, 'sectioned': True})
+async def _send_grid_refresh(body:dict, queue:asyncio.Queue):
+    grid_block = BuildingBlock(type='grid', data=_post_list(body))
     await queue.put({'message': '', 'raw_utterance': '', 'actions': [],
                      'artifact': TaskArtifact(blocks=[grid_block]).to_dict()})
 
@@ -175,7 +179,7 @@ async def create_note(body:dict, queue:asyncio.Queue):
     try:
         result = PostService().create_post('', type='note', topic=body_text)
         if result['_success']:
-            await _send_grid_refresh(queue)
+            await _send_grid_refresh(body, queue)
         else:
             await queue.put({'message': result['_message']})
     except Exception as ecp:
@@ -197,9 +201,10 @@ async def update_note(body:dict, queue:asyncio.Queue):
         if ent:
             filepath = post_service._content_dir / ent['filename']
             filepath.write_text(body_text, encoding='utf-8')
+            post_service._previews.invalidate(note_id)
             ent['updated_at'] = post_service._now()
             post_service._save_metadata(entries)
-        await _send_grid_refresh(queue)
+        await _send_grid_refresh(body, queue)
     except Exception as ecp:
         print(f'Update note error: {ecp}\n{traceback.format_exc()}')
         await queue.put({'message': _ERROR_MESSAGE})
@@ -210,7 +215,7 @@ async def delete_note(body:dict, queue:asyncio.Queue):
     try:
         result = PostService().delete_post(note_id)
         if result['_success']:
-            await _send_grid_refresh(queue)
+            await _send_grid_refresh(body, queue)
         else:
             await queue.put({'message': result['_message']})
     except Exception as ecp:
@@ -237,9 +242,7 @@ async def chat(websocket:WebSocket):
 
         post_service = PostService()
         sync = post_service.sync_check()
-        post_items = post_service.list_preview()['items']
-
-        welcome_block = BuildingBlock(type='list', data={'title': 'Your Posts', 'items': post_items, 'sectioned': True})
+        welcome_block = BuildingBlock(type='list', data=_post_list())
         welcome_artifact = TaskArtifact(blocks=[welcome_block]).to_dict()
 
         if sync['missing']:
@@ -310,8 +313,21 @@ async def chat(websocket:WebSocket):
                 user_text = body.get('text', '') or body.get('currentMessage', '')
                 dax = body.get('dax')
                 payload = body.get('payload') or {}
+                loop = asyncio.get_running_loop()
+
+                def on_event(event:dict):
+                    # Reply deltas and tool-round progress, pushed from the turn's worker thread
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+
+                def run_turn() -> dict:
+                    # Ends on the worker thread: a dropped socket must not park a turn mid-flight
+                    try:
+                        return agent.take_turn(user_text, dax, payload, on_event)
+                    finally:
+                        end_assistant_turn(username)
                 try:
-                    result = await asyncio.to_thread(agent.take_turn, user_text, dax, payload)
+                    begin_assistant_turn(username)
+                    result = await asyncio.to_thread(run_turn)
                     artifact = result.get('artifact') or {}
                     # Phase-2 logging: WS handoff snapshot — what we're about
                     # to put on the wire to the frontend.
@@ -326,8 +342,7 @@ async def chat(websocket:WebSocket):
                     )
                     first_block_data = (artifact.get('blocks') or [{}])[0].get('data') or {}
                     if artifact.get('origin') == 'create' and first_block_data.get('status') == 'note':
-                        all_items = PostService().list_preview()['items']
-                        note_block = BuildingBlock(type='grid', data={'title': 'Your Posts', 'items': all_items, 'sectioned': True})
+                        note_block = BuildingBlock(type='grid', data=_post_list(body))
                         note_msg = {'message': '', 'raw_utterance': '', 'actions': [],
                                     'artifact': TaskArtifact(blocks=[note_block]).to_dict()}
                         await queue.put(note_msg)
@@ -1,8 +1,27 @@
 from fastapi import APIRouter
 
+from backend.components.dialogue_state import voter_stats
+from backend.components.prompt_engineer import PromptEngineer
+from backend.manager import session_pool_stats
+
 health_router = APIRouter()
 
 
 @health_router.get('/health')
 def health_check():
     return {'status': 'ok'}
+
+
+@health_router.get('/health/sessions')
+def session_pool():
+    return session_pool_stats()
+
+
+@health_router.get('/health/voters')
+def voter_latency():
+    return voter_stats()
+
+
+@health_router.get('/health/prompts')
+def prompt_tokens():
+    return PromptEngineer.prompt_stats()
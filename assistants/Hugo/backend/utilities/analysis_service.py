@@ -4,6 +4,7 @@ import re
 from pathlib import Path
 
 from backend.utilities.services import ToolService
+from backend.utilities.text_stats import text_stats
 
 
 class AnalysisService(ToolService):
@@ -37,98 +38,24 @@ class AnalysisService(ToolService):
 
     def inspect_post(self, post_id:str, metrics:list|None=None) -> dict:
         ent, _ = self._require_entry(post_id)
-        content = self._read_content(ent['filename'])
-        sections = self._extract_sections(content)
-        lines = content.split('\n')
+        return self._inspect(post_id, self._parsed(ent['filename']))
 
-        word_count = len(re.sub(r'<[^>]+>', '', content).split())
-        heading_depth = 0
-        image_count = 0
-        link_count = 0
-        empty_sections = []
-        para_lengths = []
-        current_para = 0
-
-        for line in lines:
-            if line.startswith('#'):
-                depth = len(line.split()[0]) if line.split() else 0
-                heading_depth = max(heading_depth, depth)
-            if re.search(r'!\[.*?\]\(.*?\)', line):
-                image_count += 1
-            if re.search(r'\[.*?\]\(.*?\)', line):
-                link_count += 1
-            if line.strip():
-                current_para += len(line.split())
-            else:
-                if current_para > 0:
-                    para_lengths.append(current_para)
-                    current_para = 0
-        if current_para > 0:
-            para_lengths.append(current_para)
-
-        for sec in sections:
-            body = '\n'.join(sec['lines']).strip()
-            if not body:
-                empty_sections.append(sec['sec_id'])
-
-        avg_para = round(sum(para_lengths) / max(len(para_lengths), 1), 1)
-        read_time = max(1, round(word_count / 238))
+    def _inspect(self, post_id:str, parsed) -> dict:
+        stats = text_stats(parsed.text)
+        sections = parsed.sections()
+        empty_sections = [sec['sec_id'] for sec in sections if not '\n'.join(sec['lines']).strip()]
 
         return self._success(
-            post_id=post_id, word_count=word_count,
-            section_count=len(sections), heading_depth=heading_depth,
-            image_count=image_count, link_count=link_count,
-            avg_paragraph_length=avg_para, estimated_read_time=read_time,
+            post_id=post_id, word_count=stats.word_count,
+            section_count=len(sections), heading_depth=stats.heading_depth,
+            image_count=stats.image_count, link_count=stats.link_count,
+            avg_paragraph_length=stats.avg_paragraph_length,
+            estimated_read_time=max(1, round(stats.word_count / 238)),
             empty_sections=empty_sections,
         )
 
     def check_readability(self, content:str) -> dict:
-        sentences = re.split(r'[.!?]+', content)
-        sentences = [sent.strip() for sent in sentences if sent.strip()]
-        sentence_count = len(sentences) or 1
-
-        words = content.split()
-        word_count = len(words) or 1
-
-        def syllable_count(word:str) -> int:
-            cleaned = word.lower().rstrip('es').rstrip('ed')
-            vowels = 'aeiou'
-            count = 0
-            prev_vowel = False
-            for ch in cleaned:
-                is_vowel = ch in vowels
-                if is_vowel and not prev_vowel:
-                    count += 1
-                prev_vowel = is_vowel
-            return max(count, 1)
-
-        total_syllables = sum(syllable_count(word) for word in words)
-        complex_words = sum(1 for word in words if syllable_count(word) >= 3)
-
-        avg_sentence_length = round(word_count / sentence_count, 1)
-        avg_word_length = round(sum(len(word) for word in words) / word_count, 1)
-
-        fk = 0.39 * (word_count / sentence_count) + 11.8 * (total_syllables / word_count) - 15.59
-        fk = round(max(0, fk), 1)
-
-        fog = 0.4 * ((word_count / sentence_count) + 100 * (complex_words / word_count))
-        fog = round(max(0, fog), 1)
-
-        if fk <= 6:
-            label = 'easy'
-        elif fk <= 10:
-            label = 'moderate'
-        elif fk <= 14:
-            label = 'advanced'
-        else:
-            label = 'difficult'
-
-        return self._success(
-            flesch_kincaid_grade=fk, gunning_fog=fog,
-            avg_sentence_length=avg_sentence_length,
-            avg_word_length=avg_word_length,
-            sentence_count=sentence_count, score_label=label,
-        )
+        return self._success(**text_stats(content).readability())
 
     def check_links(self, content:str) -> dict:
         links = []
@@ -154,27 +81,12 @@ class AnalysisService(ToolService):
         return self._success(links=links, count=len(links), image_count=image_count)
 
     def compare_style(self, post_id:str, reference_ids:list|None=None) -> dict:
-        target_metrics = self.inspect_post(post_id)
-        if not target_metrics['_success']:
-            return target_metrics
-
-        entries = self._load_metadata()
-        ent = self._find_entry(entries, post_id)
-        content = self._read_content(ent['filename']) if ent else ''
-        target_readability = self.check_readability(content)
-
-        target = {**target_metrics, **target_readability}
+        target = self._style_profile(post_id)
 
         references = []
         deltas = {}
         for ref_id in (reference_ids or []):
-            ref_metrics = self.inspect_post(ref_id)
-            if not ref_metrics['_success']:
-                continue
-            ref_ent = self._find_entry(entries, ref_id)
-            ref_content = self._read_content(ref_ent['filename']) if ref_ent else ''
-            ref_read = self.check_readability(ref_content)
-            ref_data = {**ref_metrics, **ref_read, 'post_id': ref_id}
+            ref_data = {**self._style_profile(ref_id), 'post_id': ref_id}
             references.append(ref_data)
 
             for key in ('word_count', 'section_count', 'flesch_kincaid_grade',
@@ -188,11 +100,20 @@ class AnalysisService(ToolService):
             target=target, references=references, deltas=deltas,
         )
 
+    def _style_profile(self, post_id:str) -> dict:
+        """`inspect_post` merged with `check_readability` of the same body, kept in the reference
+        cache until the post's file changes — canonical posts are compared against again and again."""
+        ent, _ = self._require_entry(post_id)
+
+        def build() -> dict:
+            parsed = self._parsed(ent['filename'])
+            return {**self._inspect(post_id, parsed), **self.check_readability(parsed.text)}
+
+        return self._references.profile(post_id, self._content_dir / ent['filename'], build)
+
     def editor_review(self, content:str, guide_path:str|None=None) -> dict:
         path = Path(guide_path) if guide_path else self._guides_dir / 'editor_guide.md'
-        guide = ''
-        if path.exists():
-            guide = path.read_text(encoding='utf-8')
+        guide = self._references.guide(path)
 
         if not guide:
             return self._error('not_found', 'Editor guide not found.')
@@ -213,33 +134,29 @@ class AnalysisService(ToolService):
 
     def analyze_seo(self, post_id:str, target_keyword:str|None=None) -> dict:
         ent, _ = self._require_entry(post_id)
-        content = self._read_content(ent['filename'])
-        words = content.lower().split()
-        word_count = len(words) or 1
+        stats = text_stats(self._read_content(ent['filename']))
+        word_count = stats.raw_word_count or 1
         title = ent.get('title', '')
 
         suggestions = []
 
         keyword_density = 0.0
+        first_para_has_kw = False
         if target_keyword:
             kw = target_keyword.lower()
-            kw_count = content.lower().count(kw)
-            keyword_density = round(kw_count / word_count * 100, 2)
+            keyword_density = round(stats.lower.count(kw) / word_count * 100, 2)
 
             if kw not in title.lower():
                 suggestions.append('Add target keyword to title')
 
-            heading_has_kw = False
-            for line in content.split('\n'):
-                if line.startswith('#') and kw in line.lower():
-                    heading_has_kw = True
-                    break
-            if not heading_has_kw:
+            if not any(kw in line.lower() for line in stats.headings):
                 suggestions.append('Add target keyword to H2 headings')
 
-            paragraphs = [para.strip() for para in content.split('\n\n') if para.strip() and not para.strip().startswith('#')]
-            if paragraphs and kw not in paragraphs[0].lower():
-                suggestions.append('Add target keyword to first paragraph')
+            first_para = stats.first_paragraph
+            if first_para is not None:
+                first_para_has_kw = kw in first_para.lower()
+                if not first_para_has_kw:
+                    suggestions.append('Add target keyword to first paragraph')
 
         title_length = len(title)
         if title_length > 60:
@@ -247,23 +164,13 @@ class AnalysisService(ToolService):
         elif title_length < 20:
             suggestions.append('Title too short for SEO')
 
-        heading_keywords = []
-        for line in content.split('\n'):
-            if line.startswith('## '):
-                heading_keywords.append(line[3:].strip())
-
-        has_meta = bool(ent.get('preview'))
-        first_para_has_kw = False
-        if target_keyword:
-            paragraphs = [para.strip() for para in content.split('\n\n') if para.strip() and not para.strip().startswith('#')]
-            if paragraphs:
-                first_para_has_kw = target_keyword.lower() in paragraphs[0].lower()
+        heading_keywords = [line[3:].strip() for line in stats.headings if line.startswith('## ')]
 
         return self._success(
             keyword_density=keyword_density,
             title_length=title_length,
             heading_keywords=heading_keywords,
-            has_meta_description=has_meta,
+            has_meta_description=bool(ent.get('preview')),
             first_paragraph_has_keyword=first_para_has_kw,
             suggestions=suggestions,
         )
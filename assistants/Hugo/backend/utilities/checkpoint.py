@@ -0,0 +1,89 @@
+"""Binary session checkpoint: one file, one read, to resume a session without replaying its logs.
+
+Layout: the magic `HUGOCKPT`, a version byte, then named sections — a 1-byte name length, the
+name, a 4-byte big-endian payload length, and the payload (zlib-compressed JSON). `load` checks
+every length (zlib's own checksum catches a corrupt payload) and returns None for a missing,
+foreign, truncated or older file, so the caller falls back to the JSONL logs, which stay the
+audit record.
+
+The logs keep growing after a checkpoint, so each section that mirrors one records a `mark` of the
+log — its size and a digest of the bytes just before that size — and the reader folds in only what
+was appended since, after `mark_holds` confirms the log still starts with what was checkpointed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import struct
+import zlib
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+_MAGIC = b'HUGOCKPT'
+_VERSION = 1
+_LENGTH = struct.Struct('>I')
+_MARK_BYTES = 256           # tail of the checkpointed prefix that a mark digests
+
+
+def save(path:Path, sections:dict[str, object]):
+    """Write every section atomically (temp file + rename); the JSONL logs remain the durable record."""
+    parts = [_MAGIC, bytes([_VERSION])]
+    for name, value in sections.items():
+        label = name.encode('utf-8')
+        payload = zlib.compress(json.dumps(value, default=str).encode('utf-8'), 1)
+        parts += [bytes([len(label)]), label, _LENGTH.pack(len(payload)), payload]
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_bytes(b''.join(parts))
+    tmp.replace(path)
+
+
+def load(path:Path) -> dict | None:
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    if data[:len(_MAGIC)] != _MAGIC or data[len(_MAGIC):len(_MAGIC) + 1] != bytes([_VERSION]):
+        log.info('ignoring checkpoint %s: unknown format', path)
+        return None
+    sections, pos = {}, len(_MAGIC) + 1
+    try:
+        while pos < len(data):
+            size = data[pos]
+            name = data[pos + 1:pos + 1 + size].decode('utf-8')
+            pos += 1 + size
+            (length,) = _LENGTH.unpack_from(data, pos)
+            pos += _LENGTH.size
+            if pos + length > len(data):
+                raise ValueError('truncated section')
+            sections[name] = json.loads(zlib.decompress(data[pos:pos + length]))
+            pos += length
+    except (ValueError, IndexError, struct.error, zlib.error) as ecp:
+        log.warning('ignoring checkpoint %s: %s', path, ecp)
+        return None
+    return sections
+
+
+def mark(path:Path, size:int|None=None) -> dict:
+    """The log's size (or `size`, a read offset) and a digest of the bytes just before it."""
+    if size is None:
+        size = path.stat().st_size if path.exists() else 0
+    return {'size': size, 'digest': _digest(path, size)}
+
+
+def mark_holds(path:Path, recorded:dict) -> bool:
+    """True when the log still begins with the bytes the mark was taken over."""
+    try:
+        return path.stat().st_size >= recorded['size'] and _digest(path, recorded['size']) == recorded['digest']
+    except (OSError, KeyError, TypeError):
+        return False
+
+
+def _digest(path:Path, size:int) -> str:
+    if size == 0:
+        return ''
+    start = max(size - _MARK_BYTES, 0)
+    with open(path, 'rb') as file:
+        file.seek(start)
+        return hashlib.sha1(file.read(size - start)).hexdigest()
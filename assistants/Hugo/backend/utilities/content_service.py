@@ -3,13 +3,15 @@ from __future__ import annotations
 import os
 import re
 from datetime import datetime
-from backend.utilities.services import ToolService, split_sentences, join_sentences, resolve_snip_index
+from backend.utilities.services import ToolService, join_sentences, resolve_snip_index
+from backend.utilities.web_search import SearchError, WebSearch, web_search_client
 
 class ContentService(ToolService):
 
     def __init__(self):
         super().__init__()
         self._images_dir = self._content_dir / 'images'
+        self._search_cache_file = self._content_dir.parent / '.search_cache.db'
 
     def generate_outline(self, post_id:str, content:str, sec_id:str|None=None) -> dict:
         """FULL overwrite of an outline. Used by the `outline` flow when
@@ -18,8 +20,7 @@ class ContentService(ToolService):
         ent, entries = self._require_entry(post_id)
 
         if sec_id:
-            file_content = self._read_content(ent['filename'])
-            sections = self._extract_sections(file_content)
+            sections = self._parsed(ent['filename']).sections()
             found = False
             for sec in sections:
                 if sec['sec_id'] == sec_id:
@@ -32,6 +33,7 @@ class ContentService(ToolService):
         else:
             if ent.get('status') == 'note':
                 (self._content_dir / ent['filename']).write_text(content, encoding='utf-8')
+                self._previews.invalidate(post_id)
             else:
                 fm = {'title': ent['title']}
                 if ent.get('tags'):
@@ -46,20 +48,18 @@ class ContentService(ToolService):
 
     def convert_to_prose(self, post_id:str, sec_id:str|None=None) -> dict:
         ent, entries = self._require_entry(post_id)
-        content = self._read_content(ent['filename'])
+        sections = self._parsed(ent['filename']).sections()
 
         if sec_id:
-            sec = self._resolve_section(content, sec_id)
+            sec = next((sec_item for sec_item in sections if sec_item['sec_id'] == sec_id), None)
             if not sec:
                 return self._error('not_found', f'Section not found: {sec_id}')
             converted = self._outline_to_skeleton(sec['lines'])
-            sections = self._extract_sections(content)
             for sec_item in sections:
                 if sec_item['sec_id'] == sec_id:
                     sec_item['lines'] = converted.split('\n')
                     break
         else:
-            sections = self._extract_sections(content)
             for sec_item in sections:
                 converted = self._outline_to_skeleton(sec_item['lines'])
                 sec_item['lines'] = converted.split('\n')
@@ -98,8 +98,7 @@ class ContentService(ToolService):
     def insert_section(self, post_id:str, sec_id:str,
                        section_title:str, content:str|None=None) -> dict:
         ent, entries = self._require_entry(post_id)
-        file_content = self._read_content(ent['filename'])
-        sections = self._extract_sections(file_content)
+        sections = self._parsed(ent['filename']).sections()
 
         # Empty sec_id means insert at the top.
         if not sec_id:
@@ -127,16 +126,15 @@ class ContentService(ToolService):
     def revise_content(self, post_id:str, sec_id:str,
                        content:str, snip_id:int|tuple|list|None=None) -> dict:
         ent, entries = self._require_entry(post_id)
-        file_content = self._read_content(ent['filename'])
-        sections = self._extract_sections(file_content)
+        parsed = self._parsed(ent['filename'])
+        sections = parsed.sections()
 
         for sec in sections:
             if sec['sec_id'] == sec_id:
                 if snip_id is None:
                     sec['lines'] = content.split('\n')
                 else:
-                    existing_text = '\n'.join(sec['lines'])
-                    sentences = split_sentences(existing_text)
+                    sentences = list(parsed.snips(sec))
                     new_piece = content.strip()
                     if isinstance(snip_id, int):
                         idx = len(sentences) if snip_id == -1 else snip_id
@@ -158,10 +156,7 @@ class ContentService(ToolService):
             return self._error('validation',
                 f'Seed content too long ({word_count} words). Max 2048.')
 
-        guide_path = self._guides_dir / 'writing_guide.md'
-        guide = ''
-        if guide_path.exists():
-            guide = guide_path.read_text(encoding='utf-8')
+        guide = self._references.guide(self._guides_dir / 'writing_guide.md')
 
         return self._success(
             seed_content=seed_content,
@@ -174,8 +169,8 @@ class ContentService(ToolService):
     def remove_content(self, post_id:str, sec_id:str,
                        snip_id:int|tuple|list|None=None) -> dict:
         ent, entries = self._require_entry(post_id)
-        file_content = self._read_content(ent['filename'])
-        sections = self._extract_sections(file_content)
+        parsed = self._parsed(ent['filename'])
+        sections = parsed.sections()
 
         if snip_id is None:
             for idx, sec in enumerate(sections):
@@ -188,8 +183,7 @@ class ContentService(ToolService):
 
         for sec in sections:
             if sec['sec_id'] == sec_id:
-                existing_text = '\n'.join(sec['lines'])
-                sentences = split_sentences(existing_text)
+                sentences = list(parsed.snips(sec))
 
                 if isinstance(snip_id, int):
                     idx = resolve_snip_index(snip_id, len(sentences))
@@ -215,8 +209,8 @@ class ContentService(ToolService):
             return self._error('validation', 'Cannot move entire section to itself')
 
         ent, entries = self._require_entry(post_id)
-        file_content = self._read_content(ent['filename'])
-        sections = self._extract_sections(file_content)
+        parsed = self._parsed(ent['filename'])
+        sections = parsed.sections()
 
         src = None
         tgt = None
@@ -231,8 +225,8 @@ class ContentService(ToolService):
         if not tgt:
             return self._error('not_found', f'Target section not found: {target_section}')
 
-        src_sentences = split_sentences('\n'.join(src['lines']))
-        tgt_sentences = split_sentences('\n'.join(tgt['lines']))
+        src_sentences = list(parsed.snips(src))
+        tgt_sentences = list(parsed.snips(tgt))
 
         if source_snip_id is None:
             moved = src_sentences[:]
@@ -264,8 +258,8 @@ class ContentService(ToolService):
         import difflib
 
         ent, _ = self._require_entry(post_id)
-        content = self._read_content(ent['filename'])
-        src = self._resolve_section(content, source_section)
+        parsed = self._parsed(ent['filename'])
+        src = parsed.section(source_section)
         if not src:
             return self._error('not_found', f'Section not found: {source_section}')
 
@@ -274,7 +268,7 @@ class ContentService(ToolService):
         if target_section:
             if target_section == source_section:
                 return self._error('validation', 'Source and target sections must differ')
-            tgt = self._resolve_section(content, target_section)
+            tgt = parsed.section(target_section)
             if not tgt:
                 return self._error('not_found', f'Section not found: {target_section}')
             target_lines = tgt['lines']
@@ -322,14 +316,13 @@ class ContentService(ToolService):
         src = str(image_path)
 
         ent, entries = self._require_entry(post_id)
-        file_content = self._read_content(ent['filename'])
-        sections = self._extract_sections(file_content)
+        parsed = self._parsed(ent['filename'])
+        sections = parsed.sections()
 
         markdown_ref = f'![{description}]({image_path.name})'
         for sec in sections:
             if sec['sec_id'] == sec_id:
-                existing_text = '\n'.join(sec['lines'])
-                sentences = split_sentences(existing_text)
+                sentences = list(parsed.snips(sec))
                 idx = len(sentences) if position < 0 else position
                 sentences.insert(idx, markdown_ref)
                 sec['lines'] = join_sentences(sentences).split('\n')
@@ -341,27 +334,38 @@ class ContentService(ToolService):
         return self._error('not_found', f'Section not found: {sec_id}')
 
     def web_search(self, query:str, limit:int=5) -> dict:
-        api_key = os.getenv('TAVILY_API_KEY')
-        if not api_key:
+        client = self._search_client()
+        if client is None:
+            return self._error('auth_error',
+                'TAVILY_API_KEY not set. Cannot search the web.')
+
+        try:
+            items = client.search(query, limit)
+        except SearchError as exc:
+            return self._error('server_error', str(exc))
+        except Exception as exc:
+            return self._error('server_error', f'Web search failed: {exc}')
+        return self._success(items=items, count=len(items), query=query)
+
+    def web_search_batch(self, queries:list, limit:int=5) -> dict:
+        """`web_search` for several related queries at once. Distinct queries run concurrently and
+        repeats are searched once; a failed query reports its error without failing the rest."""
+        client = self._search_client()
+        if client is None:
             return self._error('auth_error',
                 'TAVILY_API_KEY not set. Cannot search the web.')
 
         try:
-            import httpx
-            resp = httpx.post(
-                'https://api.tavily.com/search',
-                json={'api_key': api_key, 'query': query, 'max_results': limit},
-                timeout=15.0,
-            )
-            if resp.status_code != 200:
-                return self._error('server_error', f'Tavily API returned {resp.status_code}')
-            data = resp.json()
-            items = [
-                {'title': res.get('title', ''), 'url': res.get('url', ''), 'snippet': res.get('content', '')[:200]}
-                for res in data.get('results', [])
-            ]
-            return self._success(items=items, count=len(items), query=query)
-        except ImportError:
-            return self._error('server_error', 'httpx not installed.')
+            batch = client.search_many(queries, limit)
         except Exception as exc:
             return self._error('server_error', f'Web search failed: {exc}')
+        results = []
+        for query, found in zip(queries, batch):
+            if isinstance(found, SearchError):
+                results.append({'query': query, 'error': str(found)})
+            else:
+                results.append({'query': query, 'items': found, 'count': len(found)})
+        return self._success(results=results, count=len(results))
+
+    def _search_client(self) -> WebSearch | None:
+        return web_search_client(self._search_cache_file)
@@ -1,32 +1,32 @@
 """Shared offline embedding model — ONE small local model for the whole app.
 
 `all-MiniLM-L6-v2` (~22M params, far smaller than an 8B LLM) runs on CPU with no API call. Loaded once
-and cached module-level, so the eval response-similarity scorer and the (designed) business-context
-vector retrieval share a single download and a single in-memory instance — not several.
+and cached module-level, so the eval response-similarity scorer and the business-knowledge vector
+retrieval (`vector_index`) share a single download and a single in-memory instance — not several.
 
 sentence-transformers is imported lazily inside `_model()`, so importing this module (or anything that
 imports it, like the eval scorer) stays cheap until an embedding is actually needed.
 """
-_MODEL = None
+_MODELS = {}
 MODEL_NAME = 'all-MiniLM-L6-v2'
 
 
-def _model():
-    global _MODEL
-    if _MODEL is None:
+def _model(name:str=MODEL_NAME):
+    if name not in _MODELS:
         from pathlib import Path
         from sentence_transformers import SentenceTransformer
         weights_dir = Path(__file__).resolve().parents[4] / 'shared' / 'weights' / 'sentence-transformers'
         weights_dir.mkdir(parents=True, exist_ok=True)
-        _MODEL = SentenceTransformer(MODEL_NAME, cache_folder=str(weights_dir))
-    return _MODEL
+        _MODELS[name] = SentenceTransformer(name, cache_folder=str(weights_dir))
+    return _MODELS[name]
 
 
-def embed(texts):
+def embed(texts, model_name:str=MODEL_NAME):
     """L2-normalized embedding(s) for a string or list of strings. A single string returns one
-    vector; a list returns a 2-D array (one row per text)."""
+    vector; a list returns a 2-D array (one row per text). `model_name` picks another
+    sentence-transformers model (`memory.business_context.embedding_model`); MiniLM by default."""
     single = isinstance(texts, str)
-    vecs = _model().encode([texts] if single else list(texts), normalize_embeddings=True)
+    vecs = _model(model_name).encode([texts] if single else list(texts), normalize_embeddings=True)
     return vecs[0] if single else vecs
 
 
@@ -0,0 +1,145 @@
+"""Write-behind journal for one session's files: history.jsonl, subagents.jsonl and state.json.
+
+Appends are buffered per file and written through handles kept open for the session; a timer armed
+by the first buffered write flushes the batch within `flush_interval_s`, so a reader never sees the
+files more than one interval behind. Whole-document writes (state.json) keep only the latest
+version and land by temp file + rename. Flushes do not fsync — `commit`, called at turn boundaries,
+writes everything still buffered and fsyncs every file touched since the last commit, so a crash
+loses at most the uncommitted part of the turn in flight. A torn final line from a crash mid-write
+is for the reader to drop (`ContextCoordinator.load_history` does).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+
+class SessionJournal:
+
+    def __init__(self, flush_interval_s:float=1.0):
+        self.flush_interval_s = flush_interval_s
+        self._lock = threading.RLock()
+        self._handles:dict[Path, object] = {}
+        self._pending:dict[Path, list[str]] = {}   # path -> lines not yet written
+        self._documents:dict[Path, str] = {}       # path -> latest full text not yet written
+        self._unsynced:set[Path] = set()           # appended to since the last commit
+        self._timer:threading.Timer | None = None
+        self.counts = {'appends': 0, 'flushes': 0, 'commits': 0, 'fsyncs': 0}
+
+    def append(self, path:Path, text:str):
+        """Buffer text (one or more whole lines) for the end of `path`."""
+        with self._lock:
+            self._pending.setdefault(Path(path), []).append(text)
+            self.counts['appends'] += 1
+            self._arm()
+
+    def write(self, path:Path, text:str):
+        """Buffer a full rewrite of `path`; a later write before the flush replaces it."""
+        with self._lock:
+            self._documents[Path(path)] = text
+            self._arm()
+
+    def flush(self):
+        """Write every buffered append and document, without fsync."""
+        self._write(sync=False)
+
+    def commit(self):
+        """Turn boundary: write everything buffered and fsync every file touched since the last commit."""
+        self._write(sync=True)
+
+    def truncate(self, path:Path):
+        """Empty `path` on disk, dropping its buffered lines."""
+        path = Path(path)
+        with self._lock:
+            self._pending.pop(path, None)
+            self._close_handle(path)
+            self._unsynced.discard(path)
+            if path.exists():
+                path.write_text('', encoding='utf-8')
+
+    def discard(self):
+        """Drop everything buffered and close every handle — the session directory is going away."""
+        with self._lock:
+            self._cancel()
+            self._pending.clear()
+            self._documents.clear()
+            self._unsynced.clear()
+            for path in list(self._handles):
+                self._close_handle(path)
+
+    def close(self):
+        with self._lock:
+            self.commit()
+            self._cancel()
+            for path in list(self._handles):
+                self._close_handle(path)
+
+    # -- Internals ----------------------------------------------------------
+
+    def _write(self, sync:bool):
+        with self._lock:
+            self._cancel()
+            if self._pending or self._documents:
+                self.counts['flushes'] += 1
+            for path in list(self._pending):   # popped only once written: a failure keeps the rest
+                handle = self._handle(path)
+                handle.write(''.join(self._pending[path]))
+                handle.flush()
+                del self._pending[path]
+                self._unsynced.add(path)
+            for path in list(self._documents):
+                _replace(path, self._documents[path], sync)
+                del self._documents[path]
+                self.counts['fsyncs'] += sync
+            if sync:
+                self.counts['commits'] += 1
+                for path in self._unsynced:
+                    handle = self._handles.get(path)
+                    if handle is not None:
+                        os.fsync(handle.fileno())
+                        self.counts['fsyncs'] += 1
+                self._unsynced.clear()
+
+    def _handle(self, path:Path):
+        handle = self._handles.get(path)
+        if handle is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = self._handles[path] = open(path, 'a', encoding='utf-8')
+        return handle
+
+    def _close_handle(self, path:Path):
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            handle.close()
+
+    def _arm(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval_s, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        except OSError as ecp:   # the next commit retries whatever is still buffered
+            log.warning('journal flush failed: %s', ecp)
+
+
+def _replace(path:Path, text:str, sync:bool):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as file:
+        file.write(text)
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+    tmp.replace(path)
@@ -0,0 +1,67 @@
+"""Fixed-bucket latency histograms, one per name, process-wide.
+
+Buckets double from 50ms to ~26s (plus an overflow bucket), so a histogram is a dozen integers no
+matter how many calls it has seen, and quantiles are read off the bucket bounds. The detect_flows
+ensemble records every voter call here (`voter/<family>/<tier>`) so the quorum weighting can be tuned
+against real per-provider latency; `snapshot` is what /health/voters serves.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+
+from backend.utilities.process_registry import ProcessRegistry
+
+_BOUNDS_MS = (50, 100, 200, 400, 800, 1600, 3200, 6400, 12800, 25600)
+
+
+class LatencyHistogram:
+
+    def __init__(self, bounds:tuple=_BOUNDS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)     # the last bucket counts everything past bounds[-1]
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms:float):
+        with self._lock:
+            self.buckets[bisect.bisect_left(self.bounds, elapsed_ms)] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def quantile(self, q:float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (the max for the overflow bucket)."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank, seen = q * self.count, 0
+            for idx, hits in enumerate(self.buckets):
+                seen += hits
+                if seen >= rank and hits:
+                    return float(self.bounds[idx]) if idx < len(self.bounds) else self.max_ms
+            return self.max_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            count, total, peak = self.count, self.total_ms, self.max_ms
+            buckets = {f'le_{bound}': hits for bound, hits in zip(self.bounds, self.buckets)}
+            buckets['overflow'] = self.buckets[-1]
+        return {'count': count, 'mean_ms': round(total / count, 1) if count else None,
+                'p50_ms': self.quantile(0.5), 'p90_ms': self.quantile(0.9),
+                'max_ms': round(peak, 1) if count else None, 'buckets': buckets}
+
+
+_HISTOGRAMS:ProcessRegistry[LatencyHistogram] = ProcessRegistry()
+
+
+def histogram(name:str) -> LatencyHistogram:
+    """Process-wide histogram per name."""
+    return _HISTOGRAMS.get(name, LatencyHistogram)
+
+
+def snapshot(prefix:str='') -> dict[str, dict]:
+    named = sorted((name, hist) for name, hist in _HISTOGRAMS.items() if name.startswith(prefix))
+    return {name: hist.snapshot() for name, hist in named}
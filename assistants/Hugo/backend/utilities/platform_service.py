@@ -39,8 +39,7 @@ class PlatformService(ToolService):
         if not post_result['_success']:
             return post_result
 
-        entries = self._load_metadata()
-        ent = self._find_entry(entries, post_id)
+        ent = self._get_entry(post_id)
         content = self._read_content(ent['filename']) if ent else ''
         post = {
             'post_id': post_id,
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import json
 import re
 import uuid
 from pathlib import Path
 
-from backend.utilities.services import ToolService, split_sentences, join_sentences, resolve_snip_index
+from backend.utilities.services import ToolService, join_sentences, resolve_snip_index
 
 _PLACEHOLDER_SECTIONS = [
     ['Introduction', 'Body', 'Conclusion'],
@@ -33,28 +32,39 @@ class PostService(ToolService):
 
     def find_posts(self, query:str|None=None, tags:list|None=None,
                    status:str='all', limit:int=4) -> dict:
-        entries = self._load_metadata()
+        entries = self._store.select(None if status == 'all' else status)
         results = []
         query = (query or '').lower()
+        # Metadata matches per token (2.15.1) — "grid batteries" finds a title carrying both
+        # words anywhere; the content search below stays whole-phrase.
+        tokens = query.replace('-', ' ').split()
+
+        def _meta_match(entry:dict) -> bool:
+            searchable = ' '.join([
+                entry.get('title', ''),
+                entry.get('category', '') or '',
+                ' '.join(entry.get('tags', [])),
+            ]).lower()
+            return all(tok in searchable for tok in tokens)
+
+        if query:
+            # The index returns a ranked superset of both predicates below, so only its
+            # candidates are checked and only content-only candidates open their file.
+            # Metadata hits keep priority over content hits, each group in BM25 order.
+            ranked = self._search_index(query)
+            if ranked is not None:
+                rank = {pid: pos for pos, pid in enumerate(ranked)}
+                entries = sorted((ent for ent in entries if ent['post_id'] in rank),
+                                 key=lambda ent: (not _meta_match(ent), rank[ent['post_id']]))
 
         for entry in entries:
             snippet = None
-            if status != 'all' and entry.get('status') != status:
-                continue
             if tags:
                 entry_tags = [tag.lower() for tag in entry.get('tags', [])]
                 if not any(tag.lower() in entry_tags for tag in tags):
                     continue
             if query:
-                searchable = ' '.join([
-                    entry.get('title', ''),
-                    entry.get('category', '') or '',
-                    ' '.join(entry.get('tags', [])),
-                ]).lower()
-                # Metadata matches per token (2.15.1) — "grid batteries" finds a title carrying
-                # both words anywhere; the content search below stays whole-phrase.
-                tokens = query.replace('-', ' ').split()
-                if not all(tok in searchable for tok in tokens):
+                if not _meta_match(entry):
                     content = self._read_content(entry.get('filename', ''))
                     pos = content.lower().find(query)
                     if pos == -1:
@@ -77,13 +87,17 @@ class PostService(ToolService):
         return self._success(items=results, count=len(results))
 
     def search_notes(self, query:str|None=None, limit:int=8) -> dict:
-        entries = self._load_metadata()
+        entries = self._store.select('note')
         results = []
         query = (query or '').lower()
+        if query:
+            ranked = self._search_index(query)
+            if ranked is not None:
+                rank = {pid: pos for pos, pid in enumerate(ranked)}
+                entries = sorted((ent for ent in entries if ent['post_id'] in rank),
+                                 key=lambda ent: rank[ent['post_id']])
 
         for ent in entries:
-            if ent.get('status') != 'note':
-                continue
             content = self._read_content(ent.get('filename', ''))
             if query and query not in content.lower() and query not in ent.get('title', '').lower():
                 continue
@@ -98,21 +112,21 @@ class PostService(ToolService):
         return self._success(items=results, count=len(results))
 
     def get_title(self, post_id:str) -> str | None:
-        entries = self._load_metadata()
-        ent = self._find_entry(entries, post_id)
+        ent = self._get_entry(post_id)
         return ent['title'] if ent else None
 
     def read_metadata(self, post_id:str, include_outline:bool=False,
                       include_preview:bool=False) -> dict:
         ent, _ = self._require_entry(post_id)
-        content = self._read_content(ent['filename'])
-        sections = self._extract_sections(content)
+        parsed = self._parsed(ent['filename'])
+        content = parsed.text
+        sections = parsed.sections()
 
         section_summaries = [
             {
                 'sec_id': sec['sec_id'],
                 'title': sec['title'],
-                'sentence_count': len(split_sentences('\n'.join(sec['lines']))),
+                'sentence_count': len(parsed.snips(sec)),
             }
             for sec in sections
         ]
@@ -149,8 +163,8 @@ class PostService(ToolService):
                      snip_id:int|tuple|list|None=None,
                      include_sentence_ids:bool=False) -> dict:
         entry, _ = self._require_entry(post_id)
-        content = self._read_content(entry['filename'])
-        section = self._resolve_section(content, sec_id)
+        parsed = self._parsed(entry['filename'])
+        section = parsed.section(sec_id)
         if not section:
             return self._error('not_found', f'Section not found: {sec_id}')
 
@@ -164,11 +178,11 @@ class PostService(ToolService):
                 sec_id=section['sec_id'],
                 title=section['title'],
                 content=raw,
-                sentence_count=len(split_sentences(raw)),
+                sentence_count=len(parsed.snips(section)),
             )
 
         # Snip-indexed path — split so the caller can slice by snip_id.
-        sentences = split_sentences(raw)
+        sentences = parsed.snips(section)
         if snip_id is None:
             selected, start_idx = sentences, 0
         elif isinstance(snip_id, int):
@@ -218,8 +232,7 @@ class PostService(ToolService):
                 'word_count': len(re.sub(r'<[^>]+>', '', body).split()),
                 'filename': filename,
             }
-            entries.append(entry)
-            self._save_metadata(entries)
+            self._save_entry(entry)
             return self._success(
                 post_id=post_id, title='', status='note',
                 created_at=now, updated_at=now, section_ids=[],
@@ -269,8 +282,7 @@ class PostService(ToolService):
             'word_count': len(re.sub(r'<[^>]+>', '', body).split()),
             'filename': filename,
         }
-        entries.append(entry)
-        self._save_metadata(entries)
+        self._save_entry(entry)
 
         return self._success(
             post_id=post_id, title=title, status='draft',
@@ -279,7 +291,6 @@ class PostService(ToolService):
 
     def update_post(self, post_id:str, updates:dict) -> dict:
         ent, entries = self._require_entry(post_id)
-        file_content = self._read_content(ent['filename'])
 
         invalid_keys = set(updates.keys()) - _VALID_METADATA_KEYS
         if invalid_keys:
@@ -287,7 +298,7 @@ class PostService(ToolService):
                 f'Invalid metadata keys: {invalid_keys}. Use content tools for content changes.')
 
         section_headers = updates.pop('sections', [])
-        sections = self._extract_sections(file_content)
+        sections = self._parsed(ent['filename']).sections()
         if len(section_headers) == len(sections):
             for sec, new_header in zip(sections, section_headers):
                 if sec['title'] != new_header:
@@ -330,19 +341,15 @@ class PostService(ToolService):
         )
 
     def delete_post(self, post_id:str) -> dict:
-        entries = self._load_metadata()
-        ent = next((e for e in entries if e['post_id'] == post_id), None)
+        ent = self._remove_entry(post_id)
         if ent is None:
             return self._success()
-        entries.remove(ent)
-        self._save_metadata(entries)
         filepath = self._content_dir / ent['filename']
         if filepath.exists():
             filepath.unlink()
-        for path in self._snapshot_files():
-            bundle = json.loads(path.read_text(encoding='utf-8'))
-            if bundle['post_id'] == post_id:
-                path.unlink()
+        self._posts.forget(ent['filename'])
+        self._references.forget(post_id)
+        self._snapshots.remove_post(post_id)
         return self._success()
 
     def summarize_text(self, post_id:str|None=None, sec_id:str|None=None,
@@ -353,8 +360,7 @@ class PostService(ToolService):
             text = note
         elif sec_id and post_id:
             ent, _ = self._require_entry(post_id)
-            content = self._read_content(ent['filename'])
-            sec = self._resolve_section(content, sec_id)
+            sec = self._parsed(ent['filename']).section(sec_id)
             text = '\n'.join(sec['lines']) if sec else ''
         elif post_id:
             ent, _ = self._require_entry(post_id)
@@ -378,8 +384,7 @@ class PostService(ToolService):
 
         post_id = bundle['post_id']
         ent, entries = self._require_entry(post_id)
-        file_content = self._read_content(ent['filename'])
-        sections = self._extract_sections(file_content)
+        sections = self._parsed(ent['filename']).sections()
         saved_by_id = {s['sec_id']: s['lines'] for s in bundle['content']}
 
         # Whole-post snapshot whose sections match current → reorder + replace; preserves
@@ -399,24 +404,31 @@ class PostService(ToolService):
         self._save_metadata(entries)
         return self._success()
 
-    def list_preview(self, limit:int=100) -> dict:
-        entries = self._load_metadata()
-        previews = []
-        for ent in entries[:limit]:
-            preview_item = {
-                'post_id': ent['post_id'],
-                'title': ent['title'],
-                'status': ent.get('status'),
-                'category': ent.get('category'),
-                'metadata': {'tags': ent.get('tags', []), 'color': ent.get('color')},
-                'created_at': ent.get('created_at'),
-                'updated_at': ent.get('updated_at'),
-                'preview': ent.get('preview', ''),
-            }
-            if ent.get('status') == 'note':
-                preview_item['content'] = self._read_content(ent['filename'])
-            previews.append(preview_item)
-        return self._success(items=previews, count=len(previews))
+    def list_preview(self, limit:int=100, since:str|None=None, refresh:bool=False) -> dict:
+        """Sidebar rows, served from the process-wide `PreviewCache`. `version` is the token for
+        this listing; pass a previous one as `since` to get only the rows changed after it
+        (`delta=True`, with `order` holding the post_ids now in the window). `refresh` re-reads
+        every note from disk, for edits made outside the services."""
+        if refresh:
+            self._previews.invalidate()
+        items, order, token, delta = self._previews.listing(
+            self._store, self._preview_item, self._read_content, limit, since)
+        if delta:
+            return self._success(items=items, count=len(items), order=order, version=token, delta=True)
+        return self._success(items=items, count=len(items), version=token)
+
+    @staticmethod
+    def _preview_item(ent:dict) -> dict:
+        return {
+            'post_id': ent['post_id'],
+            'title': ent['title'],
+            'status': ent.get('status'),
+            'category': ent.get('category'),
+            'metadata': {'tags': ent.get('tags', []), 'color': ent.get('color')},
+            'created_at': ent.get('created_at'),
+            'updated_at': ent.get('updated_at'),
+            'preview': ent.get('preview', ''),
+        }
 
     def sync_check(self) -> dict:
         entries = self._load_metadata()
@@ -0,0 +1,33 @@
+"""Keyed process-wide singletons.
+
+Services, routers and agents are constructed per request or per session, so anything that must
+outlive them — a parsed index, a connection pool, a cache — lives in a module-level registry and
+is built once per key on first use. `metadata_store` is the model; the other accessors use the
+same `ProcessRegistry`.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Generic, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class ProcessRegistry(Generic[T]):
+
+    def __init__(self):
+        self._items:dict[Hashable, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key:Hashable, build:Callable[[], T]) -> T:
+        """The instance for `key`, calling `build` under the lock the first time, so concurrent
+        callers never construct two."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                item = self._items[key] = build()
+            return item
+
+    def items(self) -> list[tuple[Hashable, T]]:
+        with self._lock:
+            return list(self._items.items())
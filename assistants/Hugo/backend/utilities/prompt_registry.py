@@ -0,0 +1,99 @@
+"""In-memory registry for the markdown prompts a policy run reads (pex/flows, pex/skills).
+
+Every `*.md` under a prompt directory is read and validated once, the first time the directory is
+asked for — a PromptEngineer touches both at construction, so in practice at startup. After that
+`get` is a dict lookup: no filesystem I/O on the policy path. With `hot_reload` (the `debug` config,
+i.e. dev mode) each `get` stats the file and rereads it when its mtime moved, so an edited prompt
+takes effect on the next turn without a restart. `stats` reports an estimated token count per
+prompt (chars / 4, the compactor's estimate).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+
+from backend.utilities.process_registry import ProcessRegistry
+
+log = logging.getLogger(__name__)
+
+_CHARS_PER_TOKEN = 4
+
+
+class PromptRegistry:
+
+    def __init__(self, root:Path, hot_reload:bool=False):
+        self.root = Path(root)
+        self.hot_reload = hot_reload
+        self._lock = threading.Lock()
+        self._prompts:dict[str, tuple[str, int]] = {}     # name -> (text, mtime_ns)
+        self.reloads = 0
+        self.load_all()
+
+    def load_all(self):
+        """Read and validate every prompt under the root; raises ValueError on an invalid one."""
+        loaded = {path.stem: self._read(path) for path in sorted(self.root.glob('*.md'))}
+        with self._lock:
+            self._prompts = loaded
+        log.info('prompt registry %s: %d prompts, ~%d tokens', self.root.name, len(loaded),
+                 sum(_tokens(text) for text, _ in loaded.values()))
+
+    def get(self, name:str) -> str:
+        with self._lock:
+            entry = self._prompts.get(name)
+        if self.hot_reload:
+            entry = self._refresh(name, entry)
+        if entry is None:
+            raise FileNotFoundError(f'no prompt {name!r} under {self.root}')
+        return entry[0]
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._prompts)
+
+    def stats(self) -> dict:
+        with self._lock:
+            prompts = {name: {'tokens': _tokens(text), 'chars': len(text)}
+                       for name, (text, _) in sorted(self._prompts.items())}
+        return {'prompts': prompts, 'total_tokens': sum(entry['tokens'] for entry in prompts.values()),
+                'reloads': self.reloads}
+
+    def _refresh(self, name:str, entry:tuple | None) -> tuple | None:
+        path = self.root / f'{name}.md'
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return entry
+        if entry is not None and entry[1] == mtime:
+            return entry
+        entry = self._read(path)
+        with self._lock:
+            self._prompts[name] = entry
+            self.reloads += 1
+        log.info('prompt registry reloaded %s/%s', self.root.name, name)
+        return entry
+
+    @staticmethod
+    def _read(path:Path) -> tuple[str, int]:
+        mtime = path.stat().st_mtime_ns
+        text = path.read_text(encoding='utf-8')   # UnicodeDecodeError is a ValueError too
+        if not text.strip():
+            raise ValueError(f'prompt {path} is empty')
+        return text, mtime
+
+
+def _tokens(text:str) -> int:
+    return len(text) // _CHARS_PER_TOKEN
+
+
+_REGISTRIES:ProcessRegistry[PromptRegistry] = ProcessRegistry()
+
+
+def prompt_registry(root:Path, hot_reload:bool=False) -> PromptRegistry:
+    """Process-wide registry per prompt directory. Hot reload, once any caller asks for it, stays
+    on for the directory."""
+    root = Path(root).resolve()
+    registry = _REGISTRIES.get(root, lambda: PromptRegistry(root, hot_reload))
+    if hot_reload:
+        registry.hot_reload = True
+    return registry
@@ -0,0 +1,95 @@
+"""Reference material the review tools reread within a turn: editorial guides and the style
+profiles of reference posts.
+
+An audit flow calls `editor_review` and `compare_style` several times against the same guide and
+the same canonical posts. `guide` keeps each guide file's text and `profile` keeps each reference
+post's `compare_style` profile. Each check stats the file and rereads or rebuilds only when its
+`(inode, mtime_ns, size)` stamp moved — the `MetadataStore` rule — so an edited guide or a
+rewritten post is picked up on the next call. The services drop a post's profile on their own
+writes as well (`forget`), so a same-size rewrite within one mtime tick cannot be missed.
+
+`stats` reports an estimated token count per entry (bytes / 4, the compactor's estimate).
+"""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from backend.utilities.process_registry import ProcessRegistry
+
+_CHARS_PER_TOKEN = 4
+
+
+def _file_stamp(path:Path) -> tuple | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _copy_profile(profile:dict) -> dict:
+    return {key: list(val) if isinstance(val, list) else val for key, val in profile.items()}
+
+
+class ReferenceCache:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._guides:dict[Path, tuple[tuple, str]] = {}                 # path -> (stamp, text)
+        self._profiles:dict[tuple[str, Path], tuple[tuple, dict]] = {}  # (post_id, path) -> (stamp, profile)
+        self.reads = 0
+        self.builds = 0
+
+    def guide(self, path:Path) -> str:
+        """The guide's text, or '' when the file does not exist."""
+        stamp = _file_stamp(path)
+        with self._lock:
+            entry = self._guides.get(path)
+            if stamp is None:
+                self._guides.pop(path, None)
+                return ''
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+        text = path.read_text(encoding='utf-8')
+        with self._lock:
+            self._guides[path] = (stamp, text)
+            self.reads += 1
+        return text
+
+    def profile(self, post_id:str, path:Path, build) -> dict:
+        """`build()`'s profile for the post whose body lives at `path`, rebuilt when the file moved.
+        A missing file is built every time and never cached."""
+        stamp = _file_stamp(path)
+        with self._lock:
+            entry = self._profiles.get((post_id, path))
+            if stamp is not None and entry is not None and entry[0] == stamp:
+                return _copy_profile(entry[1])
+        profile = build()
+        with self._lock:
+            self.builds += 1
+            if stamp is not None:
+                self._profiles[(post_id, path)] = (stamp, _copy_profile(profile))
+        return profile
+
+    def forget(self, post_id:str):
+        with self._lock:
+            for key in [key for key in self._profiles if key[0] == post_id]:
+                del self._profiles[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            guides = {path.name: entry[0][2] // _CHARS_PER_TOKEN for path, entry in self._guides.items()}
+            profiles = {post_id: entry[0][2] // _CHARS_PER_TOKEN
+                        for (post_id, _), entry in self._profiles.items()}
+            return {'guides': guides, 'profiles': profiles,
+                    'total_tokens': sum(guides.values()) + sum(profiles.values()),
+                    'reads': self.reads, 'builds': self.builds}
+
+
+_CACHES:ProcessRegistry[ReferenceCache] = ProcessRegistry()
+
+
+def reference_cache(root:Path) -> ReferenceCache:
+    """Process-wide cache for one database root."""
+    return _CACHES.get(root, ReferenceCache)
@@ -0,0 +1,149 @@
+"""Content-addressed cache of LLM responses for `PromptEngineer.__call__` (opt-in via `llm_cache`).
+
+A request is keyed by a SHA-256 over its canonical JSON — family, model, system prompt or user prompt,
+messages, schema, tools and max_tokens — so two calls share an entry only when the provider would
+see byte-identical input. Lookups go through a small in-memory LRU first, then an optional SQLite
+file that outlives the process: point several eval runs at the same file and the second run replays
+the first offline and deterministically.
+
+Each entry carries the task it was stored under and expires after that task's TTL (`ttl_s`, with
+`default` covering tasks not listed; null means never, 0 means that task is never cached). Hits and
+misses are counted overall and per task. Payloads are opaque strings; `PromptEngineer` owns the
+encoding of provider responses.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _jsonable(obj):
+    if hasattr(obj, 'model_dump'):           # provider SDK objects (content blocks) in a message list
+        return obj.model_dump(mode='json')
+    return str(obj)
+
+
+def request_key(**request) -> str:
+    """Stable hash of one request. Key order and SDK object identity never change the key."""
+    blob = json.dumps(request, sort_keys=True, default=_jsonable, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+
+    def __init__(self, path:Path|None=None, max_entries:int=512, ttl_s:dict|None=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_s = dict(ttl_s or {})
+        self._lock = threading.RLock()
+        self._memory:OrderedDict[str, tuple[float|None, str]] = OrderedDict()
+        self._conn = None
+        self._counts:dict[str, dict[str, int]] = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self.disk_hits = 0
+
+    @classmethod
+    def from_config(cls, cfg) -> ResponseCache | None:
+        """Build the cache from the `llm_cache` config section; None when it is disabled."""
+        if not cfg or not cfg.get('enabled'):
+            return None
+        path = cfg.get('path')
+        if path:
+            path = Path(path)
+            path = path if path.is_absolute() else _ROOT / path
+        return cls(path, cfg.get('max_entries', 512), cfg.get('ttl_s'))
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, task TEXT,'
+                         ' payload TEXT, expires REAL)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def ttl(self, task:str) -> float | None:
+        return self.ttl_s.get(task, self.ttl_s.get('default'))
+
+    def cacheable(self, task:str) -> bool:
+        return self.ttl(task) != 0
+
+    # -- Lookup -------------------------------------------------------------
+
+    def get(self, key:str, task:str) -> str | None:
+        """The stored payload, or None on a miss (absent or expired). Counts either way."""
+        now = time.time()
+        with self._lock:
+            payload = self._lookup(key, now)
+            self._counts[task]['hits' if payload is not None else 'misses'] += 1
+            return payload
+
+    def _lookup(self, key:str, now:float) -> str | None:
+        item = self._memory.get(key)
+        if item is not None:
+            expires, payload = item
+            if expires is None or expires > now:
+                self._memory.move_to_end(key)
+                return payload
+            del self._memory[key]
+        if self.path is None:
+            return None
+        row = self._db().execute('SELECT payload, expires FROM responses WHERE key = ?',
+                                 (key,)).fetchone()
+        if row is None:
+            return None
+        payload, expires = row
+        if expires is not None and expires <= now:
+            with self._conn:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            return None
+        self.disk_hits += 1
+        self._remember(key, expires, payload)
+        return payload
+
+    # -- Store --------------------------------------------------------------
+
+    def put(self, key:str, task:str, payload:str):
+        ttl = self.ttl(task)
+        if ttl == 0:
+            return
+        expires = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._remember(key, expires, payload)
+            if self.path is not None:
+                with self._db() as conn:
+                    conn.execute('INSERT OR REPLACE INTO responses (key, task, payload, expires)'
+                                 ' VALUES (?, ?, ?, ?)', (key, task, payload, expires))
+
+    def _remember(self, key:str, expires:float|None, payload:str):
+        self._memory[key] = (expires, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.path is not None:
+                with self._db() as conn:
+                    conn.execute('DELETE FROM responses')
+
+    # -- Counters -----------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            by_task = {task: dict(counts) for task, counts in self._counts.items()}
+            return {
+                'hits': sum(counts['hits'] for counts in by_task.values()),
+                'misses': sum(counts['misses'] for counts in by_task.values()),
+                'disk_hits': self.disk_hits,
+                'entries': len(self._memory),
+                'by_task': by_task,
+            }
@@ -0,0 +1,241 @@
+"""Persistent inverted index over the content library (posts, drafts and notes).
+
+One SQLite file next to metadata.json holds `term -> (post_id, tf)` postings plus one row per
+indexed document carrying its version stamp and token length. `find_posts` and `search_notes`
+match by substring, so the index must return a superset of what those predicates accept; the
+services keep their exact match semantics and only verify the few ranked candidates. Every suffix
+of every indexed term is kept in an indexed `suffixes` table, so "the terms containing this token"
+is one range scan over the suffixes it prefixes (`suffix >= token AND suffix < token+1`), not a
+walk over the vocabulary.
+
+A document's stamp is its metadata row's `(filename, updated_at)` plus the body file's
+`(mtime_ns, size)`. `sync` re-indexes exactly the rows whose stamp moved — a service write bumps
+`updated_at`, and a note edited straight on disk moves the file stamp — and drops rows that
+vanished. Reading all of metadata and statting every file is O(library), so queries go through
+`refresh`, which syncs only when the metadata version changed or the last sweep is older than
+`rescan_s`; an edit made behind the services' back is picked up within that window.
+"""
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Callable
+
+from backend.utilities.process_registry import ProcessRegistry
+
+_TOKEN = re.compile(r'\w+')
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_RESCAN_S = 5.0
+
+
+def tokenize(text:str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _doc_text(entry:dict, body:str) -> str:
+    return ' '.join([entry.get('title', '') or '', entry.get('category', '') or '',
+                     ' '.join(entry.get('tags', []) or []), body])
+
+
+def _suffixes(term:str) -> list[tuple[str, str]]:
+    return [(term[idx:], term) for idx in range(len(term))]
+
+
+def _prefix_bound(token:str) -> str:
+    """Smallest string greater than every string starting with `token`."""
+    return token[:-1] + chr(ord(token[-1]) + 1)
+
+
+class SearchIndex:
+
+    def __init__(self, path:Path, rescan_s:float=_RESCAN_S):
+        self.path = path
+        self.rescan_s = rescan_s
+        self._root = path.parent                 # filenames in metadata are relative to content/
+        self._lock = threading.RLock()
+        self._conn = None
+        self._docs:dict[str, tuple[str, int]] = {}
+        self._vocab:dict[str, int] = {}
+        self._version = None                     # metadata version of the last `refresh` sync
+        self._swept = float('-inf')
+
+    def _stamp(self, entry:dict) -> str:
+        filename = entry.get('filename', '') or ''
+        try:
+            stat = (self._root / filename).stat()
+            body = f'{stat.st_mtime_ns}:{stat.st_size}'
+        except OSError:
+            body = '-'
+        return f"{filename}|{entry.get('updated_at', '')}|{body}"
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.executescript(
+                'CREATE TABLE IF NOT EXISTS docs (post_id TEXT PRIMARY KEY, stamp TEXT, length INTEGER);'
+                'CREATE TABLE IF NOT EXISTS postings (term TEXT, post_id TEXT, tf INTEGER,'
+                ' PRIMARY KEY (term, post_id)) WITHOUT ROWID;'
+                'CREATE INDEX IF NOT EXISTS postings_doc ON postings (post_id);'
+                'CREATE TABLE IF NOT EXISTS suffixes (suffix TEXT, term TEXT,'
+                ' PRIMARY KEY (suffix, term)) WITHOUT ROWID;'
+            )
+            self._docs = {pid: (stamp, length) for pid, stamp, length
+                          in conn.execute('SELECT post_id, stamp, length FROM docs')}
+            self._vocab = dict(conn.execute('SELECT term, COUNT(*) FROM postings GROUP BY term'))
+            if self._vocab and conn.execute('SELECT 1 FROM suffixes LIMIT 1').fetchone() is None:
+                with conn:                       # an index written before the suffix table existed
+                    conn.executemany('INSERT OR IGNORE INTO suffixes (suffix, term) VALUES (?, ?)',
+                                     [pair for term in self._vocab for pair in _suffixes(term)])
+            self._conn = conn
+        return self._conn
+
+    # -- Maintenance --------------------------------------------------------
+
+    def _drop(self, conn:sqlite3.Connection, post_id:str):
+        retired = []
+        for (term,) in conn.execute('SELECT term FROM postings WHERE post_id = ?', (post_id,)).fetchall():
+            remaining = self._vocab.get(term, 1) - 1
+            if remaining > 0:
+                self._vocab[term] = remaining
+            else:
+                self._vocab.pop(term, None)
+                retired.append(term)
+        conn.executemany('DELETE FROM suffixes WHERE suffix = ? AND term = ?',
+                         [pair for term in retired for pair in _suffixes(term)])
+        conn.execute('DELETE FROM postings WHERE post_id = ?', (post_id,))
+        conn.execute('DELETE FROM docs WHERE post_id = ?', (post_id,))
+        self._docs.pop(post_id, None)
+
+    def _add(self, conn:sqlite3.Connection, entry:dict, body:str):
+        post_id = entry['post_id']
+        counts = Counter(tokenize(_doc_text(entry, body)))
+        conn.executemany('INSERT INTO postings (term, post_id, tf) VALUES (?, ?, ?)',
+                         [(term, post_id, tf) for term, tf in counts.items()])
+        length = sum(counts.values())
+        stamp = self._stamp(entry)
+        conn.execute('INSERT INTO docs (post_id, stamp, length) VALUES (?, ?, ?)',
+                     (post_id, stamp, length))
+        fresh = [term for term in counts if term not in self._vocab]
+        conn.executemany('INSERT OR IGNORE INTO suffixes (suffix, term) VALUES (?, ?)',
+                         [pair for term in fresh for pair in _suffixes(term)])
+        for term in counts:
+            self._vocab[term] = self._vocab.get(term, 0) + 1
+        self._docs[post_id] = (stamp, length)
+
+    def update(self, entry:dict, body:str):
+        """(Re-)index one document."""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                self._drop(conn, entry['post_id'])
+                self._add(conn, entry, body)
+
+    def remove(self, post_id:str):
+        with self._lock:
+            conn = self._db()
+            with conn:
+                self._drop(conn, post_id)
+
+    def sync(self, entries:list[dict], read:Callable[[str], str]) -> int:
+        """Bring the index in line with the metadata rows: re-index rows whose stamp changed,
+        drop documents no longer listed. Only changed rows are read from disk. Returns the number
+        of documents touched."""
+        with self._lock:
+            conn = self._db()
+            live = {ent['post_id']: ent for ent in entries}
+            stale = [ent for pid, ent in live.items()
+                     if self._docs.get(pid, (None,))[0] != self._stamp(ent)]
+            gone = [pid for pid in self._docs if pid not in live]
+            if not stale and not gone:
+                return 0
+            with conn:
+                for pid in gone:
+                    self._drop(conn, pid)
+                for ent in stale:
+                    self._drop(conn, ent['post_id'])
+                    self._add(conn, ent, read(ent.get('filename', '')))
+            return len(stale) + len(gone)
+
+    def refresh(self, version, entries:Callable[[], list[dict]], read:Callable[[str], str]) -> int:
+        """`sync` against `entries()` only when the metadata `version` moved since the last refresh
+        or the last sweep is older than `rescan_s` (which also catches bodies edited on disk).
+        Otherwise a no-op that reads nothing."""
+        with self._lock:
+            now = time.monotonic()
+            if version == self._version and now - self._swept < self.rescan_s:
+                return 0
+            touched = self.sync(entries(), read)
+            self._version, self._swept = version, now
+            return touched
+
+    def rebuild(self, entries:list[dict], read:Callable[[str], str]) -> int:
+        """Drop everything and index every row from scratch."""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute('DELETE FROM postings')
+                conn.execute('DELETE FROM docs')
+                conn.execute('DELETE FROM suffixes')
+            self._docs, self._vocab = {}, {}
+            self._version = None
+            return self.sync(entries, read)
+
+    # -- Query --------------------------------------------------------------
+
+    def _postings(self, conn:sqlite3.Connection, token:str) -> dict[str, int]:
+        """post_id -> summed tf over every indexed term containing `token`: the terms come from
+        one range scan of the suffixes that start with it."""
+        tf_by_doc:dict[str, int] = defaultdict(int)
+        rows = conn.execute('SELECT post_id, tf FROM postings WHERE term IN'
+                            ' (SELECT term FROM suffixes WHERE suffix >= ? AND suffix < ?)',
+                            (token, _prefix_bound(token)))
+        for post_id, tf in rows:
+            tf_by_doc[post_id] += tf
+        return tf_by_doc
+
+    def search(self, query:str) -> list[str] | None:
+        """Post ids whose text contains every query token (as a substring of some indexed term),
+        best BM25 score first. Returns None when the query has no word characters to look up, so
+        the caller falls back to its plain scan."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return None
+        with self._lock:
+            conn = self._db()
+            num_docs = len(self._docs) or 1
+            avg_len = (sum(length for _, length in self._docs.values()) / num_docs) or 1.0
+            per_token:list[dict[str, int]] = []
+            for token in tokens:
+                tf_by_doc = self._postings(conn, token)
+                if not tf_by_doc:
+                    return []
+                per_token.append(tf_by_doc)
+
+            candidates = set.intersection(*(set(tf_by_doc) for tf_by_doc in per_token))
+            scores = {}
+            for post_id in candidates:
+                length = self._docs.get(post_id, ('', avg_len))[1]
+                norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * length / avg_len)
+                score = 0.0
+                for tf_by_doc in per_token:
+                    df = len(tf_by_doc)
+                    idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+                    tf = tf_by_doc[post_id]
+                    score += idf * tf * (_BM25_K1 + 1) / (tf + norm)
+                scores[post_id] = score
+        return sorted(scores, key=lambda pid: (-scores[pid], pid))
+
+
+_INDEXES:ProcessRegistry[SearchIndex] = ProcessRegistry()
+
+
+def search_index(path:Path) -> SearchIndex:
+    """Process-wide index for one database file."""
+    return _INDEXES.get(path, lambda: SearchIndex(path))
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import bisect
 import json
 import re
+import secrets
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 
+from backend.utilities.process_registry import ProcessRegistry
+from backend.utilities.reference_cache import ReferenceCache, reference_cache
+from backend.utilities.search_index import SearchIndex, search_index
+from backend.utilities.snapshot_store import SnapshotStore, snapshot_store
+
 _DB_DIR = Path(__file__).resolve().parents[2] / 'database'
 
 _SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
 _STRUCTURAL_LINE = re.compile(r'^\s*(#{1,6}\s|[-*]\s|\d+\.\s)')
 _HEADING_LINE = re.compile(r'^\s*#{1,6}\s')
+_SECTION_HEADING = re.compile(r'^## ', re.MULTILINE)
+_HTML_TAG = re.compile(r'<[^>]+>')
 
 
 class OutlineValidationError(ValueError):
@@ -88,11 +99,363 @@ def resolve_snip_index(snip_id:int, length:int) -> int:
     return length - 1 if snip_id == -1 else snip_id
 
 
+def _title_key(ent:dict) -> str:
+    return (ent.get('title') or '').lower()
+
+
+def _copy_entry(ent:dict) -> dict:
+    """Copy one metadata row deep enough that a caller mutating it (or its tag list) cannot
+    corrupt the cached row. Entries are flat: scalars plus lists of strings."""
+    return {key: list(val) if isinstance(val, list) else val for key, val in ent.items()}
+
+
+class MetadataStore:
+    """In-process indexed view over one `metadata.json`.
+
+    The JSON file stays the on-disk source of truth (the seed library, `rebuild_metadata.py` and the
+    test fixtures all speak it); this store parses it once per file version and serves every read
+    from memory. The version stamp is `(inode, mtime_ns, size)` — our own saves swap the inode via
+    temp + rename, and an outside rewrite (rebuild script, a test fixture) changes mtime or size,
+    so either one triggers a single re-parse on the next read.
+
+    Rows are indexed by post_id, status and lowercased title. Reads hand out copies; writes go
+    through `save` (whole list) or `put` / `remove` (one row), which update the cached rows and
+    indexes in place and then persist, so the next read never re-parses our own write. `put` only
+    touches the affected row's index buckets. `remove` shifts the positions of every later row, so
+    it re-indexes in O(N); deletes are rare. Every write still serializes the whole list, since the
+    JSON file has no row-level update; what the store saves is the re-parse and re-index."""
+
+    def __init__(self, path:Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._rows:list[dict] = []
+        self._by_id:dict[str, int] = {}
+        self._by_status:dict[str, list[int]] = {}
+        self._by_title:dict[str, list[int]] = {}
+
+    def _file_stamp(self) -> tuple | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _reindex(self):
+        self._by_id, self._by_status, self._by_title = {}, {}, {}
+        for pos, ent in enumerate(self._rows):
+            self._by_id[ent['post_id']] = pos
+            self._by_status.setdefault(ent.get('status'), []).append(pos)
+            self._by_title.setdefault(_title_key(ent), []).append(pos)
+
+    def _index_row(self, pos:int, ent:dict):
+        self._by_id[ent['post_id']] = pos
+        bisect.insort(self._by_status.setdefault(ent.get('status'), []), pos)   # buckets stay in file order
+        bisect.insort(self._by_title.setdefault(_title_key(ent), []), pos)
+
+    def _unindex_row(self, pos:int, ent:dict):
+        self._by_id.pop(ent['post_id'], None)
+        for index, key in ((self._by_status, ent.get('status')), (self._by_title, _title_key(ent))):
+            bucket = index[key]
+            bucket.remove(pos)
+            if not bucket:
+                del index[key]
+
+    def _refresh(self):
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        if stamp is None:
+            self._rows = []
+        else:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self._rows = data.get('entries', [])
+        self._stamp = stamp
+        self._reindex()
+
+    # -- Reads --------------------------------------------------------------
+
+    def entries(self) -> list[dict]:
+        with self._lock:
+            self._refresh()
+            return [_copy_entry(ent) for ent in self._rows]
+
+    def get(self, post_id:str) -> dict | None:
+        with self._lock:
+            self._refresh()
+            pos = self._by_id.get(post_id)
+            return None if pos is None else _copy_entry(self._rows[pos])
+
+    def stamp(self) -> tuple | None:
+        """Version of the file the cached rows came from; changes on every save, ours or not."""
+        with self._lock:
+            self._refresh()
+            return self._stamp
+
+    def position(self, post_id:str) -> int | None:
+        """File-order index of a row, so a caller holding `entries()` can locate it in O(1)."""
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(post_id)
+
+    def select(self, status:str|None=None) -> list[dict]:
+        """Rows in file order, optionally restricted to one status via the status index."""
+        with self._lock:
+            self._refresh()
+            if status is None:
+                return [_copy_entry(ent) for ent in self._rows]
+            return [_copy_entry(self._rows[pos]) for pos in self._by_status.get(status, [])]
+
+    def find_title(self, title:str) -> list[dict]:
+        """Rows whose title matches case-insensitively."""
+        with self._lock:
+            self._refresh()
+            return [_copy_entry(self._rows[pos]) for pos in self._by_title.get(title.lower(), [])]
+
+    # -- Writes -------------------------------------------------------------
+
+    def save(self, entries:list[dict]):
+        with self._lock:
+            self._rows = [_copy_entry(ent) for ent in entries]
+            self._reindex()
+            self._persist()
+
+    def put(self, entry:dict):
+        """Row-level upsert: replace the row with the same post_id, or append a new one."""
+        with self._lock:
+            self._refresh()
+            row = _copy_entry(entry)
+            pos = self._by_id.get(row['post_id'])
+            if pos is None:
+                pos = len(self._rows)
+                self._rows.append(row)
+            else:
+                self._unindex_row(pos, self._rows[pos])
+                self._rows[pos] = row
+            self._index_row(pos, row)
+            self._persist()
+
+    def remove(self, post_id:str) -> dict | None:
+        """Row-level delete. Returns the removed row, or None when the id is unknown."""
+        with self._lock:
+            self._refresh()
+            pos = self._by_id.get(post_id)
+            if pos is None:
+                return None
+            row = self._rows.pop(pos)
+            self._reindex()
+            self._persist()
+            return row
+
+    def _persist(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic write (temp + rename): a reader can never observe a half-written file.
+        tmp = self.path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps({'entries': self._rows}, indent=2, default=str), encoding='utf-8')
+        tmp.replace(self.path)
+        self._stamp = self._file_stamp()
+
+
+_STORES:ProcessRegistry[MetadataStore] = ProcessRegistry()
+
+
+def metadata_store(path:Path) -> MetadataStore:
+    """Process-wide store for one metadata file. Services are constructed per call site (routers
+    build a fresh PostService per request), so the parsed index has to live at module level."""
+    return _STORES.get(path, lambda: MetadataStore(path))
+
+
+class ParsedPost:
+    """One version of a post body, parsed once. The section tree is built up front; each section's
+    snips and the body's word count are computed on first use and memoized. The version key is
+    the body text itself, so a parse can never outlive the content it was built from.
+
+    A new version of the same post inherits the snips of every section whose text did not change,
+    so rewriting one section of a long draft only re-splits that section."""
+
+    def __init__(self, text:str, previous:ParsedPost|None=None):
+        self.text = text
+        self._sections = ToolService._extract_sections(text)
+        inherited = previous._snips if previous is not None else {}
+        self._snips:dict[str, tuple[str, ...] | None] = {}
+        for sec in self._sections:
+            key = '\n'.join(sec['lines'])
+            self._snips[key] = inherited.get(key)
+        self._word_count:int|None = None
+
+    def sections(self) -> list[dict]:
+        """Fresh copies — write callers reassign `lines` and reorder the list."""
+        return [{**sec, 'lines': list(sec['lines'])} for sec in self._sections]
+
+    def section(self, sec_id:str) -> dict | None:
+        for sec in self._sections:
+            if sec['sec_id'] == sec_id:
+                return {**sec, 'lines': list(sec['lines'])}
+        return None
+
+    def snips(self, sec:dict) -> tuple[str, ...]:
+        """`split_sentences` of a section's body; memoized for this version's own sections."""
+        key = '\n'.join(sec['lines'])
+        if key not in self._snips:
+            return tuple(split_sentences(key))
+        snips = self._snips[key]
+        if snips is None:
+            snips = self._snips[key] = tuple(split_sentences(key))
+        return snips
+
+    @property
+    def word_count(self) -> int:
+        if self._word_count is None:
+            self._word_count = len(_HTML_TAG.sub('', self.text).split())
+        return self._word_count
+
+
+class PostCache:
+    """The latest `ParsedPost` per content file, least recently used evicted past `limit`."""
+
+    def __init__(self, limit:int=64):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._posts:OrderedDict[str, ParsedPost] = OrderedDict()
+
+    def parse(self, filename:str, text:str) -> ParsedPost:
+        with self._lock:
+            parsed = self._posts.get(filename)
+            if parsed is not None and parsed.text == text:
+                self._posts.move_to_end(filename)
+                return parsed
+        fresh = ParsedPost(text, parsed)
+        with self._lock:
+            self._posts[filename] = fresh
+            self._posts.move_to_end(filename)
+            while len(self._posts) > self.limit:
+                self._posts.popitem(last=False)
+        return fresh
+
+    def forget(self, filename:str):
+        with self._lock:
+            self._posts.pop(filename, None)
+
+
+_POST_CACHES:ProcessRegistry[PostCache] = ProcessRegistry()
+
+
+def post_cache(content_dir:Path) -> PostCache:
+    """Process-wide parse cache for one content dir."""
+    return _POST_CACHES.get(content_dir, PostCache)
+
+
+def _copy_preview(row:dict) -> dict:
+    return {key: ({**val, 'tags': list(val.get('tags') or [])} if key == 'metadata' else val)
+            for key, val in row.items()}
+
+
+class PreviewCache:
+    """Sidebar rows for `PostService.list_preview`, rebuilt only when the library changed.
+
+    A rebuild is due when metadata.json changed (every mutator saves it, and so does an outside
+    rewrite) or a service reported a content write through `invalidate`. It re-renders rows from
+    the in-memory metadata and re-reads a note's file only when that note was invalidated or its
+    (filename, updated_at) moved, so an unchanged library costs no file reads at all.
+
+    Every row carries the version at which it last changed or moved position, so the rows changed
+    since a client's token are exactly those with a newer version. Tokens are `<epoch>-<version>`;
+    one minted by another process (or garbage) is answered with the full listing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._epoch = secrets.token_hex(4)
+        self._version = 0
+        self._stamp = None
+        self._fresh = False
+        self._dirty:set[str] = set()
+        self._order:list[str] = []
+        self._rows:dict[str, dict] = {}
+        self._versions:dict[str, int] = {}
+        self._notes:dict[str, tuple[tuple, str]] = {}    # post_id -> ((filename, updated_at), body)
+
+    @property
+    def token(self) -> str:
+        return f'{self._epoch}-{self._version}'
+
+    def invalidate(self, post_id:str|None=None):
+        """Mark one post's content as rewritten, or (no id) drop everything, note bodies included."""
+        with self._lock:
+            if post_id is None:
+                self._fresh = False
+                self._notes.clear()
+            else:
+                self._dirty.add(post_id)
+
+    def listing(self, store:MetadataStore, render, read_content, limit:int,
+                since:str|None=None) -> tuple[list[dict], list[str], str, bool]:
+        """`(items, order, token, is_delta)` for the first `limit` rows. With a valid `since`
+        token, `items` holds only the rows changed after it and `order` lists the current window."""
+        with self._lock:
+            self._rebuild(store, render, read_content)
+            window = self._order[:limit]
+            base = self._since(since)
+            if base is None:
+                return [_copy_preview(self._rows[post_id]) for post_id in window], window, self.token, False
+            changed = [_copy_preview(self._rows[post_id]) for post_id in window
+                       if self._versions[post_id] > base]
+            return changed, window, self.token, True
+
+    def _since(self, token:str|None) -> int | None:
+        epoch, _, version = (token or '').partition('-')
+        if epoch != self._epoch or not version.isdigit() or int(version) > self._version:
+            return None
+        return int(version)
+
+    def _rebuild(self, store:MetadataStore, render, read_content):
+        stamp = store.stamp()
+        if self._fresh and stamp == self._stamp and not self._dirty:
+            return
+        entries = store.entries()
+        version = self._version + 1
+        changed = False
+        order, rows = [], {}
+        for pos, ent in enumerate(entries):
+            post_id = ent['post_id']
+            row = render(ent)
+            if ent.get('status') == 'note':
+                key = (ent['filename'], ent.get('updated_at'))
+                note = self._notes.get(post_id)
+                if note is None or note[0] != key or post_id in self._dirty:
+                    note = self._notes[post_id] = (key, read_content(ent['filename']))
+                row['content'] = note[1]
+            order.append(post_id)
+            rows[post_id] = row
+            moved = pos >= len(self._order) or self._order[pos] != post_id
+            if moved or self._rows.get(post_id) != row:
+                self._versions[post_id] = version
+                changed = True
+        for post_id in set(self._rows) - set(rows):
+            self._versions.pop(post_id, None)
+            self._notes.pop(post_id, None)
+            changed = True
+        if changed:
+            self._version = version
+        self._order, self._rows, self._stamp = order, rows, stamp
+        self._fresh = True
+        self._dirty.clear()
+
+
+_PREVIEW_CACHES:ProcessRegistry[PreviewCache] = ProcessRegistry()
+
+
+def preview_cache(metadata_file:Path) -> PreviewCache:
+    """Process-wide sidebar cache for one library. Routers build a fresh PostService per request,
+    so the cache has to outlive the service."""
+    return _PREVIEW_CACHES.get(metadata_file, PreviewCache)
+
+
 class ToolService:
 
     def __init__(self):
         self._content_dir = _DB_DIR / 'content'
         self._metadata_file = _DB_DIR / 'content' / 'metadata.json'
+        self._index_file = _DB_DIR / 'content' / '.search_index.db'
         self._snap_root = _DB_DIR / '.snapshots'
         self._guides_dir = _DB_DIR / 'guides'
         self.max_snapshots = 8
@@ -109,18 +472,53 @@ class ToolService:
     def _now() -> str:
         return datetime.now(timezone.utc).isoformat()
 
+    @property
+    def _store(self) -> MetadataStore:
+        return metadata_store(self._metadata_file)
+
+    @property
+    def _index(self) -> SearchIndex:
+        return search_index(self._index_file)
+
+    @property
+    def _posts(self) -> PostCache:
+        return post_cache(self._content_dir)
+
+    @property
+    def _previews(self) -> PreviewCache:
+        return preview_cache(self._metadata_file)
+
+    @property
+    def _references(self) -> ReferenceCache:
+        return reference_cache(self._content_dir.parent)
+
     def _load_metadata(self) -> list[dict]:
-        if self._metadata_file.exists():
-            data = json.loads(self._metadata_file.read_text(encoding='utf-8'))
-            return data.get('entries', [])
-        return []
+        return self._store.entries()
 
     def _save_metadata(self, entries:list[dict]):
-        self._content_dir.mkdir(parents=True, exist_ok=True)
-        # Atomic write (temp + rename): a reader can never observe a half-written file.
-        tmp = self._metadata_file.with_suffix('.json.tmp')
-        tmp.write_text(json.dumps({'entries': entries}, indent=2, default=str), encoding='utf-8')
-        tmp.replace(self._metadata_file)
+        self._store.save(entries)
+        self._index.sync(entries, self._read_content)
+
+    def _get_entry(self, post_id:str) -> dict | None:
+        """Index lookup for read-only callers — no full-list copy."""
+        return self._store.get(post_id)
+
+    def _save_entry(self, entry:dict):
+        """Row-level upsert of a single entry."""
+        self._store.put(entry)
+        self._index.update(entry, self._read_content(entry['filename']))
+
+    def _remove_entry(self, post_id:str) -> dict | None:
+        """Row-level delete. Returns the removed entry, or None when the id is unknown."""
+        self._index.remove(post_id)
+        return self._store.remove(post_id)
+
+    def _search_index(self, query:str) -> list[str] | None:
+        """Ranked candidate post_ids for a query (see `SearchIndex.search`). Refreshes the index
+        first, which only copies metadata when its version moved or the rescan window passed."""
+        index = self._index
+        index.refresh(self._store.stamp(), self._load_metadata, self._read_content)
+        return index.search(query)
 
     @staticmethod
     def _find_entry(entries:list[dict], post_id:str) -> dict | None:
@@ -133,6 +531,10 @@ class ToolService:
         """Load metadata and locate the entry, raising `PostNotFoundError` if missing. Returns
         `(entry, entries)` — write callers mutate both, read-only callers can discard `entries` with `_`."""
         entries = self._load_metadata()
+        pos = self._store.position(post_id)
+        if pos is not None and pos < len(entries) and entries[pos]['post_id'] == post_id:
+            return entries[pos], entries
+        # A concurrent save can shift positions between the two reads — fall back to a scan.
         for ent in entries:
             if ent['post_id'] == post_id:
                 return ent, entries
@@ -145,15 +547,22 @@ class ToolService:
         filepath = self._content_dir / filename
         if not filepath.exists():
             return ''
-        text = filepath.read_text(encoding='utf-8')
+        return self._strip_frontmatter(filepath.read_text(encoding='utf-8'))
+
+    def _parsed(self, filename:str) -> ParsedPost:
+        """The post body parsed into sections and snips, reused while the file's body is unchanged."""
+        return self._posts.parse(filename, self._read_content(filename))
+
+    @staticmethod
+    def _strip_frontmatter(text:str) -> str:
         if text.startswith('---'):
             end = text.find('---', 3)
             if end != -1:
                 return text[end + 3:].strip()
         return text
 
-    def _write_content(self, filename:str, frontmatter:dict, body:str):
-        """Write .md file with YAML frontmatter."""
+    def _write_content(self, filename:str, frontmatter:dict, body:str) -> str:
+        """Write .md file with YAML frontmatter. Returns the full text written."""
         filepath = self._content_dir / filename
         filepath.parent.mkdir(parents=True, exist_ok=True)
         lines = ['---']
@@ -165,7 +574,9 @@ class ToolService:
         lines.append('---')
         lines.append('')
         lines.append(body)
-        filepath.write_text('\n'.join(lines), encoding='utf-8')
+        text = '\n'.join(lines)
+        filepath.write_text(text, encoding='utf-8')
+        return text
 
     @staticmethod
     def _compute_preview(body:str, max_len:int=300) -> str:
@@ -189,20 +600,19 @@ class ToolService:
 
     @staticmethod
     def _extract_sections(content:str) -> list[dict]:
-        """Parse content into section dicts with sec_id, title, and body lines."""
+        """Parse content into section dicts with sec_id, title, and body lines. Anything before the
+        first `## ` heading is dropped. Headings are found in one regex scan and each body is
+        sliced out whole instead of walking the post line by line."""
         sections = []
-        current = None
-        for line in content.split('\n'):
-            if line.startswith('## '):
-                if current:
-                    sections.append(current)
-                title = line[3:].strip()
-                sec_id = ToolService._slugify(title)
-                current = {'sec_id': sec_id, 'title': title, 'lines': []}
-            elif current is not None:
-                current['lines'].append(line)
-        if current:
-            sections.append(current)
+        starts = [match.start() for match in _SECTION_HEADING.finditer(content)]
+        for idx, start in enumerate(starts):
+            end = starts[idx + 1] - 1 if idx + 1 < len(starts) else len(content)
+            eol = content.find('\n', start, end)
+            if eol == -1:
+                eol = end
+            title = content[start + 3:eol].strip()
+            lines = content[eol + 1:end].split('\n') if eol < end else []
+            sections.append({'sec_id': ToolService._slugify(title), 'title': title, 'lines': lines})
         return sections
 
     @staticmethod
@@ -233,6 +643,7 @@ class ToolService:
         body = self._rebuild_content(sections)
         self._validate_outline(body)
         if entry.get('status') == 'note':
+            written = body
             (self._content_dir / entry['filename']).write_text(body, encoding='utf-8')
         else:
             fm = {'title': entry['title']}
@@ -240,9 +651,17 @@ class ToolService:
                 fm['tags'] = entry['tags']
             if entry.get('color'):
                 fm['color'] = entry['color']
-            self._write_content(entry['filename'], fm, body)
+            written = self._write_content(entry['filename'], fm, body)
+        # Parse the new version now, while the unchanged sections' snips can be carried over, so
+        # the next read of this post is a cache hit.
+        parsed = self._posts.parse(entry['filename'], self._strip_frontmatter(written))
+        self._previews.invalidate(entry['post_id'])
+        self._references.forget(entry['post_id'])
         entry['preview'] = self._compute_preview(body)
-        entry['word_count'] = len(re.sub(r'<[^>]+>', '', body).split())
+        if body.startswith(parsed.text):
+            entry['word_count'] = parsed.word_count
+        else:
+            entry['word_count'] = len(_HTML_TAG.sub('', body).split())
         entry['updated_at'] = self._now()
 
     @staticmethod
@@ -327,62 +746,31 @@ class ToolService:
         return f'notes/{base_slug}-{num}.md'
 
     # -- Snapshot helpers ---------------------------------------------------
-    # Snapshot files at `_snap_root/snap_<n>.json` carry the pre-state of a single mutating
-    # event. Filesystem-as-FIFO: take_snapshot writes a new file, GC keeps only the
+    # Each snapshot carries the pre-state of a single mutating event; `snapshot_store` keeps them
+    # indexed (manifest.json) and delta-encoded under `_snap_root`. The store keeps only the
     # `max_snapshots` most recent. Cross-post boundary fires at write-time — switching post
-    # and then mutating clears prior snapshots. Payload shape:
-    # `{post_id, turn_id, flow_name, summary, content: [{sec_id, content}, ...]}`.
+    # and then mutating clears prior snapshots. Bundle shape (as read back):
+    # `{post_id, turn_id, flow_name, summary, content: [{sec_id, lines}, ...]}`.
+
+    @property
+    def _snapshots(self) -> SnapshotStore:
+        return snapshot_store(self._snap_root)
 
     def take_snapshot(self, post_id:str, turn_id:int, flow_name:str,
                       summary:str, sections:list[dict]) -> str:
         """Persist a snapshot bundle. Returns the new snapshot_id."""
-        self._snap_root.mkdir(parents=True, exist_ok=True)
-        existing = self._snapshot_files()
-        if existing:
-            prev = json.loads(existing[0].read_text(encoding='utf-8'))
-            if prev['post_id'] != post_id:
-                for stale in existing:
-                    stale.unlink()
-                existing = []
-
-        next_id = max((self._parse_id(p) for p in existing), default=0) + 1
-        snapshot_id = f'snap_{next_id}'
-        payload = {
-            'post_id': post_id,
-            'turn_id': turn_id,
-            'flow_name': flow_name,
-            'summary': summary,
-            'content': sections,
-        }
-        (self._snap_root / f'{snapshot_id}.json').write_text(
-            json.dumps(payload, indent=2), encoding='utf-8')
-        self._gc_snapshots()
-        return snapshot_id
+        return self._snapshots.take(post_id, turn_id, flow_name, summary, sections,
+                                    keep=self.max_snapshots)
 
     def read_snapshot(self, snapshot_id:str) -> dict | None:
-        path = self._snap_root / f'{snapshot_id}.json'
-        if not path.exists():
-            return None
-        return json.loads(path.read_text(encoding='utf-8'))
+        return self._snapshots.read(snapshot_id)
 
     def list_snapshots(self) -> list[str]:
         """Return snapshot_ids sorted most-recent-first."""
-        return [p.stem for p in self._snapshot_files()]
+        return self._snapshots.ids()
 
-    @staticmethod
-    def _parse_id(path:Path) -> int:
-        return int(path.stem.split('_')[1])
-
-    def _snapshot_files(self) -> list[Path]:
-        """Existing snapshot files, sorted most-recent-first by parsed integer id."""
-        if not self._snap_root.exists():
-            return []
-        return sorted(self._snap_root.glob('snap_*.json'),
-                      key=self._parse_id, reverse=True)
-
-    def _gc_snapshots(self):
-        for stale in self._snapshot_files()[self.max_snapshots:]:
-            stale.unlink()
+    def clear_snapshots(self):
+        self._snapshots.clear()
 
 
 # ── Re-exports (so pex.py import doesn't change) ─────────────────────
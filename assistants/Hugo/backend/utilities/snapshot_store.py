@@ -0,0 +1,232 @@
+"""Indexed, delta-encoded store for the post snapshots behind rollback_post and diff_section.
+
+`.snapshots/manifest.json` indexes every snapshot by id, post_id and sequence number, so listing,
+GC and delete-cleanup read the manifest instead of globbing and parsing every bundle. Bundles stay
+one file each (`snap_<seq>.json`, always carrying their post_id), but only the newest snapshot of a
+post holds full section lines: taking a new one rewrites the previous newest as a reverse delta —
+per section, line runs copied from the same section of the next newer snapshot plus the lines that
+differ. Rollback to the latest state reads one file; an older one replays the chain down to it.
+Nothing depends on the oldest snapshot, so GC drops files without rewriting any, and deleting a
+post touches only that post's snapshots.
+
+The manifest follows the `MetadataStore` rules: parsed once per file version (inode, mtime, size),
+written by temp + rename. A snapshots dir without one (written before it existed) is indexed from
+its bundles on first use.
+"""
+from __future__ import annotations
+
+import difflib
+import json
+import threading
+from pathlib import Path
+
+from backend.utilities.process_registry import ProcessRegistry
+
+
+class SnapshotStore:
+
+    def __init__(self, root:Path):
+        self.root = root
+        self._manifest = root / 'manifest.json'
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._rows:list[dict] = []                 # oldest first
+        self._by_id:dict[str, dict] = {}
+        self._by_post:dict[str, list[str]] = {}    # post_id -> snapshot ids, oldest first
+        self._next_seq = 1
+
+    # -- Reads --------------------------------------------------------------
+
+    def ids(self) -> list[str]:
+        """Snapshot ids, most recent first."""
+        with self._lock:
+            self._refresh()
+            return [row['snapshot_id'] for row in reversed(self._rows)]
+
+    def for_post(self, post_id:str) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return list(reversed(self._by_post.get(post_id, [])))
+
+    def read(self, snapshot_id:str) -> dict | None:
+        """The full bundle: `{post_id, turn_id, flow_name, summary, content}`."""
+        with self._lock:
+            self._refresh()
+            if snapshot_id not in self._by_id:
+                return None
+            chain = []
+            try:
+                bundle = self._load(snapshot_id)
+                while 'base' in bundle:          # walk newer until a full copy
+                    chain.append(bundle)
+                    bundle = self._load(bundle['base'])
+            except FileNotFoundError:
+                return None
+            content = bundle['content']
+            for delta in reversed(chain):
+                content = _decode(delta['delta'], content)
+            head = chain[0] if chain else bundle
+            return {'post_id': head['post_id'], 'turn_id': head['turn_id'],
+                    'flow_name': head['flow_name'], 'summary': head['summary'], 'content': content}
+
+    def disk_bytes(self) -> int:
+        with self._lock:
+            self._refresh()
+            paths = [self._path(row['snapshot_id']) for row in self._rows] + [self._manifest]
+            return sum(path.stat().st_size for path in paths if path.exists())
+
+    # -- Writes -------------------------------------------------------------
+
+    def take(self, post_id:str, turn_id:int, flow_name:str, summary:str,
+             sections:list[dict], keep:int) -> str:
+        """Store a new newest snapshot and return its id. A snapshot of a different post than the
+        newest clears the store first (the cross-post boundary); past `keep`, the oldest go."""
+        with self._lock:
+            self._refresh()
+            self.root.mkdir(parents=True, exist_ok=True)
+            if self._rows and self._rows[-1]['post_id'] != post_id:
+                self._drop([row['snapshot_id'] for row in self._rows])
+            snapshot_id = f'snap_{self._next_seq}'
+            self._next_seq += 1
+            meta = {'post_id': post_id, 'turn_id': turn_id, 'flow_name': flow_name, 'summary': summary}
+            self._dump(snapshot_id, {**meta, 'content': sections})
+            previous = self._by_post.get(post_id, [])
+            if previous:
+                older = self._load(previous[-1])
+                delta = {key: older[key] for key in ('post_id', 'turn_id', 'flow_name', 'summary')}
+                self._dump(previous[-1], {**delta, 'base': snapshot_id,
+                                          'delta': _encode(older['content'], sections)})
+                self._by_id[previous[-1]]['base'] = snapshot_id
+            row = {'snapshot_id': snapshot_id, **meta, 'base': None}
+            self._rows.append(row)
+            self._by_id[snapshot_id] = row
+            self._by_post.setdefault(post_id, []).append(snapshot_id)
+            if len(self._rows) > keep:
+                self._drop([row['snapshot_id'] for row in self._rows[:len(self._rows) - keep]])
+            self._persist()
+            return snapshot_id
+
+    def remove_post(self, post_id:str) -> int:
+        """Drop every snapshot of one post; returns how many went."""
+        with self._lock:
+            self._refresh()
+            doomed = self._by_post.get(post_id, [])
+            if doomed:
+                self._drop(list(doomed))
+                self._persist()
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            for path in self.root.glob('snap_*.json'):
+                path.unlink()
+            self._manifest.unlink(missing_ok=True)
+            self._stamp = None
+            self._index([], self._next_seq)
+
+    # -- Internals ----------------------------------------------------------
+
+    def _drop(self, snapshot_ids:list[str]):
+        """Remove snapshots that no surviving one is based on: the oldest of a post, or all of it."""
+        doomed = set(snapshot_ids)
+        for snapshot_id in snapshot_ids:
+            self._path(snapshot_id).unlink(missing_ok=True)
+        self._index([row for row in self._rows if row['snapshot_id'] not in doomed], self._next_seq)
+
+    def _index(self, rows:list[dict], next_seq:int):
+        self._rows, self._next_seq = rows, next_seq
+        self._by_id = {row['snapshot_id']: row for row in rows}
+        self._by_post = {}
+        for row in rows:
+            self._by_post.setdefault(row['post_id'], []).append(row['snapshot_id'])
+
+    def _file_stamp(self) -> tuple | None:
+        try:
+            stat = self._manifest.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        stamp = self._file_stamp()
+        if stamp is None:
+            self._adopt_files()
+            return
+        if stamp != self._stamp:
+            data = json.loads(self._manifest.read_text(encoding='utf-8'))
+            self._index(data['snapshots'], data['next_seq'])
+            self._stamp = stamp
+
+    def _adopt_files(self):
+        """No manifest (a dir from before it existed, or one lost): index the bundles themselves,
+        oldest first by id, and write the manifest so this scan happens once."""
+        paths = sorted(self.root.glob('snap_*.json'), key=lambda path: int(path.stem.split('_')[1]))
+        rows = []
+        for path in paths:
+            bundle = json.loads(path.read_text(encoding='utf-8'))
+            rows.append({'snapshot_id': path.stem, 'post_id': bundle['post_id'],
+                         'turn_id': bundle['turn_id'], 'flow_name': bundle['flow_name'],
+                         'summary': bundle['summary'], 'base': bundle.get('base')})
+        next_seq = int(paths[-1].stem.split('_')[1]) + 1 if paths else 1
+        self._index(rows, max(next_seq, self._next_seq))
+        if self.root.exists():
+            self._persist()
+
+    def _persist(self):
+        tmp = self._manifest.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps({'next_seq': self._next_seq, 'snapshots': self._rows}),
+                       encoding='utf-8')
+        tmp.replace(self._manifest)
+        self._stamp = self._file_stamp()
+
+    def _path(self, snapshot_id:str) -> Path:
+        return self.root / f'{snapshot_id}.json'
+
+    def _load(self, snapshot_id:str) -> dict:
+        return json.loads(self._path(snapshot_id).read_text(encoding='utf-8'))
+
+    def _dump(self, snapshot_id:str, bundle:dict):
+        self._path(snapshot_id).write_text(json.dumps(bundle), encoding='utf-8')
+
+
+def _encode(sections:list[dict], newer:list[dict]) -> list[dict]:
+    """Sections as deltas against the same sec_id in the newer snapshot (full lines when it has none).
+    An op is `[start, end]` — copy those newer lines — or `{'+': lines}`."""
+    newer_lines = {sec['sec_id']: sec['lines'] for sec in newer}
+    encoded = []
+    for sec in sections:
+        base = newer_lines.get(sec['sec_id'])
+        if base is None:
+            encoded.append(sec)
+            continue
+        ops = []
+        matcher = difflib.SequenceMatcher(None, base, sec['lines'], autojunk=False)
+        for tag, start, end, own_start, own_end in matcher.get_opcodes():
+            if tag == 'equal':
+                ops.append([start, end])
+            elif own_end > own_start:
+                ops.append({'+': sec['lines'][own_start:own_end]})
+        encoded.append({**{key: val for key, val in sec.items() if key != 'lines'}, 'ops': ops})
+    return encoded
+
+
+def _decode(encoded:list[dict], newer:list[dict]) -> list[dict]:
+    newer_lines = {sec['sec_id']: sec['lines'] for sec in newer}
+    sections = []
+    for sec in encoded:
+        if 'ops' not in sec:
+            sections.append(sec)
+            continue
+        base, lines = newer_lines[sec['sec_id']], []
+        for op in sec['ops']:
+            lines.extend(op['+'] if isinstance(op, dict) else base[op[0]:op[1]])
+        sections.append({**{key: val for key, val in sec.items() if key != 'ops'}, 'lines': lines})
+    return sections
+
+
+_STORES:ProcessRegistry[SnapshotStore] = ProcessRegistry()
+
+
+def snapshot_store(root:Path) -> SnapshotStore:
+    """Process-wide store for one snapshots dir."""
+    return _STORES.get(root, lambda: SnapshotStore(root))
@@ -0,0 +1,137 @@
+"""Single-pass text statistics shared by AnalysisService's inspect, readability, style and SEO tools.
+
+`TextStats(text)` walks the text once: one loop over its lines collects the words, paragraph
+lengths and headings, and every tool reads its metrics off the same object. Syllables are counted
+once per distinct word through a process-wide memo, instead of twice per word occurrence.
+
+`text_stats` keeps the most recent objects keyed by the text itself, so the same content — a post
+inspected and then scored, or a reference post compared again — is never re-measured. A changed
+post is a different key, so a cached object can never be stale.
+"""
+from __future__ import annotations
+
+import functools
+import re
+import threading
+from collections import Counter, OrderedDict
+
+_HTML_TAG = re.compile(r'<[^>]+>')
+_SENTENCE_BREAK = re.compile(r'[.!?]+')
+_IMAGE_LINE = re.compile(r'^.*?!\[.*?\]\(.*?\)', re.MULTILINE)   # one match per line at most
+_LINK_LINE = re.compile(r'^.*?\[.*?\]\(.*?\)', re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def syllable_count(word:str) -> int:
+    """Vowel-group count after trimming a trailing -es / -ed, at least 1."""
+    cleaned = word.lower().rstrip('es').rstrip('ed')
+    vowels = 'aeiou'
+    count = 0
+    prev_vowel = False
+    for ch in cleaned:
+        is_vowel = ch in vowels
+        if is_vowel and not prev_vowel:
+            count += 1
+        prev_vowel = is_vowel
+    return max(count, 1)
+
+
+class TextStats:
+
+    def __init__(self, text:str):
+        self.text = text
+        words:list[str] = []
+        paragraphs:list[int] = []
+        self.headings:list[str] = []        # lines starting with '#'
+        self.heading_depth = 0
+        current = 0
+        for line in text.split('\n'):
+            parts = line.split()
+            if line.startswith('#'):
+                self.headings.append(line)
+                self.heading_depth = max(self.heading_depth, len(parts[0]) if parts else 0)
+            if parts:
+                words.extend(parts)
+                current += len(parts)
+            elif current:
+                paragraphs.append(current)
+                current = 0
+        if current:
+            paragraphs.append(current)
+
+        self.raw_word_count = len(words)
+        self.word_count = len(_HTML_TAG.sub('', text).split()) if '<' in text else len(words)
+        self.char_count = sum(map(len, words))
+        self.syllables = 0
+        self.complex_words = 0
+        for word, freq in Counter(words).items():
+            syllables = syllable_count(word)
+            self.syllables += syllables * freq
+            if syllables >= 3:
+                self.complex_words += freq
+        self.sentence_count = sum(1 for part in _SENTENCE_BREAK.split(text) if part.strip())
+        self.avg_paragraph_length = round(sum(paragraphs) / max(len(paragraphs), 1), 1)
+        self.image_count = len(_IMAGE_LINE.findall(text))
+        self.link_count = len(_LINK_LINE.findall(text))
+        self._lower:str|None = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def first_paragraph(self) -> str | None:
+        """First blank-line-separated block that is not a heading."""
+        for para in self.text.split('\n\n'):
+            para = para.strip()
+            if para and not para.startswith('#'):
+                return para
+        return None
+
+    def readability(self) -> dict:
+        """Flesch-Kincaid grade, Gunning Fog and the averages `check_readability` reports."""
+        sentence_count = self.sentence_count or 1
+        word_count = self.raw_word_count or 1
+
+        fk = 0.39 * (word_count / sentence_count) + 11.8 * (self.syllables / word_count) - 15.59
+        fk = round(max(0, fk), 1)
+        fog = 0.4 * ((word_count / sentence_count) + 100 * (self.complex_words / word_count))
+        fog = round(max(0, fog), 1)
+
+        if fk <= 6:
+            label = 'easy'
+        elif fk <= 10:
+            label = 'moderate'
+        elif fk <= 14:
+            label = 'advanced'
+        else:
+            label = 'difficult'
+
+        return {
+            'flesch_kincaid_grade': fk, 'gunning_fog': fog,
+            'avg_sentence_length': round(word_count / sentence_count, 1),
+            'avg_word_length': round(self.char_count / word_count, 1),
+            'sentence_count': sentence_count, 'score_label': label,
+        }
+
+
+_STATS:OrderedDict[str, TextStats] = OrderedDict()
+_STATS_LOCK = threading.Lock()
+_STATS_LIMIT = 256
+
+
+def text_stats(text:str) -> TextStats:
+    """Shared, memoized `TextStats` for a text; least recently used evicted past the limit."""
+    with _STATS_LOCK:
+        stats = _STATS.get(text)
+        if stats is not None:
+            _STATS.move_to_end(text)
+            return stats
+    stats = TextStats(text)
+    with _STATS_LOCK:
+        _STATS[text] = stats
+        while len(_STATS) > _STATS_LIMIT:
+            _STATS.popitem(last=False)
+    return stats
@@ -0,0 +1,179 @@
+"""Pooled transport for the TypeSafe System-1 endpoint behind `PromptEngineer.typesafe`.
+
+One long-lived httpx client per endpoint keeps connections alive between calls, so a
+classification pays the TLS handshake once per process rather than once per turn. `ask` is the
+blocking call and `aask` its asyncio twin (one AsyncClient per running event loop, since a client's
+pool is bound to the loop that opened it).
+
+Identical requests share one round trip. A request is keyed by its document and questions; a caller
+that arrives while the same request is in flight waits on it, and one that arrives within
+`share_s` of a successful answer reuses that answer. Within a turn the document is the same history
+and utterance, so `classify_intent` from `take_turn` and again from `NLU.think` costs one request;
+the next turn's history changes the key. Failures are never kept — only callers already waiting on
+the failed request see the error. Answers older than `share_s` are dropped as each request
+settles. Every caller, the one that sent the request included, gets its own copy of the answers.
+Every network request is timed; `stats` reports the counts and latencies.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+
+import httpx
+
+from backend.utilities.process_registry import ProcessRegistry
+
+log = logging.getLogger(__name__)
+
+_API_KEY_ENV = 'TYPESAFE_API_KEY'
+
+
+class TypeSafeClient:
+
+    def __init__(self, endpoint:str, model:str, timeout:float=30.0, share_s:float=60.0,
+                 max_connections:int=8, transport=None):
+        self.endpoint = endpoint
+        self.model = model
+        self.share_s = share_s
+        self._timeout = httpx.Timeout(timeout, connect=5.0)
+        self._limits = httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections, keepalive_expiry=120.0)
+        self._transport = transport              # tests inject an httpx.MockTransport
+        self._lock = threading.Lock()
+        self._client = None
+        self._async_clients:weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._flights:dict[str, list] = {}       # key -> [future, answered_at or None in flight]
+        self._timings:deque = deque(maxlen=256)
+        self.requests = 0
+        self.shared = 0
+
+    # -- Public -------------------------------------------------------------
+
+    def ask(self, document:dict, questions:dict) -> dict:
+        """The `answers` for one request. Raises on a missing key or a failed request."""
+        headers = self._headers()
+        key, payload = self._request(document, questions)
+        future, leader = self._claim(key)
+        if not leader:
+            return copy.deepcopy(future.result())
+        start = time.perf_counter()
+        try:
+            resp = self._sync_client().post(self.endpoint, json=payload, headers=headers)
+            resp.raise_for_status()
+            answers = resp.json()['answers']
+        except BaseException as ecp:
+            self._settle(key, future, start, error=ecp)
+            raise
+        self._settle(key, future, start, answers=answers)
+        return copy.deepcopy(answers)       # followers copy from the future; the leader must too
+
+    async def aask(self, document:dict, questions:dict) -> dict:
+        """Async `ask`. Shares in-flight requests with sync callers and vice versa."""
+        headers = self._headers()
+        key, payload = self._request(document, questions)
+        future, leader = self._claim(key)
+        if not leader:
+            return copy.deepcopy(await asyncio.wrap_future(future))
+        start = time.perf_counter()
+        try:
+            resp = await self._async_client().post(self.endpoint, json=payload, headers=headers)
+            resp.raise_for_status()
+            answers = resp.json()['answers']
+        except BaseException as ecp:
+            self._settle(key, future, start, error=ecp)
+            raise
+        self._settle(key, future, start, answers=answers)
+        return copy.deepcopy(answers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            timings = list(self._timings)
+        return {'requests': self.requests, 'shared': self.shared,
+                'last_ms': round(timings[-1], 1) if timings else None,
+                'mean_ms': round(sum(timings) / len(timings), 1) if timings else None}
+
+    def close(self):
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    # -- Single flight ------------------------------------------------------
+
+    def _request(self, document:dict, questions:dict) -> tuple[str, dict]:
+        payload = {'document': document, 'model': self.model, 'questions': questions}
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest(), payload
+
+    def _claim(self, key:str) -> tuple[Future, bool]:
+        """The future to wait on, and whether this caller must send the request itself."""
+        now = time.monotonic()
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and (flight[1] is None or now - flight[1] <= self.share_s):
+                self.shared += 1
+                return flight[0], False
+            future = Future()
+            self._flights[key] = [future, None]
+            return future, True
+
+    def _settle(self, key:str, future:Future, start:float, answers=None, error=None):
+        elapsed = (time.perf_counter() - start) * 1000
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self._timings.append(elapsed)
+            if error is None and self.share_s > 0:
+                self._flights[key][1] = now
+            else:
+                self._flights.pop(key, None)
+            for stale in [k for k, (_, done) in self._flights.items()
+                          if done is not None and now - done > self.share_s]:
+                del self._flights[stale]
+        log.info('  typesafe ms=%.0f ok=%s', elapsed, error is None)
+        if error is None:
+            future.set_result(answers)
+        else:
+            future.set_exception(error)
+
+    # -- Transport ----------------------------------------------------------
+
+    @staticmethod
+    def _headers() -> dict:
+        key = os.getenv(_API_KEY_ENV)
+        if not key:
+            raise RuntimeError(f'{_API_KEY_ENV} not set. Add it to .env or environment.')
+        return {'Authorization': f'Bearer {key}', 'Content-Type': 'application/json'}
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self._timeout, limits=self._limits,
+                                            transport=self._transport)
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    timeout=self._timeout, limits=self._limits, transport=self._transport)
+            return client
+
+
+_CLIENTS:ProcessRegistry[TypeSafeClient] = ProcessRegistry()
+
+
+def typesafe_client(endpoint:str, model:str) -> TypeSafeClient:
+    """Process-wide client per (endpoint, model)."""
+    return _CLIENTS.get((endpoint, model), lambda: TypeSafeClient(endpoint, model))
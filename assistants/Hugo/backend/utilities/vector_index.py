@@ -0,0 +1,87 @@
+"""Persistent embedding index for business-knowledge retrieval (`BusinessKnowledge._candidates`).
+
+Vectors come from the shared offline model in `embeddings` (MiniLM unless the config names another)
+and live in one SQLite file keyed by a SHA-256 of the embedded text plus the model name. `sync` is incremental: only texts whose key is not
+stored yet get embedded, and keys no longer in the corpus are dropped — so editing one FAQ costs one
+embedding, and a restart costs none. Vectors are L2-normalized, so scoring a query is a dot product
+per document; vectors are kept in memory as float arrays after the first load. The file is created
+by the first successful embedding, so a missing model leaves nothing on disk.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+
+from backend.utilities import embeddings
+
+
+def text_key(text:str, model_name:str=embeddings.MODEL_NAME) -> str:
+    return hashlib.sha256(f'{model_name}\n{text}'.encode('utf-8')).hexdigest()
+
+
+class VectorIndex:
+
+    def __init__(self, path:Path|None, model_name:str|None=None):
+        self.path = path
+        self.model_name = model_name or embeddings.MODEL_NAME
+        self._lock = threading.RLock()
+        self._conn = None
+        self._vectors:dict[str, array] | None = None
+        self.embedded = 0          # documents embedded by this instance (the incremental cost)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute('CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vector BLOB)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self) -> dict[str, array]:
+        if self._vectors is None:
+            self._vectors = {}
+            if self.path is not None and (self._conn is not None or self.path.exists()):
+                for key, blob in self._db().execute('SELECT key, vector FROM vectors'):
+                    self._vectors[key] = array('f', blob)
+        return self._vectors
+
+    def sync(self, texts:list[str]) -> list[str]:
+        """Bring the index in line with `texts` and return their keys, position for position."""
+        keys = [text_key(text, self.model_name) for text in texts]
+        with self._lock:
+            vectors = self._load()
+            missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+            if missing:
+                rows = embeddings.embed(list(missing.values()), self.model_name)
+                added = {key: array('f', (float(val) for val in row))
+                         for key, row in zip(missing, rows)}
+                vectors.update(added)
+                self.embedded += len(added)
+                if self.path is not None:
+                    with self._db() as conn:
+                        conn.executemany('INSERT OR REPLACE INTO vectors (key, vector) VALUES (?, ?)',
+                                         [(key, vec.tobytes()) for key, vec in added.items()])
+            stale = set(vectors) - set(keys)
+            if stale:
+                for key in stale:
+                    del vectors[key]
+                if self.path is not None and self._conn is not None:
+                    with self._db() as conn:
+                        conn.executemany('DELETE FROM vectors WHERE key = ?', [(key,) for key in stale])
+        return keys
+
+    def search(self, query:str, keys:list[str], top_k:int, threshold:float=0.0) -> list[tuple[int, float]]:
+        """(position in `keys`, cosine score) for the `top_k` best documents scoring at least
+        `threshold`, best first. Call `sync` first so every key has a vector."""
+        probe = [float(val) for val in embeddings.embed(query, self.model_name)]
+        with self._lock:
+            vectors = self._load()
+            scored = [(pos, sum(q * d for q, d in zip(probe, vectors[key])))
+                      for pos, key in enumerate(keys)]
+        hits = [(pos, score) for pos, score in scored if score >= threshold]
+        hits.sort(key=lambda hit: hit[1], reverse=True)
+        return hits[:top_k]
@@ -0,0 +1,284 @@
+"""Web search behind `ContentService.web_search`: pooled backends, a persistent TTL cache and a
+concurrent batch path.
+
+A query is normalized (case-folded, whitespace collapsed) and keyed together with the backend and
+the result limit, so "Cheetah  speed" and "cheetah speed" share one entry. Entries live in a
+`ResponseCache` — the in-memory LRU plus SQLite file the LLM response cache uses — under the
+`web_search` task and expire after `ttl_s`, so a research flow that re-asks within a session, or
+the next process, skips the round trip. Failed searches are never cached.
+
+`TavilyBackend` keeps one httpx client per process, and one AsyncClient per running event loop
+(as `typesafe_client` does), so successive queries reuse a warm connection. `search_many` runs a
+batch on a bounded thread pool over the shared sync client and `asearch_many` gathers it on the
+caller's loop; both search each distinct normalized query once and keep the callers' order.
+
+`FakeSearchBackend` answers from a local corpus with an optional simulated latency. Set
+`HUGO_SEARCH_BACKEND=fake` to use it in place of Tavily, so tests and the benchmark run with no
+network and no API key.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from backend.utilities.process_registry import ProcessRegistry
+from backend.utilities.response_cache import ResponseCache, request_key
+
+_TAVILY_URL = 'https://api.tavily.com/search'
+_API_KEY_ENV = 'TAVILY_API_KEY'
+_BACKEND_ENV = 'HUGO_SEARCH_BACKEND'
+_TASK = 'web_search'
+_TTL_S = 6 * 3600
+_SNIPPET_CHARS = 200
+_TERM = re.compile(r'\w+')
+
+
+class SearchError(RuntimeError):
+    """A backend request failed. The message is safe to show to the user."""
+
+
+def normalize_query(query:str) -> str:
+    return ' '.join(query.casefold().split())
+
+
+def _item(res:dict) -> dict:
+    return {'title': res.get('title', ''), 'url': res.get('url', ''),
+            'snippet': (res.get('content') or '')[:_SNIPPET_CHARS]}
+
+
+# -- Backends ---------------------------------------------------------------
+
+class TavilyBackend:
+
+    name = 'tavily'
+
+    def __init__(self, api_key:str, timeout:float=15.0, max_connections:int=8, transport=None):
+        self._api_key = api_key
+        self._timeout = httpx.Timeout(timeout, connect=5.0)
+        self._limits = httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections, keepalive_expiry=120.0)
+        self._transport = transport              # tests inject an httpx.MockTransport
+        self._lock = threading.Lock()
+        self._client = None
+        self._async_clients:weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def search(self, query:str, limit:int) -> list[dict]:
+        try:
+            resp = self._sync_client().post(_TAVILY_URL, json=self._payload(query, limit))
+        except httpx.HTTPError as ecp:
+            raise SearchError(f'Web search failed: {ecp}') from ecp
+        return self._items(resp)
+
+    async def asearch(self, query:str, limit:int) -> list[dict]:
+        try:
+            resp = await self._async_client().post(_TAVILY_URL, json=self._payload(query, limit))
+        except httpx.HTTPError as ecp:
+            raise SearchError(f'Web search failed: {ecp}') from ecp
+        return self._items(resp)
+
+    def close(self):
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def _payload(self, query:str, limit:int) -> dict:
+        return {'api_key': self._api_key, 'query': query, 'max_results': limit}
+
+    @staticmethod
+    def _items(resp:httpx.Response) -> list[dict]:
+        if resp.status_code != 200:
+            raise SearchError(f'Tavily API returned {resp.status_code}')
+        try:
+            return [_item(res) for res in resp.json().get('results', [])]
+        except (ValueError, AttributeError, TypeError) as ecp:   # not JSON, or not the documented shape
+            raise SearchError(f'Web search failed: malformed response ({ecp})') from ecp
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self._timeout, limits=self._limits,
+                                            transport=self._transport)
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    timeout=self._timeout, limits=self._limits, transport=self._transport)
+            return client
+
+
+class FakeSearchBackend:
+    """Deterministic offline search. With a corpus of `{title, url, content}` documents, results are
+    the documents sharing the most terms with the query; without one, `limit` synthetic results
+    derived from the query. `latency_s` is slept per request to stand in for the network."""
+
+    name = 'fake'
+
+    def __init__(self, corpus:list[dict]|None=None, latency_s:float=0.0):
+        self.corpus = list(corpus or [])
+        self.latency_s = latency_s
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def search(self, query:str, limit:int) -> list[dict]:
+        self._count()
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._results(query, limit)
+
+    async def asearch(self, query:str, limit:int) -> list[dict]:
+        self._count()
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return self._results(query, limit)
+
+    def close(self):
+        pass
+
+    def _count(self):
+        with self._lock:
+            self.calls += 1
+
+    def _results(self, query:str, limit:int) -> list[dict]:
+        terms = set(_TERM.findall(query.lower()))
+        if not self.corpus:
+            slug = '-'.join(sorted(terms)) or 'empty'
+            return [_item({'title': f'{query} ({rank})', 'url': f'https://search.invalid/{slug}/{rank}',
+                           'content': f'Result {rank} for {query}.'}) for rank in range(1, limit + 1)]
+        scored = []
+        for idx, doc in enumerate(self.corpus):
+            words = set(_TERM.findall(f"{doc.get('title', '')} {doc.get('content', '')}".lower()))
+            overlap = len(terms & words)
+            if overlap:
+                scored.append((-overlap, idx, doc))
+        scored.sort(key=lambda row: row[:2])
+        return [_item(doc) for _, _, doc in scored[:limit]]
+
+
+# -- Cached client ----------------------------------------------------------
+
+class WebSearch:
+
+    def __init__(self, backend, cache:ResponseCache|None=None, max_concurrency:int=4):
+        self.backend = backend
+        self.cache = cache if cache is not None else ResponseCache(ttl_s={_TASK: _TTL_S})
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._pool:ThreadPoolExecutor|None = None
+        self.requests = 0
+
+    # -- Public -------------------------------------------------------------
+
+    def search(self, query:str, limit:int=5) -> list[dict]:
+        """Result items for one query. Raises SearchError when the backend fails."""
+        query, key = self._key(query, limit)
+        items = self._cached(key)
+        if items is None:
+            items = self._store(key, self.backend.search(query, limit))
+        return items
+
+    async def asearch(self, query:str, limit:int=5) -> list[dict]:
+        query, key = self._key(query, limit)
+        items = self._cached(key)
+        if items is None:
+            items = self._store(key, await self.backend.asearch(query, limit))
+        return items
+
+    def search_many(self, queries:list[str], limit:int=5) -> list[list[dict] | SearchError]:
+        """Results per query, in order, searched concurrently. A failed query yields its SearchError
+        in place of a list instead of failing the batch."""
+        distinct = list(dict.fromkeys(normalize_query(query) for query in queries))
+
+        def one(query:str):
+            try:
+                return self.search(query, limit)
+            except SearchError as ecp:
+                return ecp
+
+        found = dict(zip(distinct, self._executor().map(one, distinct)))
+        return [self._copy(found[normalize_query(query)]) for query in queries]
+
+    async def asearch_many(self, queries:list[str], limit:int=5) -> list[list[dict] | SearchError]:
+        distinct = list(dict.fromkeys(normalize_query(query) for query in queries))
+        gate = asyncio.Semaphore(self.max_concurrency)
+
+        async def one(query:str):
+            async with gate:
+                try:
+                    return await self.asearch(query, limit)
+                except SearchError as ecp:
+                    return ecp
+
+        found = dict(zip(distinct, await asyncio.gather(*(one(query) for query in distinct))))
+        return [self._copy(found[normalize_query(query)]) for query in queries]
+
+    def stats(self) -> dict:
+        return {'requests': self.requests, **self.cache.stats()}
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        self.backend.close()
+
+    # -- Cache --------------------------------------------------------------
+
+    def _key(self, query:str, limit:int) -> tuple[str, str]:
+        query = normalize_query(query)
+        return query, request_key(backend=self.backend.name, query=query, limit=limit)
+
+    def _cached(self, key:str) -> list[dict] | None:
+        payload = self.cache.get(key, _TASK)
+        return None if payload is None else json.loads(payload)
+
+    def _store(self, key:str, items:list[dict]) -> list[dict]:
+        with self._lock:
+            self.requests += 1
+        self.cache.put(key, _TASK, json.dumps(items))
+        return items
+
+    @staticmethod
+    def _copy(result):
+        """Duplicate queries in one batch must not share mutable item lists."""
+        return [dict(item) for item in result] if isinstance(result, list) else result
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix='web-search')
+            return self._pool
+
+
+_CLIENTS:ProcessRegistry[WebSearch] = ProcessRegistry()
+
+
+def web_search_client(cache_file:Path) -> WebSearch | None:
+    """Process-wide client for the backend the environment selects — the fake backend when
+    `HUGO_SEARCH_BACKEND=fake`, else Tavily when `TAVILY_API_KEY` is set, else None. Results persist
+    in `cache_file`."""
+    if os.getenv(_BACKEND_ENV, '').lower() == 'fake':
+        selection = ('fake', None)
+    elif os.getenv(_API_KEY_ENV):
+        selection = ('tavily', os.getenv(_API_KEY_ENV))
+    else:
+        return None
+
+    def build() -> WebSearch:
+        backend = FakeSearchBackend() if selection[0] == 'fake' else TavilyBackend(selection[1])
+        return WebSearch(backend, ResponseCache(cache_file, ttl_s={_TASK: _TTL_S}))
+    return _CLIENTS.get((cache_file, selection), build)
@@ -32,6 +32,8 @@ function createConversationStore() {
         username: '',
         connected: false,
         typing: false,
+        draft: '',              // reply text streamed so far this round
+        progress: [] as string[], // tools the agent is running this round
     });
 
     let ws: WebSocketManager | null = null;
@@ -43,6 +45,17 @@ function createConversationStore() {
             return;
         }
 
+        // Stream events arrive before the turn's final payload: deltas grow the draft reply,
+        // a progress event means the round turned into tool calls, so its draft was not the reply.
+        if (data.stream === 'delta') {
+            update((s) => ({ ...s, draft: s.draft + ((data.text as string) || '') }));
+            return;
+        }
+        if (data.stream === 'progress') {
+            update((s) => ({ ...s, draft: '', progress: (data.tools as string[]) || [] }));
+            return;
+        }
+
         const artifact = data.artifact as Record<string, unknown> | null;
         if (artifact) {
             // Phase-2 logging: rich artifact snapshot to diff against the
@@ -77,13 +90,15 @@ function createConversationStore() {
             ...s,
             messages: [...s.messages, msg],
             typing: false,
+            draft: '',
+            progress: [],
         }));
     }
 
     function onStatus(status: string, detail?: string) {
         console.log(`[WS] ${status}${detail ? ': ' + detail : ''}`);
         if (status === 'disconnected' || status === 'error') {
-            update((s) => ({ ...s, connected: false, typing: false }));
+            update((s) => ({ ...s, connected: false, typing: false, draft: '', progress: [] }));
         }
     }
 
@@ -190,7 +205,7 @@ function createConversationStore() {
         reset() {
             if (!ws?.connected) return;
             ws.send({ reset: true });
-            update((s) => ({ ...s, messages: [], typing: false }));
+            update((s) => ({ ...s, messages: [], typing: false, draft: '', progress: [] }));
         },
 
         disconnect() {
@@ -203,6 +218,8 @@ function createConversationStore() {
                 username: '',
                 connected: false,
                 typing: false,
+                draft: '',
+                progress: [],
             }));
         },
     };
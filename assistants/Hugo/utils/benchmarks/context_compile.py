@@ -0,0 +1,74 @@
+"""Micro-benchmark: per-round cost of ContextCoordinator.compile_messages as a session grows.
+
+Each orchestrator round appends a user utterance, one tool round and an agent reply, then compiles
+the projection. The memoized path reuses the prior projection; the full path is what every round
+paid before (a cold coordinator over the same turns). Per-round time for the memoized path should
+stay flat while the full path grows with the turn count.
+
+Usage:
+    python utils/benchmarks/context_compile.py              # 600 rounds, report every 100
+    python utils/benchmarks/context_compile.py --rounds 2000 --every 250
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from backend.components.context_coordinator import ContextCoordinator
+
+_CONFIG = {'compaction': {'protect_tail': 20}}
+
+
+def _append_round(coordinator, idx:int):
+    coordinator.add_turn('user', {'text': f'user turn {idx}: ' + 'x' * 80})
+    coordinator.add_turn('agent', {'text': f'working on {idx}',
+        'tool_uses': [{'type': 'tool_use', 'id': f'toolu_{idx}', 'name': 'read_section',
+                       'input': {'turn': idx}}],
+        'tool_results': [{'type': 'tool_result', 'tool_use_id': f'toolu_{idx}',
+                          'content': json.dumps({'_success': True, 'content': 'y' * 600})}]},
+        turn_type='action')
+    coordinator.add_turn('agent', {'text': f'done with turn {idx}'})
+
+
+def _time(fn, repeat:int=5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(rounds:int, every:int):
+    coordinator = ContextCoordinator(_CONFIG)
+    print(f'{"turns":>7} {"memoized ms":>12} {"full ms":>9}')
+    for idx in range(1, rounds + 1):
+        _append_round(coordinator, idx)
+        coordinator.compile_messages()
+        if idx % every:
+            continue
+
+        def memoized():
+            _append_round(coordinator, -idx)
+            coordinator.compile_messages()
+
+        def full():
+            cold = ContextCoordinator(_CONFIG)
+            cold._history = list(coordinator._history)
+            cold.compile_messages()
+
+        print(f'{coordinator.turn_count:>7} {_time(memoized):>12.3f} {_time(full):>9.3f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=600)
+    parser.add_argument('--every', type=int, default=100)
+    args = parser.parse_args()
+    run(args.rounds, args.every)
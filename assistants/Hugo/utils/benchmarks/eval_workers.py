@@ -0,0 +1,52 @@
+"""Benchmark: Traces-tier wall time by worker count, offline against the deterministic fake model.
+
+Runs the same scenarios through `run_traces._score_corpus` once per worker count with `FakeLLM`
+sleeping `--delay-ms` per model call, so the wall-clock shape matches a live run that waits on the
+provider. Every count runs in sandboxed database/ copies (one worker is the sequential order, so the
+real database/ is never touched); each spawned worker pays the backend import once, so small
+scenario counts on few cores understate the gain.
+
+Usage:
+    python utils/benchmarks/eval_workers.py                          # 8 sampled ids, 1/2/4 workers
+    python utils/benchmarks/eval_workers.py --ids B01.C01,B01.C02 --workers 1,2 --delay-ms 800
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from utils.evaluation_suite.harness import enable_fake_llm, sample
+from utils.evaluation_suite._traces import run_traces
+
+
+def run(ids:list, worker_counts:list[int], delay_ms:float):
+    enable_fake_llm(delay_ms)
+    options = {'fake_llm_ms': delay_ms}
+    timings = []
+    with tempfile.TemporaryDirectory() as report_dir:
+        for workers in worker_counts:
+            report = Path(report_dir) / f'traces_w{workers}.jsonl'
+            start = time.perf_counter()
+            metrics = run_traces._score_corpus(ids, report, workers, options, sandbox=True)
+            timings.append((workers, time.perf_counter() - start, metrics['mean_turn_seconds']))
+    print(f'\n{len(ids)} scenarios, fake model at {delay_ms:.0f}ms/call')
+    print(f'{"workers":>8} {"wall s":>8} {"speedup":>8} {"mean turn s":>12}')
+    for workers, wall, turn in timings:
+        print(f'{workers:>8} {wall:>8.1f} {timings[0][1] / wall:>7.2f}x {turn:>12.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ids', default='', help='comma-separated convo_ids (default: a seeded sample)')
+    parser.add_argument('--sample', type=int, default=8)
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated worker counts')
+    parser.add_argument('--delay-ms', type=float, default=400.0, help='fake per-call model latency')
+    args = parser.parse_args()
+    ids = [cid.strip() for cid in args.ids.split(',') if cid.strip()] or sample(args.sample, seed=0)
+    run(ids, [int(count) for count in args.workers.split(',')], args.delay_ms)
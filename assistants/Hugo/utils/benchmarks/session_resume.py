@@ -0,0 +1,96 @@
+"""Micro-benchmark: reopening a long session from its binary checkpoint vs the JSONL logs.
+
+Records a session of `--turns` orchestrator rounds (user utterance, one tool round, agent reply)
+plus a scratchpad entry per round into a temporary sessions dir, commits the journal and writes the
+checkpoint as `MEM.recap` does. Each resume then builds a fresh World and times `open_session`:
+once with the checkpoint (one read, no history parse) and once with it removed (full history.jsonl
+parse, scratchpad log re-read on first use). The real database/ is never touched.
+
+Usage:
+    python utils/benchmarks/session_resume.py                  # 1000 rounds, 5 resumes each
+    python utils/benchmarks/session_resume.py --turns 4000 --repeat 3
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from schemas.config import load_config
+from backend.components import world as world_module
+from backend.components.prompt_engineer import PromptEngineer
+from backend.modules.nlu import NLU
+from backend.modules.pex import PEX
+from backend.modules.mem import MEM
+
+_CONVO_ID = 'bench_resume'
+
+
+def _world(config):
+    engineer = PromptEngineer(config)
+    nlu, pex, mem = NLU(config, engineer), PEX(config, engineer), MEM(config, engineer, 'bench_user')
+    world = world_module.World(config, nlu, pex, mem)
+    nlu.world = pex.world = mem.world = world
+    return world
+
+
+def _record(config, rounds:int):
+    world = _world(config)
+    world.open_session(_CONVO_ID)
+    for idx in range(rounds):
+        world.context.add_turn('user', {'text': f'round {idx}: tighten the intro of the cheetah post'})
+        world.context.add_turn('agent', {'text': '',
+            'tool_uses': [{'type': 'tool_use', 'id': f'toolu_{idx}', 'name': 'read_section',
+                           'input': {'post_id': 'abcd0123', 'sec_id': 'intro'}}],
+            'tool_results': [{'type': 'tool_result', 'tool_use_id': f'toolu_{idx}',
+                              'content': 'Cheetahs sprint in short bursts. ' * 12}]},
+            turn_type='action')
+        world.context.add_turn('agent', {'text': f'Tightened the intro ({idx}).'})
+        world.scratchpad.append_entry('polish', {'summary': f'round {idx} edits', 'turn_number': idx})
+    world.journal.commit()
+    world.write_checkpoint()
+    world.journal.close()
+    return world.session_dir()
+
+
+def _resume(config) -> tuple[float, int]:
+    world = _world(config)
+    start = time.perf_counter()
+    world.open_session(_CONVO_ID)
+    size = world.scratchpad.size        # the first scratchpad read, where a cold view parses its log
+    elapsed = time.perf_counter() - start
+    return elapsed, world.context.turn_count + size
+
+
+def run(rounds:int, repeat:int):
+    config = load_config()
+    with tempfile.TemporaryDirectory() as sessions:
+        world_module._SESSIONS_DIR = Path(sessions)
+        session = _record(config, rounds)
+        ckpt = session / world_module._CHECKPOINT
+        warm = [_resume(config) for _ in range(repeat)]
+        saved = ckpt.read_bytes()
+        ckpt.unlink()
+        cold = [_resume(config) for _ in range(repeat)]
+        ckpt.write_bytes(saved)
+        assert {count for _, count in warm} == {count for _, count in cold}, 'resumes must agree'
+        history_kb = (session / 'history.jsonl').stat().st_size / 1024
+        print(f'\n{rounds} rounds: history.jsonl {history_kb:,.0f} KB, checkpoint {len(saved) / 1024:,.0f} KB')
+    warm_ms = min(elapsed for elapsed, _ in warm) * 1000
+    cold_ms = min(elapsed for elapsed, _ in cold) * 1000
+    print(f'{"resume":>11} {"best ms":>8}')
+    print(f'{"jsonl":>11} {cold_ms:>8.1f}')
+    print(f'{"checkpoint":>11} {warm_ms:>8.1f}   ({cold_ms / warm_ms:.1f}x)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--turns', type=int, default=1000, help='orchestrator rounds to record')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.turns, args.repeat)
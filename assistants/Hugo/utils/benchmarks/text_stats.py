@@ -0,0 +1,195 @@
+"""Micro-benchmark: AnalysisService metrics from the shared TextStats engine vs the per-tool passes.
+
+The baseline below is the previous implementation, copied verbatim: `inspect_post` walking the
+lines with two regex searches each, `check_readability` counting syllables character by character
+twice per word, and `compare_style` re-running both for the target and every reference. Both
+sides run against posts seeded into a temporary library and must return identical results. The
+real database/ is never touched.
+
+Usage:
+    python utils/benchmarks/text_stats.py                      # 20k-word post, 50 references
+    python utils/benchmarks/text_stats.py --words 50000 --refs 100 --repeat 3
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from backend.utilities import services
+from backend.utilities import text_stats as text_stats_module
+
+_VOCAB = ('the a of writing draft cheetah sprints quickly across savanna grasslands researchers '
+          'measured acceleration remarkable physiological adaptations enable unprecedented '
+          'velocity however endurance remains limited consequently hunting strategies emphasize '
+          'stealth ambush proximity approximately seventy percent of pursuits succeed').split()
+
+
+def _legacy_inspect(content:str, sections:list[dict]) -> dict:
+    lines = content.split('\n')
+    word_count = len(re.sub(r'<[^>]+>', '', content).split())
+    heading_depth = 0
+    image_count = 0
+    link_count = 0
+    empty_sections = []
+    para_lengths = []
+    current_para = 0
+    for line in lines:
+        if line.startswith('#'):
+            depth = len(line.split()[0]) if line.split() else 0
+            heading_depth = max(heading_depth, depth)
+        if re.search(r'!\[.*?\]\(.*?\)', line):
+            image_count += 1
+        if re.search(r'\[.*?\]\(.*?\)', line):
+            link_count += 1
+        if line.strip():
+            current_para += len(line.split())
+        else:
+            if current_para > 0:
+                para_lengths.append(current_para)
+                current_para = 0
+    if current_para > 0:
+        para_lengths.append(current_para)
+    for sec in sections:
+        if not '\n'.join(sec['lines']).strip():
+            empty_sections.append(sec['sec_id'])
+    avg_para = round(sum(para_lengths) / max(len(para_lengths), 1), 1)
+    return {'word_count': word_count, 'section_count': len(sections), 'heading_depth': heading_depth,
+            'image_count': image_count, 'link_count': link_count, 'avg_paragraph_length': avg_para,
+            'estimated_read_time': max(1, round(word_count / 238)), 'empty_sections': empty_sections}
+
+
+def _legacy_readability(content:str) -> dict:
+    sentences = re.split(r'[.!?]+', content)
+    sentences = [sent.strip() for sent in sentences if sent.strip()]
+    sentence_count = len(sentences) or 1
+    words = content.split()
+    word_count = len(words) or 1
+
+    def syllable_count(word:str) -> int:
+        cleaned = word.lower().rstrip('es').rstrip('ed')
+        vowels = 'aeiou'
+        count = 0
+        prev_vowel = False
+        for ch in cleaned:
+            is_vowel = ch in vowels
+            if is_vowel and not prev_vowel:
+                count += 1
+            prev_vowel = is_vowel
+        return max(count, 1)
+
+    total_syllables = sum(syllable_count(word) for word in words)
+    complex_words = sum(1 for word in words if syllable_count(word) >= 3)
+    fk = 0.39 * (word_count / sentence_count) + 11.8 * (total_syllables / word_count) - 15.59
+    fk = round(max(0, fk), 1)
+    fog = 0.4 * ((word_count / sentence_count) + 100 * (complex_words / word_count))
+    fog = round(max(0, fog), 1)
+    label = 'easy' if fk <= 6 else 'moderate' if fk <= 10 else 'advanced' if fk <= 14 else 'difficult'
+    return {'flesch_kincaid_grade': fk, 'gunning_fog': fog,
+            'avg_sentence_length': round(word_count / sentence_count, 1),
+            'avg_word_length': round(sum(len(word) for word in words) / word_count, 1),
+            'sentence_count': sentence_count, 'score_label': label}
+
+
+def _legacy_profile(svc, post_id:str) -> dict:
+    ent = svc._get_entry(post_id)
+    content = svc._read_content(ent['filename'])
+    inspected = _legacy_inspect(content, svc._extract_sections(content))
+    content = svc._read_content(ent['filename'])      # compare_style read the file a second time
+    return {'_success': True, 'post_id': post_id, **inspected, **_legacy_readability(content)}
+
+
+def _legacy_compare(svc, post_id:str, reference_ids:list[str]) -> dict:
+    target = _legacy_profile(svc, post_id)
+    references, deltas = [], {}
+    for ref_id in reference_ids:
+        ref_data = {**_legacy_profile(svc, ref_id), 'post_id': ref_id}
+        references.append(ref_data)
+        for key in ('word_count', 'section_count', 'flesch_kincaid_grade', 'gunning_fog',
+                    'avg_sentence_length'):
+            deltas[key] = round(target[key] - ref_data[key], 2)
+    return {'_success': True, 'target': target, 'references': references, 'deltas': deltas}
+
+
+def _post_body(rng:random.Random, words:int) -> str:
+    sections, written = [], 0
+    while written < words:
+        paras = []
+        for _ in range(rng.randint(2, 5)):
+            sentences = [' '.join(rng.choice(_VOCAB) for _ in range(rng.randint(6, 22))).capitalize() + '.'
+                         for _ in range(rng.randint(2, 6))]
+            written += sum(len(sent.split()) for sent in sentences)
+            if rng.random() < 0.2:
+                sentences.append('See [the study](https://example.org/cheetah) and ![chart](chart.png).')
+            paras.append(' '.join(sentences))
+        sections.append(f'## Section {len(sections) + 1}\n\n' + '\n\n'.join(paras))
+    return '\n\n'.join(sections) + '\n'
+
+
+def _seed(svc, title:str, body:str) -> str:
+    post_id = svc.create_post(title=title)['post_id']
+    path = svc._content_dir / svc._get_entry(post_id)['filename']
+    path.write_text(f'---\ntitle: {title}\n---\n\n{body}', encoding='utf-8')
+    return post_id
+
+
+def _best(fn, repeat:int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _cold(svc):
+    """Forget every memo, as a fresh process would."""
+    text_stats_module._STATS.clear()
+    text_stats_module.syllable_count.cache_clear()
+    svc._references._profiles.clear()
+
+
+def run(words:int, refs:int, repeat:int):
+    with tempfile.TemporaryDirectory() as root:
+        services._DB_DIR = Path(root)
+        (Path(root) / 'content').mkdir()
+        (Path(root) / 'content' / 'metadata.json').write_text(json.dumps({'entries': []}))
+        from backend.utilities.post_service import PostService
+        from backend.utilities.analysis_service import AnalysisService
+        post_svc, svc = PostService(), AnalysisService()
+        rng = random.Random(7)
+        long_id = _seed(post_svc, 'Long Post', _post_body(rng, words))
+        ref_ids = [_seed(post_svc, f'Reference {idx}', _post_body(rng, 1500)) for idx in range(refs)]
+        content = svc._read_content(svc._get_entry(long_id)['filename'])
+
+        assert svc.check_readability(content) == {'_success': True, **_legacy_readability(content)}
+        assert svc.compare_style(long_id, ref_ids) == _legacy_compare(svc, long_id, ref_ids), 'results differ'
+
+        rows = [
+            (f'readability {words // 1000}k words', lambda: _legacy_readability(content),
+             lambda: (_cold(svc), svc.check_readability(content)), lambda: svc.check_readability(content)),
+            (f'compare_style {refs} refs', lambda: _legacy_compare(svc, long_id, ref_ids),
+             lambda: (_cold(svc), svc.compare_style(long_id, ref_ids)), lambda: svc.compare_style(long_id, ref_ids)),
+        ]
+        print(f'{"case":>26} {"legacy ms":>10} {"cold ms":>9} {"cached ms":>10}')
+        for label, legacy, cold, cached in rows:
+            legacy_ms, cold_ms, cached_ms = _best(legacy, repeat), _best(cold, repeat), _best(cached, repeat)
+            print(f'{label:>26} {legacy_ms:>10.1f} {cold_ms:>9.1f} {cached_ms:>10.1f}'
+                  f'   ({legacy_ms / cold_ms:.1f}x cold, {legacy_ms / cached_ms:.0f}x cached)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=20000, help='length of the long post')
+    parser.add_argument('--refs', type=int, default=50, help='reference posts for compare_style')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.words, args.refs, args.repeat)
@@ -0,0 +1,92 @@
+"""Micro-benchmark: web search through the cached, pooled client vs one request per query.
+
+A research turn issues a handful of related queries, some repeated with different casing. The
+baseline searches them one after another with no cache, as `ContentService.web_search` used to.
+The batch side runs the same queries through `WebSearch.search_many` (distinct queries once,
+concurrently), then again warm from the cache and again from a fresh client on the same SQLite
+file, as the next process would. Everything runs on `FakeSearchBackend` with a simulated latency,
+so no network or API key is needed.
+
+Usage:
+    python utils/benchmarks/web_search.py                        # 12 queries, 120ms latency
+    python utils/benchmarks/web_search.py --queries 20 --latency-ms 300 --workers 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from backend.utilities.response_cache import ResponseCache
+from backend.utilities.web_search import FakeSearchBackend, WebSearch, normalize_query
+
+_TOPICS = ('cheetah sprint speed', 'cheetah hunting success rate', 'savanna predator density',
+           'cheetah muscle fiber composition', 'big cat acceleration study', 'cheetah conservation status',
+           'gazelle escape tactics', 'cheetah heat regulation while running')
+
+
+def _queries(count:int) -> list[str]:
+    """`count` queries cycling through the topics; every other repeat is re-cased and re-spaced."""
+    queries = []
+    for idx in range(count):
+        topic = _TOPICS[idx % len(_TOPICS)]
+        queries.append(topic if (idx // len(_TOPICS)) % 2 == 0 else '  ' + topic.title().replace(' ', '  '))
+    return queries
+
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(count:int, latency_ms:float, workers:int):
+    queries = _queries(count)
+    latency_s = latency_ms / 1000
+    with tempfile.TemporaryDirectory() as root:
+        path = Path(root) / 'search.db'
+
+        def client() -> tuple[WebSearch, FakeSearchBackend]:
+            backend = FakeSearchBackend(latency_s=latency_s)
+            cache = ResponseCache(path, ttl_s={'web_search': 3600})
+            return WebSearch(backend, cache, max_concurrency=workers), backend
+
+        baseline = FakeSearchBackend(latency_s=latency_s)
+        legacy_ms, legacy = _timed(lambda: [baseline.search(query, 5) for query in queries])
+
+        batch, backend = client()
+        batch_ms, found = _timed(lambda: batch.search_many(queries, 5))
+        assert found == [baseline._results(normalize_query(query), 5) for query in queries], 'results differ'
+        batch_calls = backend.calls
+        warm_ms, _ = _timed(lambda: batch.search_many(queries, 5))
+        warm_calls = backend.calls - batch_calls
+        batch.close()
+
+        fresh, fresh_backend = client()
+        disk_ms, _ = _timed(lambda: fresh.search_many(queries, 5))
+        fresh.close()
+
+        print(f'{count} queries ({len(set(map(normalize_query, queries)))} distinct), '
+              f'{latency_ms:.0f}ms simulated latency, {workers} workers')
+        print(f'{"case":>22} {"ms":>9} {"requests":>9}')
+        rows = [('sequential, no cache', legacy_ms, baseline.calls),
+                ('batched, cold', batch_ms, batch_calls),
+                ('batched, warm memory', warm_ms, warm_calls),
+                ('new process, on disk', disk_ms, fresh_backend.calls)]
+        for label, elapsed, calls in rows:
+            print(f'{label:>22} {elapsed:>9.1f} {calls:>9}   ({legacy_ms / max(elapsed, 1e-3):.0f}x)')
+        assert len(legacy) == count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=12, help='queries in the research turn')
+    parser.add_argument('--latency-ms', type=float, default=120.0, help='simulated round trip')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent searches per batch')
+    args = parser.parse_args()
+    run(args.queries, args.latency_ms, args.workers)
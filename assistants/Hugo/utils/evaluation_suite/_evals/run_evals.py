@@ -21,6 +21,8 @@ similarity (a small local model, no API) — so scoring adds no model cost beyon
   python utils/evaluation_suite/_evals/run_evals.py --ids B01.C01,B02.C04
   python utils/evaluation_suite/_evals/run_evals.py --judge-response # score criterion 3 with the LLM judge
   python utils/evaluation_suite/_evals/run_evals.py --all           # the whole corpus
+  python utils/evaluation_suite/_evals/run_evals.py --llm-cache database/llm_cache.db  # record, then replay offline
+  python utils/evaluation_suite/_evals/run_evals.py --all --workers 6   # 6 scenarios at a time, sandboxed
 """
 import argparse
 import json
@@ -36,7 +38,8 @@ if str(_HUGO_ROOT) not in sys.path:
 
 from utils.evaluation_suite.harness import (
     _build_agent, _seed_post, _clean_leftovers, _TURN_TIMEOUT_SEC, sample, all_ids, load_cases,
-    seed_active_post, snapshot_post_ids, clean_created_posts)
+    seed_active_post, snapshot_post_ids, clean_created_posts, enable_llm_cache, enable_fake_llm)
+from utils.evaluation_suite.parallel import run_cases
 from utils.evaluation_suite.scoring import (
     is_completed, tool_similarity, semantic_similarity, judge_response)
 from utils.evaluation_suite._traces.run_traces import _normalize_post, _install_tool_logger, _domain_tools
@@ -203,7 +206,16 @@ def main():
                         help='score criterion 3 with the LLM judge instead of offline embedding similarity')
     parser.add_argument('--trace-report', nargs='?', const='evals_trace', default='',
                         help='write trace JSONL during this eval pass using the optional prefix')
+    parser.add_argument('--llm-cache', default='',
+                        help='SQLite file that records model responses and replays them on later runs')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='scenarios run concurrently, each worker in its own database/ sandbox')
+    parser.add_argument('--fake-llm', nargs='?', type=float, const=0.0, default=None, metavar='MS',
+                        help='offline deterministic model (optional per-call delay in ms)')
     args = parser.parse_args()
+    cache = enable_llm_cache(args.llm_cache) if args.llm_cache else None
+    fake = enable_fake_llm(args.fake_llm) if args.fake_llm is not None else None
+    options = {'llm_cache': args.llm_cache, 'fake_llm_ms': args.fake_llm}
 
     if args.ids:
         ids = [cid.strip() for cid in args.ids.split(',') if cid.strip()]
@@ -218,7 +230,8 @@ def main():
         print(f"eval trace report: {trace_path.relative_to(_HUGO_ROOT)}")
 
     domain_tools = _domain_tools()
-    results = [_score_convo(case, domain_tools, args.judge_response, trace_path) for case in cases]
+    results = run_cases(_score_convo, cases, (domain_tools, args.judge_response), trace_path,
+                        args.workers, options)
     for cid, res in zip(ids, results):
         line = ' '.join(f'{name}={res[name]}' for name in _CRITERIA)
         print(f"{cid}: {line} | {res['latency_secs']}s")
@@ -231,6 +244,10 @@ def main():
     print(f"\n== {len(cases)} convos ==")
     print(' '.join(f'{name}={aggregate[name]}' for name in _CRITERIA)
           + f" latency_mean={aggregate['latency_mean']}s")
+    if cache is not None and args.workers <= 1:
+        print(f"llm cache: {cache.stats()}")
+    if fake is not None and args.workers <= 1:
+        print(f"fake llm calls: {dict(fake.calls)}")
 
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ skills facade and the L1 Context-Coordinator compaction + its post-hook trigger.
 Shared fixtures (minimal_config, sessions_dir, orch_agent) live in conftest.py.
 """
 import json
+import time
 from types import MappingProxyType, SimpleNamespace
 
 import pytest
@@ -17,6 +18,7 @@ from backend.modules.pex import PEX
 from backend.modules.mem import MEM
 from backend.components.context_coordinator import ContextCoordinator
 from backend.prompts.for_compactor import SUMMARY_PREFIX
+from backend.utilities.journal import SessionJournal
 
 
 def _make_world(config):
@@ -229,10 +231,59 @@ class TestCompression:
         assert record[0]['previous'] == 'summary #1'
 
 
+class TestIncrementalProjection:
+    """compile_messages() memoization: every call matches a from-scratch render, and each round
+    re-renders only the new turns plus the previous protected tail."""
+
+    @staticmethod
+    def _fresh(coordinator, config):
+        scratch = ContextCoordinator(config)
+        scratch._history = list(coordinator._history)
+        return scratch.compile_messages()
+
+    def test_matches_full_render_across_rounds_and_compactions(self, minimal_config):
+        coordinator = ContextCoordinator(minimal_config)
+        for round_num in range(12):
+            _seed_transcript(coordinator, 1)
+            if round_num in (7, 10):
+                coordinator.compact_messages(_stub_summarizer([]), protect_tail=20)
+            assert coordinator.compile_messages() == self._fresh(coordinator, minimal_config)
+
+    def test_per_round_renders_stay_constant(self, minimal_config, monkeypatch):
+        coordinator = ContextCoordinator(minimal_config)
+        calls = []
+        real_render = coordinator._render_turn
+        monkeypatch.setattr(coordinator, '_render_turn',
+                            lambda idx: calls.append(idx) or real_render(idx))
+        per_round = []
+        for _ in range(40):
+            _seed_transcript(coordinator, 1)
+            calls.clear()
+            coordinator.compile_messages()
+            per_round.append(len(calls))
+        assert max(per_round[10:]) <= coordinator.protect_tail + 3
+
+    def test_returned_list_is_the_callers(self, minimal_config):
+        coordinator = ContextCoordinator(minimal_config)
+        _seed_transcript(coordinator, 2)
+        coordinator.compile_messages().append({'role': 'user', 'content': 'ephemeral refresh'})
+        assert coordinator.compile_messages()[-1]['content'] == 'done with turn 1'
+
+    def test_callers_leave_the_memoized_messages_untouched(self, orch_agent, minimal_config):
+        context = orch_agent.world.context
+        _script(orch_agent, [_response(_tool_block('understand', {'op': 'read'})),
+                             _response(_text_block('all read'))])
+        orch_agent.take_turn('read it back to me')
+        assert context.compile_messages() == self._fresh(context, minimal_config)   # rounds wrote nothing in
+        single = [{'role': 'user', 'content': 'static prefix\n\n<current_scenario>now'}]
+        marked = PromptEngineer._mark_scenario_prefix(single)
+        assert marked[0] is not single[0] and isinstance(single[0]['content'], str)
+
+
 class TestCompressionTrigger:
-    """The end-of-turn trigger (MEM._compaction_check, run by recap): real usage off
-    response.usage against the configured threshold; the protected tail size rides in from
-    config."""
+    """The end-of-turn trigger (MEM._compaction_check, run by recap) schedules; the swap
+    (MEM.swap_in_compaction, run at turn start) applies. Real usage off response.usage against the
+    configured threshold; the protected tail size rides in from config."""
 
     @staticmethod
     def _usage_response(text, prompt_tokens, cached=0):
@@ -242,36 +293,141 @@ class TestCompressionTrigger:
                                          cache_read_input_tokens=cached)
         return response
 
+    @pytest.fixture
+    def memory(self, sessions_dir, minimal_config):
+        config = dict(minimal_config)
+        config['compaction'] = {'threshold_tokens': 1000, 'protect_tail': 20, 'precompute_ratio': 0.5}
+        world, memory = _make_world(MappingProxyType(config))
+        world.open_session('convo-compact')
+        _seed_transcript(world.context, 10)
+        return memory
+
+    @staticmethod
+    def _settle(memory):
+        memory._pending_compaction[1].result(timeout=5)
+
     def test_usage_recorded_including_cache_tokens(self, orch_agent):
         _script(orch_agent, [self._usage_response('hi', 1500, cached=4500)])
         orch_agent.take_turn('hello')
         assert orch_agent.pex.last_prompt_tokens == 6000
 
-    def test_below_threshold_never_compacts(self, orch_agent, monkeypatch):
+    def test_below_precompute_never_plans(self, orch_agent, monkeypatch):
         calls = []
-        monkeypatch.setattr(orch_agent.world.context, 'compact_messages',
-                            lambda *args: calls.append(args) or True)
-        _script(orch_agent, [self._usage_response('small turn', 63999)])
+        monkeypatch.setattr(orch_agent.world.context, 'plan_compaction',
+                            lambda *args: calls.append(args))
+        _script(orch_agent, [self._usage_response('small turn', 47999)])   # 75% of 64000 is 48000
         orch_agent.take_turn('hello')
         assert calls == []
 
-    def test_at_threshold_compacts_with_config_tail(self, orch_agent, monkeypatch):
+    def test_plans_with_config_tail_without_waiting(self, orch_agent, monkeypatch):
         calls = []
-        monkeypatch.setattr(orch_agent.world.context, 'compact_messages',
-                            lambda *args: calls.append(args) or True)
+        monkeypatch.setattr(orch_agent.world.context, 'plan_compaction',
+                            lambda *args: calls.append(args))
         _script(orch_agent, [self._usage_response('big turn', 64000)])
         orch_agent.take_turn('hello')
-        summarize, protect_tail, prompt_tokens = calls[0]
-        assert summarize == orch_agent.mem._summarize_middle
-        assert protect_tail == 20  # schemas/tools.yaml compaction.protect_tail
-        assert prompt_tokens == 64000
+        assert calls == [(20,)]   # schemas/tools.yaml compaction.protect_tail
+        assert orch_agent.mem._compaction_due == 64000
+
+    def test_precomputed_summary_waits_for_the_threshold(self, memory):
+        record = []
+        memory._summarize_middle = _stub_summarizer(record)
+        memory._compaction_check(600)                   # past 50%, short of the threshold
+        self._settle(memory)
+        assert len(record) == 1
+        assert memory.swap_in_compaction() is False     # ready, but not due yet
+        memory._compaction_check(1200)                  # due: reuses the summary in hand
+        assert len(record) == 1
+        assert memory.swap_in_compaction() is True
+        assert memory.context_coordinator.previous_summary == 'summary #1'
+        messages = memory.context_coordinator.compile_messages()
+        assert any(isinstance(msg['content'], str) and msg['content'].startswith(SUMMARY_PREFIX)
+                   for msg in messages)
+        assert memory._compaction_due == 0 and memory._pending_compaction is None
+
+    def test_turns_appended_meanwhile_stay_verbatim(self, memory):
+        memory._summarize_middle = _stub_summarizer([])
+        memory._compaction_check(1200)
+        self._settle(memory)
+        memory.context_coordinator.add_turn('user', {'text': 'arrived while summarizing'})
+        assert memory.swap_in_compaction() is True
+        messages = memory.context_coordinator.compile_messages()
+        assert any(msg['content'] == 'arrived while summarizing' for msg in messages)
+
+    def test_reset_stales_the_plan(self, memory):
+        memory._summarize_middle = _stub_summarizer([])
+        memory._compaction_check(1200)
+        self._settle(memory)
+        memory.context_coordinator.reset()
+        assert memory.swap_in_compaction() is False
+        assert memory.context_coordinator.previous_summary is None
+
+    def test_threshold_crossing_applies_the_plan_in_hand(self, memory):
+        record = []
+        memory._summarize_middle = _stub_summarizer(record)
+        memory._compaction_check(600)                   # precomputed at 50%
+        self._settle(memory)
+        plan = memory._pending_compaction[0]
+        _seed_transcript(memory.context_coordinator, 3) # more turns before usage reaches the threshold
+        memory._compaction_check(1200)
+        assert memory._pending_compaction[0] is plan and len(record) == 1
+        assert memory.swap_in_compaction() is True
+        assert memory.context_coordinator._history[-1].content['result']['cut'] == plan['cut']
+        memory._compaction_check(700)                   # the next plan starts after the splice
+        self._settle(memory)
+        assert memory._pending_compaction[0]['start'] > plan['start'] and len(record) == 2
+
+    def test_due_swap_never_waits_for_a_summary_in_flight(self, memory):
+        import threading
+        release = threading.Event()
+
+        def slow(middle, previous_summary, budget):
+            release.wait(5)
+            return 'late summary'
+
+        memory._summarize_middle = slow
+        memory._compaction_check(1200)
+        assert memory.swap_in_compaction() is False     # the turn goes ahead uncompacted
+        assert memory.context_coordinator.previous_summary is None
+        release.set()
+        self._settle(memory)
+        assert memory.swap_in_compaction() is True      # and the summary lands a turn later
+        assert memory.context_coordinator.previous_summary == 'late summary'
+
+    def test_failed_summary_is_replanned_at_turn_end(self, memory):
+        calls = []
+
+        def flaky(middle, previous_summary, budget):
+            calls.append(budget)
+            if len(calls) == 1:
+                raise RuntimeError('aux model blip')
+            return 'second summary'
+
+        memory._summarize_middle = flaky
+        memory._compaction_check(1200)
+        self._settle_failed(memory)
+        assert memory.swap_in_compaction() is False and len(calls) == 1
+        memory._compaction_check(1200)
+        self._settle(memory)
+        assert memory.swap_in_compaction() is True
+        assert len(calls) == 2 and memory._compaction_due == 0
+        assert memory.context_coordinator.previous_summary == 'second summary'
 
     def test_summarizer_failure_does_not_eat_the_reply(self, orch_agent, monkeypatch):
         def boom(*args):
             raise RuntimeError('aux model down')
-        monkeypatch.setattr(orch_agent.world.context, 'compact_messages', boom)
-        _script(orch_agent, [self._usage_response('still replies', 200000)])
+        monkeypatch.setattr(orch_agent.mem, '_summarize_middle', boom)
+        _seed_transcript(orch_agent.world.context, 10)
+        _script(orch_agent, [self._usage_response('still replies', 200000),
+                             self._usage_response('and again', 1000)])
         assert orch_agent.take_turn('hello')['message'] == 'still replies'
+        self._settle_failed(orch_agent.mem)
+        assert orch_agent.take_turn('next')['message'] == 'and again'
+        assert orch_agent.world.context.previous_summary is None
+
+    @staticmethod
+    def _settle_failed(memory):
+        with pytest.raises(RuntimeError):
+            memory._pending_compaction[1].result(timeout=5)
 
 
 
@@ -346,6 +502,97 @@ class TestBusinessKnowledge:
 
 
 
+class TestVectorRetrieval:
+    """Embedding retrieval in front of the rerank: top-k, threshold, persisted incremental index."""
+
+    _VOCAB = ('hugo', 'publish', 'price', 'draft', 'seo')
+
+    @pytest.fixture
+    def fake_embed(self, monkeypatch):
+        """Bag-of-vocabulary vectors, L2-normalized like the real model. Counts every text embedded."""
+        import math
+        from backend.utilities import embeddings
+        seen = []
+
+        def embed(texts, model_name=embeddings.MODEL_NAME):
+            single = isinstance(texts, str)
+            rows = []
+            for text in [texts] if single else texts:
+                seen.append((model_name, text) if model_name != embeddings.MODEL_NAME else text)
+                words = text.lower().replace('?', ' ').split()
+                vec = [float(words.count(term)) for term in self._VOCAB] + [0.1]
+                norm = math.sqrt(sum(val * val for val in vec))
+                rows.append([val / norm for val in vec])
+            return rows[0] if single else rows
+        monkeypatch.setattr(embeddings, 'embed', embed)
+        return seen
+
+    @staticmethod
+    def _write(faq_dir, questions):
+        (faq_dir / 'faqs.json').write_text(json.dumps(
+            [{'question': q, 'answer': '', 'tags': []} for q in questions]))
+
+    def _knowledge(self, engineer, **settings):
+        from backend.components.business_knowledge import BusinessKnowledge
+        config = {'memory': {'business_context': {'retrieval_top_k': 2, 'rerank_top_n': 1,
+                                                  'similarity_threshold': 0.5, **settings}}}
+        return BusinessKnowledge(engineer, config)
+
+    def test_only_top_k_reach_the_reranker(self, tmp_faq_db, fake_embed):
+        self._write(tmp_faq_db, ['How do I publish?', 'What is the price?', 'Can Hugo draft?',
+                                 'Does Hugo publish drafts?', 'SEO tips?'])
+        engineer = _FakeEngineer({'matches': [{'idx': 0, 'score': 0.9}, {'idx': 1, 'score': 0.4}]})
+        svc = self._knowledge(engineer)
+        result = svc.search_documents('publish', top_k=3)
+        assert '[0] How do I publish?' in engineer.last_prompt
+        assert '[1] Does Hugo publish drafts?' in engineer.last_prompt
+        assert '[2]' not in engineer.last_prompt and 'price' not in engineer.last_prompt
+        assert 'up to 1 indices' in engineer.last_prompt       # capped by rerank_top_n
+        assert [match['question'] for match in result['matches'][:1]] == ['How do I publish?']
+
+    def test_below_threshold_skips_the_rerank(self, tmp_faq_db, fake_embed):
+        self._write(tmp_faq_db, ['What is the price?'])
+        engineer = _FakeEngineer({'matches': [{'idx': 0, 'score': 0.9}]})
+        result = self._knowledge(engineer).search_documents('seo')
+        assert result == {'_success': True, 'matches': []}
+        assert engineer.last_prompt is None
+
+    def test_index_persists_and_rebuilds_incrementally(self, tmp_faq_db, fake_embed):
+        self._write(tmp_faq_db, ['How do I publish?', 'What is the price?'])
+        first = self._knowledge(_FakeEngineer({'matches': []}))
+        first._candidates('publish')
+        assert len(fake_embed) == 3                             # two entries + the query
+        self._write(tmp_faq_db, ['How do I publish?', 'SEO tips?'])
+        second = self._knowledge(_FakeEngineer({'matches': []}))
+        assert [entry['question'] for entry in second._candidates('seo')] == ['SEO tips?']
+        assert second._index.embedded == 1                      # only the new entry was embedded
+        assert len(second._index._load()) == 2                  # the removed entry was dropped
+        second.insert_record({'question': 'Price of SEO?', 'answer': ''})
+        second._candidates('seo')
+        assert second._index.embedded == 2
+
+    def test_falls_back_to_corpus_without_the_model(self, tmp_faq_db, monkeypatch):
+        from backend.utilities import embeddings
+
+        def missing(texts, model_name=None):
+            raise ImportError('no sentence_transformers')
+        monkeypatch.setattr(embeddings, 'embed', missing)
+        self._write(tmp_faq_db, ['A?', 'B?', 'C?'])
+        svc = self._knowledge(_FakeEngineer({'matches': []}))
+        assert [entry['question'] for entry in svc._candidates('x')] == ['A?', 'B?']
+        assert not (tmp_faq_db / 'faq_vectors.db').exists()    # no index without the model
+
+    def test_configured_embedding_model_is_used(self, tmp_faq_db, fake_embed):
+        self._write(tmp_faq_db, ['How do I publish?'])
+        svc = self._knowledge(_FakeEngineer({'matches': []}), embedding_model='bge-small-en')
+        assert [entry['question'] for entry in svc._candidates('publish')] == ['How do I publish?']
+        assert fake_embed == [('bge-small-en', 'How do I publish?\n'), ('bge-small-en', 'publish')]
+        default = self._knowledge(_FakeEngineer({'matches': []}))
+        default._candidates('publish')
+        assert default._index.embedded == 1                     # keys differ per model: re-embedded
+
+
+
 
 @pytest.fixture
 def session_config(minimal_config):
@@ -384,6 +631,174 @@ class TestWorldSessions:
         assert world.state.turn_id == 0
 
 
+class TestSessionPool:
+    """backend/manager.py: detach on disconnect, park idle or over-cap Assistants, rehydrate lazily."""
+
+    @pytest.fixture
+    def pool(self, sessions_dir):
+        from schemas.config import load_config
+        from backend.manager import Manager
+        base = load_config(overrides={'debug': True})
+        session = dict(base['session'], idle_timeout_ms=60000, pool_size=1)
+        return Manager(load_config(overrides={'debug': True, 'session': session}))
+
+    @staticmethod
+    def _start(assistant, convo_id:str):
+        """What `_init_session` leaves behind, minus the prompt build."""
+        assistant.world.open_session(convo_id)
+        assistant.world.state.conversation_id = convo_id
+        assistant.world.context.add_turn('user', {'text': f'hello from {convo_id}'})
+        assistant.world.flows.stackon('outline')
+        assistant.system_prompt = f'frozen prompt for {convo_id}'
+
+    def test_reconnect_reuses_the_detached_assistant(self, pool):
+        first = pool.get_or_create('ann')
+        assert pool.cleanup('ann', 'websocket')
+        assert pool.get_or_create('ann') is first
+        assert pool.stats()['reused'] == 1
+
+    def test_over_capacity_parks_and_rehydrates(self, pool, sessions_dir):
+        ann = pool.get_or_create('ann')
+        self._start(ann, 'ann_convo')
+        flow_id = ann.world.flows.get_flow().flow_id
+        turns = ann.world.context.turn_count
+        pool.cleanup('ann', 'websocket')
+        pool.get_or_create('bob')                       # second live session exceeds the cap of 1
+        stats = pool.stats()
+        assert (stats['live'], stats['parked'], stats['parked_total']) == (1, 1, 1)
+        assert (sessions_dir / 'ann_convo' / 'parked.json').exists()
+
+        back = pool.get_or_create('ann')
+        assert back is not ann
+        assert back.system_prompt == 'frozen prompt for ann_convo'
+        assert back.world.conversation_id == 'ann_convo'
+        assert back.world.context.turn_count == turns
+        flow = back.world.flows.get_flow()
+        assert (flow.name(), flow.flow_id) == ('outline', flow_id)
+        assert not (sessions_dir / 'ann_convo' / 'parked.json').exists()
+        assert pool.stats()['rehydrated'] == 1
+
+    def test_connected_sessions_are_never_parked(self, pool):
+        pool.get_or_create('ann')
+        pool.get_or_create('bob')
+        assert pool.stats()['live'] == 2                # over the cap, but both are connected
+
+    def test_sweep_parks_idle_sessions(self, pool, monkeypatch):
+        import time
+        ann = pool.get_or_create('ann')
+        self._start(ann, 'ann_convo')
+        pool.cleanup('ann', 'websocket')
+        assert pool.sweep() == 0
+        later = time.monotonic() + 61
+        monkeypatch.setattr('backend.manager.time.monotonic', lambda: later)
+        assert pool.sweep() == 1
+        assert pool.stats()['expired'] == 1
+
+    def test_a_running_turn_is_never_parked(self, pool, sessions_dir, monkeypatch):
+        import time
+        ann = pool.get_or_create('ann')
+        self._start(ann, 'ann_convo')
+        assert pool.begin_turn('ann')
+        pool.cleanup('ann')                             # the socket dropped mid-turn
+        pool.get_or_create('bob')                       # over the cap of 1
+        later = time.monotonic() + 61
+        monkeypatch.setattr('backend.manager.time.monotonic', lambda: later)
+        assert pool.sweep() == 0
+        assert pool.stats()['busy'] == 1 and not (sessions_dir / 'ann_convo' / 'parked.json').exists()
+        pool.end_turn('ann')                            # the turn finishes, then the cap applies
+        assert (sessions_dir / 'ann_convo' / 'parked.json').exists()
+        assert pool.stats()['live'] == 1
+
+    def test_park_runs_outside_the_pool_lock(self, pool, monkeypatch):
+        import threading
+        ann = pool.get_or_create('ann')
+        self._start(ann, 'ann_convo')
+        entered, release = threading.Event(), threading.Event()
+        real_park = ann.park
+
+        def slow_park():
+            entered.set()
+            release.wait(5)
+            return real_park()
+
+        monkeypatch.setattr(ann, 'park', slow_park)
+        parker = threading.Thread(target=pool.cleanup, args=('ann',))
+        parker.start()
+        assert entered.wait(5)
+        pool.get_or_create('bob')                       # not stalled behind ann's park
+        returned = []
+        rejoin = threading.Thread(target=lambda: returned.append(pool.get_or_create('ann')))
+        rejoin.start()
+        rejoin.join(0.2)
+        assert rejoin.is_alive()                        # ann waits for her own park to land
+        release.set()
+        parker.join(5)
+        rejoin.join(5)
+        assert returned[0] is not ann and returned[0].world.conversation_id == 'ann_convo'
+
+    def test_parks_prune_only_expired_session_dirs(self, pool, sessions_dir):
+        import os
+        for name, age_h in (('expired', 48), ('recent', 1)):
+            path = sessions_dir / name
+            path.mkdir(parents=True)
+            stamp = time.time() - age_h * 3600
+            os.utime(path, (stamp, stamp))
+        bob = pool.get_or_create('bob')
+        self._start(bob, 'bob_convo')
+        os.utime(bob.world.session_dir(), (0, 0))      # long untouched, but live: never pruned
+        for idx in range(3):                            # parked sessions beyond any count survive
+            user = pool.get_or_create(f'user{idx}')
+            self._start(user, f'user{idx}_convo')
+            pool.cleanup(f'user{idx}')
+        names = sorted(path.name for path in sessions_dir.iterdir())
+        assert names == ['bob_convo', 'recent', 'user0_convo', 'user1_convo', 'user2_convo']
+        assert pool.stats()['parked'] == 3
+
+    def test_build_runs_outside_the_pool_lock(self, pool, monkeypatch):
+        import threading
+        from backend import manager
+        ann = pool.get_or_create('ann')
+        self._start(ann, 'ann_convo')
+        pool.cleanup('ann')                             # parked; the next connect rehydrates
+        entered, release = threading.Event(), threading.Event()
+        real = manager.Assistant.rehydrate
+
+        def slow_rehydrate(*args, **kwargs):
+            entered.set()
+            release.wait(5)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(manager.Assistant, 'rehydrate', slow_rehydrate)
+        returned = []
+        builder = threading.Thread(target=lambda: returned.append(pool.get_or_create('ann')))
+        builder.start()
+        assert entered.wait(5)
+        bob = pool.get_or_create('bob')                 # another user is not stalled behind it
+        assert pool.begin_turn('bob') and pool.end_turn('bob') is None
+        second = threading.Thread(target=lambda: returned.append(pool.get_or_create('ann')))
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()                        # ann's second connection waits for the build
+        release.set()
+        builder.join(5)
+        second.join(5)
+        assert returned[0] is returned[1] and returned[0].world.conversation_id == 'ann_convo'
+        assert bob is not returned[0] and pool.stats()['rehydrated'] == 1
+
+    def test_stats_report_current_memory(self, pool):
+        stats = pool.stats()
+        assert stats['peak_rss_mb'] > 0
+        assert stats['rss_mb'] is None or 0 < stats['rss_mb'] < stats['peak_rss_mb'] + 1
+
+    def test_parked_sessions_survive_a_restart(self, pool, sessions_dir):
+        from backend.manager import Manager
+        ann = pool.get_or_create('ann')
+        self._start(ann, 'ann_convo')
+        pool.cleanup('ann')                             # a non-websocket cleanup parks right away
+        restarted = Manager(pool.config)
+        assert restarted.get_or_create('ann').world.conversation_id == 'ann_convo'
+
+
 # ═══════════════════════════════════════════════════════════════════
 # ContextCoordinator — the history store and its projection (round 6.1)
 # ═══════════════════════════════════════════════════════════════════
@@ -467,6 +882,138 @@ class TestHistoryStore:
         assert world.context.turn_count == 3  # the recorded session replaces the seed turn
 
 
+class TestSessionJournal:
+    """Write-behind session files: appends batch in memory, flush within the interval, and
+    fsync only at the turn-end commit; a crash never costs a committed turn."""
+
+    @pytest.fixture
+    def journaled(self, minimal_config, tmp_path):
+        journal = SessionJournal(flush_interval_s=60)   # only commit writes within a test
+        coordinator = ContextCoordinator(minimal_config)
+        coordinator.journal = journal
+        coordinator.load_history(tmp_path / 'history.jsonl')
+        return coordinator, journal
+
+    def test_appends_batch_until_commit(self, journaled, minimal_config, tmp_path):
+        coordinator, journal = journaled
+        _seed_tool_round(coordinator)
+        journal.append(tmp_path / 'subagents.jsonl', '{"flow": "outline"}\n')
+        assert not (tmp_path / 'history.jsonl').exists()
+        journal.commit()
+        assert journal.counts['flushes'] == 1 and journal.counts['fsyncs'] == 2
+        reopened = ContextCoordinator(minimal_config)
+        reopened.load_history(tmp_path / 'history.jsonl')
+        assert reopened.compile_messages() == coordinator.compile_messages()
+        assert (tmp_path / 'subagents.jsonl').read_text() == '{"flow": "outline"}\n'
+
+    def test_timer_flushes_within_interval(self, minimal_config, tmp_path):
+        journal = SessionJournal(flush_interval_s=0.05)
+        journal.append(tmp_path / 'subagents.jsonl', '{"n": 1}\n')
+        journal.write(tmp_path / 'state.json', '{"turn_id": 1}')
+        time.sleep(0.5)
+        assert (tmp_path / 'subagents.jsonl').read_text() == '{"n": 1}\n'
+        assert (tmp_path / 'state.json').read_text() == '{"turn_id": 1}'
+        assert journal.counts['commits'] == 0 and journal.counts['fsyncs'] == 0
+        journal.close()
+
+    def test_crash_keeps_every_committed_turn(self, journaled, minimal_config, tmp_path):
+        coordinator, journal = journaled
+        coordinator.add_turn('user', {'text': 'Draft a post about cheetahs'})
+        coordinator.add_turn('agent', {'text': 'Started a draft.'})
+        journal.commit()
+        committed = coordinator.full_conversation()
+        coordinator.add_turn('user', {'text': 'never committed'})
+        with open(tmp_path / 'history.jsonl', 'a', encoding='utf-8') as file:
+            file.write('{"role": "user", "turn_ty')    # the process dies mid-append
+        journal.discard()                               # ...and its buffer with it
+
+        recovered = ContextCoordinator(minimal_config)
+        recovered.load_history(tmp_path / 'history.jsonl')
+        assert recovered.full_conversation() == committed
+        recovered.add_turn('user', {'text': 'after the crash'})
+        reopened = ContextCoordinator(minimal_config)
+        reopened.load_history(tmp_path / 'history.jsonl')   # the torn tail was cut, not fused
+        assert reopened.full_conversation() == committed + ['User: after the crash']
+
+    def test_turn_end_commits_state_and_history(self, sessions_dir, minimal_config):
+        world, memory = _make_world(minimal_config)
+        world.open_session('convo-journal')
+        world.context.add_turn('user', {'text': 'hello'})
+        world.context.add_turn('agent', {'text': 'hi there'})
+        memory.finish()
+        session = sessions_dir / 'convo-journal'
+        saved = json.loads((session / 'state.json').read_text())
+        assert saved['session']['turn_id'] == world.context.num_utterances
+        lines = (session / 'history.jsonl').read_text().splitlines()
+        assert [json.loads(line)['content']['text'] for line in lines[-2:]] == ['hello', 'hi there']
+        assert world.journal.counts['commits'] == 1
+
+
+class TestSessionCheckpoint:
+    """The binary checkpoint written at recap: a resume restores history, scratchpad, flow stack
+    and state from one read, parsing only log lines appended since; anything invalid falls back
+    to the JSONL logs."""
+
+    @pytest.fixture
+    def config(self, minimal_config):
+        config = dict(minimal_config)
+        config['compaction'] = {'threshold_tokens': 64000, 'protect_tail': 20}
+        return MappingProxyType(config)
+
+    @pytest.fixture
+    def recorded(self, sessions_dir, config):
+        world, memory = _make_world(config)
+        world.open_session('convo-ckpt')
+        _seed_tool_round(world.context)
+        world.scratchpad.append_entry('outline', {'summary': 'three sections'})
+        world.flows.stackon('outline')
+        world.state.pred_intent = 'Draft'
+        memory.recap('Outlined the cheetah post.')
+        return world
+
+    def _reopen(self, config):
+        world, _ = _make_world(config)
+        world.open_session('convo-ckpt')
+        return world
+
+    def test_resume_restores_every_component(self, recorded, config, monkeypatch):
+        from backend.components import context_coordinator
+        offsets = []
+        read = context_coordinator._read_records
+        monkeypatch.setattr(context_coordinator, '_read_records',
+                            lambda path, offset=0: offsets.append(offset) or read(path, offset))
+        resumed = self._reopen(config)
+        assert offsets == [(recorded.session_dir() / 'history.jsonl').stat().st_size]
+        assert resumed.context.full_conversation() == recorded.context.full_conversation()
+        assert resumed.context.compile_messages() == recorded.context.compile_messages()
+        assert resumed.flows.to_list() == recorded.flows.to_list()
+        assert resumed.state.read_state() == recorded.state.read_state()
+        assert resumed.scratchpad.read(consume=False) == recorded.scratchpad.read(consume=False)
+
+    def test_lines_after_the_checkpoint_are_folded_in(self, recorded, config):
+        recorded.context.add_turn('user', {'text': 'and a title?'})
+        recorded.scratchpad.append_entry('research', {'summary': 'late finding'})
+        recorded.journal.commit()
+        resumed = self._reopen(config)
+        assert resumed.context.full_conversation()[-1] == 'User: and a title?'
+        assert [entry['origin'] for entry in resumed.scratchpad.read(consume=False)] == \
+            ['outline', 'research']
+
+    def test_corrupt_checkpoint_falls_back_to_jsonl(self, recorded, config):
+        path = recorded.session_dir() / 'session.ckpt'
+        path.write_bytes(path.read_bytes()[:-7])
+        resumed = self._reopen(config)
+        assert resumed.context.full_conversation() == recorded.context.full_conversation()
+        assert resumed.flows.to_list() == []   # no checkpoint, no restored stack
+
+    def test_rewritten_history_invalidates_the_checkpoint(self, recorded, config):
+        history = recorded.session_dir() / 'history.jsonl'
+        history.write_text(history.read_text().replace('active: outline', 'active: OUTLINE'))
+        resumed = self._reopen(config)   # same size, different bytes: the mark digest misses
+        assert 'active: OUTLINE' in resumed.context.full_conversation()[-1]
+        assert resumed.flows.to_list() == []
+
+
 # ==============================================================================
 # MEM L2 — User Preferences (the single preference store). Was untested; these check the
 # typed-record behavior and the endorsed-vs-guessed prompt rendering (actual output vs expected).
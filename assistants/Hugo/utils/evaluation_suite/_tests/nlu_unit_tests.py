@@ -5,6 +5,9 @@ regressions, the Session Scratchpad, the Dialogue State (state.json serializatio
 write ops). The probabilistic (model-prediction) half lives in model_tests.py.
 Shared fixtures (minimal_config, engineer) live in conftest.py; `nlu` is NLU-only, below.
 """
+import json
+import threading
+import time
 from unittest.mock import MagicMock
 
 import pytest
@@ -153,6 +156,157 @@ class TestEnsembleVoting:
         assert result['confidence'] == pytest.approx(0.8)
 
 
+class TestQuorumVoting:
+    """thresholds.nlu_quorum: detect_flows returns once the votes in hand decide the outcome,
+    and starts the high voters as soon as two votes split."""
+
+    @pytest.fixture
+    def quorum(self, nlu, minimal_config):
+        nlu.dialogue_state.config = {**minimal_config, 'thresholds': {'nlu_quorum': True}}
+        nlu.dialogue_state.pred_intent = 'Draft'
+        return nlu
+
+    @staticmethod
+    def _voters(flows, hold=(), release=None):
+        """Mock engineer: (family, tier) -> flow list; families in `hold` block until `release`."""
+        calls = []
+
+        def mock_call(prompt, task='skill', family='', tier='med', max_tokens=1024, schema=None):
+            calls.append((family, tier))
+            if (family, tier) in hold:
+                release.wait(timeout=5)
+            return {'flows': list(flows[(family, tier)])}
+        return MagicMock(side_effect=mock_call), calls
+
+    def test_two_agreeing_mediums_decide_without_the_third(self, quorum):
+        from backend.components.dialogue_state import voter_stats
+        release = threading.Event()
+        engineer, calls = self._voters({('claude', 'med'): ['brainstorm'],
+                                        ('gemini', 'med'): ['brainstorm'],
+                                        ('gpt', 'med'): ['outline']},
+                                       hold={('gpt', 'med')}, release=release)
+        before = voter_stats()['quorum'].get('early_exits', 0)
+        result = quorum.dialogue_state.detect_flows(engineer, quorum.world.context, 'give me ideas')
+        assert not release.is_set()                     # gpt is still out
+        release.set()
+        assert result['flows'] == ['brainstorm']
+        assert result['confidence'] == pytest.approx(0.7)   # the floor with gpt dissenting
+        assert voter_stats()['quorum']['early_exits'] == before + 1
+        assert ('claude', 'high') not in calls
+
+    def test_a_flow_that_can_still_survive_keeps_the_round_open(self, quorum):
+        votes = {'claude': ['outline', 'compose'], 'gemini': ['outline'], 'gpt': ['outline', 'compose']}
+
+        def mock_call(prompt, task='skill', family='', tier='med', max_tokens=1024, schema=None):
+            if family == 'gpt':
+                time.sleep(0.2)                         # arrives last
+            return {'flows': list(votes[family])}
+        engineer = MagicMock(side_effect=mock_call)
+        result = quorum.dialogue_state.detect_flows(engineer, quorum.world.context, 'outline then write')
+        assert result['flows'] == ['outline', 'compose']    # gpt's vote made compose a survivor
+        assert result['confidence'] == pytest.approx(0.9)   # the full round, not a floor
+
+    def test_split_starts_the_high_voters_speculatively(self, quorum):
+        release = threading.Event()
+        flows = {('claude', 'med'): ['chat'], ('gemini', 'med'): ['brainstorm'],
+                 ('gpt', 'med'): ['outline'],
+                 ('gemini', 'high'): ['brainstorm'], ('claude', 'high'): ['brainstorm']}
+        engineer, calls = self._voters(flows, hold={('gpt', 'med')}, release=release)
+        original = engineer.side_effect
+
+        def releasing(*args, **kwargs):   # gpt only answers once a high voter has been called
+            if kwargs.get('tier') == 'high':
+                release.set()
+            return original(*args, **kwargs)
+        engineer.side_effect = releasing
+        start = time.perf_counter()
+        result = quorum.dialogue_state.detect_flows(engineer, quorum.world.context, 'give me ideas')
+        assert time.perf_counter() - start < 4     # without speculation gpt waits out its 5s hold
+        assert result['flows'][0] == 'brainstorm'
+        assert result['confidence'] == pytest.approx(0.8)   # same as the full ensemble
+        assert {('gemini', 'high'), ('claude', 'high')} <= set(calls)
+
+    def test_voter_latency_is_recorded(self, quorum):
+        from backend.components.dialogue_state import voter_stats
+        engineer, _ = self._voters({('claude', 'med'): ['chat'], ('gemini', 'med'): ['chat'],
+                                    ('gpt', 'med'): ['chat']})
+        quorum.dialogue_state.detect_flows(engineer, quorum.world.context, 'hello')
+        latency = voter_stats()['latency']
+        assert latency['voter/claude/med']['count'] >= 1
+        assert latency['voter/claude/med']['p50_ms'] is not None
+
+
+class TestTurnMemo:
+    """DialogueState's per-turn single flight: one classify/detect per (utterance, history)."""
+
+    @staticmethod
+    def _typesafe(calls):
+        def typesafe(document, questions):
+            calls.append(document)
+            return {'intent': {'choice': 'Draft'}, 'has_plan': {'noul': 0.0},
+                    'needs_clarify': {'noul': 0.0}}
+        return typesafe
+
+    def test_repeated_classification_calls_once(self, nlu):
+        calls = []
+        nlu.engineer.typesafe = self._typesafe(calls)
+        nlu.world.context.add_turn('user', {'text': 'give me ideas'})
+        state = nlu.dialogue_state
+        assert state.classify_intent(nlu.engineer, nlu.world.context, None) == 'Draft'
+        assert state.classify_intent(nlu.engineer, nlu.world.context, None) == 'Draft'
+        assert len(calls) == 1
+        assert state.memo_turn['classify_intent'] == {'requests': 2, 'shared': 1,
+                                                      'llm_calls': 1, 'saved': 1}
+
+    def test_concurrent_detections_share_one_ensemble(self, nlu):
+        gate = threading.Event()
+
+        def mock_call(prompt, task='skill', family='', tier='med', max_tokens=1024, schema=None):
+            gate.wait(timeout=5)
+            return {'flows': ['brainstorm']}
+        nlu.engineer = MagicMock(side_effect=mock_call)
+        state = nlu.dialogue_state
+        state.pred_intent = 'Draft'
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            state.detect_flows(nlu.engineer, nlu.world.context, 'give me ideas'))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        gate.set()
+        for thread in threads:
+            thread.join()
+        assert nlu.engineer.call_count == 3                # one ensemble, not two
+        assert results[0] == results[1] and results[0] is not results[1]
+        assert state.memo_turn['detect_flows']['saved'] == 3
+
+    def test_a_different_snippet_is_a_different_request(self, nlu):
+        nlu.engineer = MagicMock(return_value={'flows': ['chat']})
+        state = nlu.dialogue_state
+        state.pred_intent = 'Converse'
+        state.detect_flows(nlu.engineer, nlu.world.context, 'hello')
+        state.detect_flows(nlu.engineer, nlu.world.context, 'hello', 'narrowed to Converse')
+        assert nlu.engineer.call_count == 6
+
+    def test_new_turn_and_failures_are_not_memoized(self, nlu):
+        calls = []
+        nlu.engineer.typesafe = self._typesafe(calls)
+        state = nlu.dialogue_state
+        state.classify_intent(nlu.engineer, nlu.world.context, None)
+        state.begin_turn()
+        state.classify_intent(nlu.engineer, nlu.world.context, None)
+        assert len(calls) == 2
+        assert state.memo_totals['saved'] == 0
+
+        def down(document, questions):
+            raise RuntimeError('typesafe down')
+        nlu.engineer.typesafe = down
+        state.begin_turn()
+        assert state.classify_intent(nlu.engineer, nlu.world.context, None) == ''
+        nlu.engineer.typesafe = self._typesafe(calls)
+        assert state.classify_intent(nlu.engineer, nlu.world.context, None) == 'Draft'
+
+
 def _detection(pairs, confidence):
     """Build a detection dict from (flow_name, weight) pairs at a given top-1 confidence.
     `flows` carries the single survivor — multi-survivor plan detections build their dict
@@ -469,6 +623,38 @@ def test_nlu_react(nlu, monkeypatch, case):
 
 
 
+class TestSlotPromptPrefix:
+    """build_slot_filling_prompt renders the static prefix once per (flow, filled-slot set) and
+    appends only the <current_scenario> suffix per call."""
+
+    def test_prefix_is_byte_stable_across_calls(self):
+        from backend.prompts.for_nlu import build_slot_filling_prompt, prefix_cache_stats
+        first = build_slot_filling_prompt(flow_classes['outline'](), 'User: one', None)
+        hits = prefix_cache_stats()['hits']
+        second = build_slot_filling_prompt(flow_classes['outline'](), 'User: two', None)
+        cut = first.rfind('\n\n<current_scenario>')
+        assert cut > 0 and second[:cut] == first[:cut]
+        assert second[cut:].startswith('\n\n<current_scenario>\n## Conversation History\n\nUser: two')
+        assert prefix_cache_stats()['hits'] == hits + 1
+
+    def test_filled_slots_get_their_own_prefix(self):
+        from backend.prompts.for_nlu import build_slot_filling_prompt
+        open_flow, grounded = flow_classes['outline'](), flow_classes['outline']()
+        name = next(iter(grounded.slots))
+        grounded.slots[name].filled = True
+        plain = build_slot_filling_prompt(open_flow, 'User: hi', None)
+        filtered = build_slot_filling_prompt(grounded, 'User: hi', None)
+        assert f'### {name} ' in plain and f'### {name} ' not in filtered
+
+    def test_claude_breakpoint_sits_before_the_scenario(self):
+        messages = [{'role': 'user', 'content': '<role>r</role>\n\n<current_scenario>\nnow\n</current_scenario>'}]
+        marked = PromptEngineer._mark_scenario_prefix(messages)
+        prefix, scenario = marked[0]['content']
+        assert prefix == {'type': 'text', 'text': '<role>r</role>', 'cache_control': {'type': 'ephemeral'}}
+        assert prefix['text'] + scenario['text'] == messages[0]['content']
+        assert PromptEngineer._mark_scenario_prefix([{'role': 'user', 'content': 'hi'}])[0]['content'] == 'hi'
+
+
 # NLU-owned components: Session Scratchpad + Dialogue State ------------------------
 
 class TestSessionScratchpad:
@@ -559,6 +745,53 @@ class TestSessionScratchpad:
         with pytest.raises(KeyError):
             file_memory.amend_entry('audit', 7, {'note': 'x'})
 
+    # ── the log: deltas, offsets, compaction, crash safety ───────────
+
+    def test_consumption_survives_reopen(self, tmp_path):
+        path = tmp_path / 'scratchpad.jsonl'
+        pad = SessionScratchpad(scratchpad_path=str(path))
+        pad.append_entry('find', {'summary': 'a'})
+        assert pad.read()[0]['used_count'] == 0
+        reopened = SessionScratchpad(scratchpad_path=str(path))
+        assert reopened.read(consume=False)[0]['used_count'] == 1
+        assert reopened.read(unseen=True) == []
+
+    def test_other_writers_appends_are_folded_in(self, tmp_path):
+        path = tmp_path / 'scratchpad.jsonl'
+        reader = SessionScratchpad(scratchpad_path=str(path))
+        reader.append_entry('find', {'note': 'mine'})
+        reader.read()
+        SessionScratchpad(scratchpad_path=str(path)).append_entry('audit', {'note': 'theirs'})
+        assert [entry['note'] for entry in reader.read(unseen=True)] == ['theirs']
+
+    def test_compaction_keeps_live_entries_and_counts(self, file_memory, monkeypatch):
+        import backend.components.session_scratchpad as pad_mod
+        monkeypatch.setattr(pad_mod, '_COMPACT_AFTER', 4)
+        for idx in range(4):
+            file_memory.append_entry('find', {'turn_number': idx})
+        file_memory.prune_entry('find', 0)
+        for round_num in range(3):                  # 1 prune + 6 deltas: one compaction at 4
+            file_memory.amend_entry('find', 3, {'turn_number': 3, 'round': round_num}, reset=True)
+            file_memory.read(origin='find')
+        lines = file_memory._pathway.read_text(encoding='utf-8').splitlines()
+        assert sum('_delta' in line for line in lines) == 3
+        entries = SessionScratchpad(scratchpad_path=str(file_memory._pathway)).read(consume=False)
+        assert [entry['turn_number'] for entry in entries] == [1, 2, 3]
+        assert [entry['used_count'] for entry in entries] == [1, 1, 1]
+        assert entries[-1]['round'] == 2
+
+    def test_torn_tail_is_skipped_and_fenced(self, tmp_path):
+        path = tmp_path / 'scratchpad.jsonl'
+        pad = SessionScratchpad(scratchpad_path=str(path))
+        pad.append_entry('find', {'note': 'committed'})
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write('{"note": "half-writ')                   # crash mid-append
+        reopened = SessionScratchpad(scratchpad_path=str(path))
+        assert [entry['note'] for entry in reopened.read(consume=False)] == ['committed']
+        reopened.append_entry('find', {'note': 'after crash'})
+        fresh = SessionScratchpad(scratchpad_path=str(path))
+        assert [entry['note'] for entry in fresh.read(consume=False)] == ['committed', 'after crash']
+
 
 class TestScratchpadReview:
     """NLU.review_scratchpad — the synchronous review pass at NLU's turn point: repairs entries
@@ -583,6 +816,150 @@ class TestScratchpadReview:
 
 
 
+class TestTypeSafeClient:
+    """The pooled TypeSafe transport behind classify_intent: one keep-alive client, identical
+    requests share a round trip, failures are never reused."""
+
+    _DOC = {'history': '', 'utterance': 'draft a post about tea'}
+    _QUESTIONS = {'has_plan': {'type': 'noul'}}
+
+    @staticmethod
+    def _client(monkeypatch, handler, **kwargs):
+        import httpx
+        from backend.utilities.typesafe_client import TypeSafeClient
+        monkeypatch.setenv('TYPESAFE_API_KEY', 'test-key')
+        return TypeSafeClient('https://typesafe.test/v1', 'speed_latest',
+                              transport=httpx.MockTransport(handler), **kwargs)
+
+    @staticmethod
+    def _answer(request):
+        import httpx
+        body = json.loads(request.content)
+        return httpx.Response(200, json={'answers': {'utterance': body['document']['utterance']}})
+
+    def test_repeat_within_window_shares_one_request(self, monkeypatch):
+        sent = []
+
+        def handler(request):
+            sent.append(request.headers['authorization'])
+            return self._answer(request)
+        client = self._client(monkeypatch, handler)
+        first = client.ask(self._DOC, self._QUESTIONS)
+        second = client.ask(self._DOC, self._QUESTIONS)
+        assert first == second == {'utterance': 'draft a post about tea'}
+        assert sent == ['Bearer test-key']
+        other = client.ask({**self._DOC, 'utterance': 'publish it'}, self._QUESTIONS)
+        assert other == {'utterance': 'publish it'} and len(sent) == 2
+        stats = client.stats()
+        assert (stats['requests'], stats['shared']) == (2, 1)
+        assert stats['last_ms'] is not None
+
+    def test_expired_answer_is_refetched(self, monkeypatch):
+        sent = []
+        client = self._client(monkeypatch, lambda req: sent.append(1) or self._answer(req),
+                              share_s=0.0)
+        client.ask(self._DOC, self._QUESTIONS)
+        time.sleep(0.01)
+        client.ask(self._DOC, self._QUESTIONS)
+        assert len(sent) == 2
+
+    def test_process_client_is_built_once_per_key(self):
+        from backend.utilities.typesafe_client import typesafe_client
+        found = []
+        threads = [threading.Thread(target=lambda: found.append(
+            typesafe_client('https://ts.invalid/registry', 'm'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert len({id(client) for client in found}) == 1
+        assert typesafe_client('https://ts.invalid/registry', 'other') is not found[0]
+
+    def test_leader_and_followers_get_separate_answers(self, monkeypatch):
+        release = threading.Event()
+
+        def handler(request):
+            release.wait(timeout=5)
+            return self._answer(request)
+        client = self._client(monkeypatch, handler)
+        results = {}
+
+        def call(name):
+            results[name] = client.ask(self._DOC, self._QUESTIONS)
+        leader = threading.Thread(target=call, args=('leader',))
+        leader.start()
+        time.sleep(0.05)
+        follower = threading.Thread(target=call, args=('follower',))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join(timeout=5)
+        follower.join(timeout=5)
+        results['leader']['utterance'] = 'mutated'
+        assert results['follower'] == {'utterance': 'draft a post about tea'}
+        assert client.ask(self._DOC, self._QUESTIONS) == {'utterance': 'draft a post about tea'}
+
+    def test_settled_flights_are_pruned_on_completion(self, monkeypatch):
+        client = self._client(monkeypatch, self._answer, share_s=0.0)
+        client.ask(self._DOC, self._QUESTIONS)
+        assert client._flights == {}
+        client.share_s = 0.02
+        client.ask(self._DOC, self._QUESTIONS)
+        time.sleep(0.05)
+        client.ask({**self._DOC, 'utterance': 'publish it'}, self._QUESTIONS)
+        assert len(client._flights) == 1
+
+    def test_concurrent_callers_wait_on_the_first(self, monkeypatch):
+        release, sent = threading.Event(), []
+
+        def handler(request):
+            sent.append(1)
+            release.wait(timeout=5)
+            return self._answer(request)
+        client = self._client(monkeypatch, handler)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            client.ask(self._DOC, self._QUESTIONS))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert len(sent) == 1 and len(results) == 3
+
+    def test_failures_are_not_shared_afterwards(self, monkeypatch):
+        import httpx
+        statuses = [500, 200]
+
+        def handler(request):
+            status = statuses.pop(0)
+            return self._answer(request) if status == 200 else httpx.Response(status)
+        client = self._client(monkeypatch, handler)
+        with pytest.raises(httpx.HTTPStatusError):
+            client.ask(self._DOC, self._QUESTIONS)
+        assert client.ask(self._DOC, self._QUESTIONS) == {'utterance': 'draft a post about tea'}
+
+    def test_async_callers_share_with_each_other(self, monkeypatch):
+        import asyncio
+        sent = []
+        client = self._client(monkeypatch, lambda req: sent.append(1) or self._answer(req))
+
+        async def both():
+            return await asyncio.gather(client.aask(self._DOC, self._QUESTIONS),
+                                        client.aask(self._DOC, self._QUESTIONS))
+        first, second = asyncio.run(both())
+        assert first == second and len(sent) == 1
+
+    def test_missing_key_raises(self, monkeypatch):
+        client = self._client(monkeypatch, self._answer)
+        monkeypatch.delenv('TYPESAFE_API_KEY')
+        with pytest.raises(RuntimeError, match='TYPESAFE_API_KEY'):
+            client.ask(self._DOC, self._QUESTIONS)
+
+
+
+
 def _session_state() -> DialogueState:
     state = DialogueState({})
     state.pred_intent = 'Draft'
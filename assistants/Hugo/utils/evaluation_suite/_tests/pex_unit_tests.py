@@ -7,6 +7,8 @@ Shared fixtures (mock_agent, sessions_dir, engineer, orch_agent) live in conftes
 from __future__ import annotations
 import json
 import tempfile
+import threading
+import time
 import shutil
 from pathlib import Path
 from types import SimpleNamespace, MappingProxyType
@@ -19,7 +21,7 @@ from backend.modules.pex import READ_ONLY_DOMAIN_TOOLS
 from backend.components.task_artifact import TaskArtifact
 from backend.components.flow_stack import flow_classes
 from backend.components.user_preferences import UserPreferences
-from backend.components.prompt_engineer import PromptEngineer
+from backend.components.prompt_engineer import PromptEngineer, ToolDispatcher
 from backend.prompts.for_orchestrator import build_orchestrator_prompt
 from schemas.config import load_config
 from schemas.ontology import FLOW_ONTOLOGY
@@ -99,6 +101,33 @@ class TestOrchestratorToolDefs:
         assert READ_ONLY_DOMAIN_TOOLS == ('find_posts', 'read_metadata', 'read_section',
                                           'search_notes', 'list_channels', 'channel_status')
 
+    def test_tool_lists_built_once_and_shared(self, mock_agent, monkeypatch):
+        pex = mock_agent.pex
+        orch = pex.get_tools_for_orchestrator()
+        flow = pex.get_tools_for_flow(pex.flow_stack.stackon('outline'))
+        calls = []
+        monkeypatch.setattr(type(pex), '_get_tool_def', lambda self, name: calls.append(name))
+        assert pex.get_tools_for_orchestrator() is orch
+        assert pex.get_tools_for_flow(flow_classes['outline']()) is flow
+        assert calls == []   # served from the memo, no rebuild
+        assert isinstance(orch, tuple) and isinstance(flow, tuple)
+
+    def test_provider_payloads_are_byte_identical(self, mock_agent):
+        pex = mock_agent.pex
+        tools = pex.get_tools_for_flow(flow_classes['outline']())
+        first = PromptEngineer._tool_payload('anthropic', tools)
+        second = PromptEngineer._tool_payload('anthropic', list(tools))
+        assert json.dumps(first) == json.dumps(second)
+        assert all(a is b for a, b in zip(first, second))
+        assert first[-1]['cache_control'] == {'type': 'ephemeral'}
+        assert all(set(tool) == {'name', 'description', 'input_schema'} for tool in first[:-1])
+        for family in ('claude', 'gemini', 'gpt'):
+            adapted = PromptEngineer._tool_payload(family, tools)
+            assert adapted == PromptEngineer._adapt_tool_defs(family, tools)
+            assert adapted[0] is PromptEngineer._tool_payload(family, tools)[0]
+        trimmed = [tool for tool in tools if tool['name'] != 'scratchpad']
+        assert 'scratchpad' not in {tool['name'] for tool in PromptEngineer._tool_payload('anthropic', trimmed)}
+
 
 
 
@@ -559,6 +588,94 @@ class TestEvalContentBoundary:
         assert entries == [{'post_id': 'standing', 'title': 'Standing'}]
 
 
+def _sandbox_probe(case:dict, trace_path:Path) -> str:
+    """A scenario stand-in for TestParallelRunner: report the worker's database root."""
+    from backend.utilities import services
+    from utils.evaluation_suite.trace_writer import write_record
+    write_record(trace_path, {'convo_id': case['convo_id'], 'turn_index': 0})
+    write_record(trace_path, {'convo_id': case['convo_id'], 'turn_index': 1})
+    return str(services._DB_DIR)
+
+
+class TestParallelRunner:
+    """The --workers pool: sandboxed database/ per worker, per-worker trace parts merged in order,
+    and the deterministic offline model the runner is benchmarked with."""
+
+    def test_workers_run_in_sandboxes_and_merge_traces(self, tmp_path):
+        from backend.utilities import services
+        from utils.evaluation_suite.parallel import run_cases
+        cases = [{'convo_id': f'B9.C{idx}'} for idx in range(3)]
+        report = tmp_path / 'traces_x.jsonl'
+        roots = run_cases(_sandbox_probe, cases, (), report, workers=2)
+        assert len(roots) == 3 and str(services._DB_DIR) not in roots
+        assert all(root.endswith('database') for root in roots)
+        records = [json.loads(line) for line in report.read_text().splitlines()]
+        assert [(rec['convo_id'], rec['turn_index']) for rec in records] == [
+            (case['convo_id'], turn) for case in cases for turn in (0, 1)]
+        assert list(tmp_path.iterdir()) == [report]           # parts merged and removed
+
+    def test_concurrent_publish_of_one_session_never_mixes(self, tmp_path):
+        from utils.evaluation_suite.parallel import publish_session
+        sandboxes = []
+        for level in ('trace', 'eval'):
+            session = tmp_path / level / 'sessions' / 'B9.C0'
+            session.mkdir(parents=True)
+            for idx in range(20):
+                (session / f'{level}_{idx}.json').write_text(level)
+            sandboxes.append(session)
+        target = tmp_path / 'database' / 'sessions' / 'B9.C0'
+        errors = []
+
+        def publish(session):
+            try:
+                for _ in range(25):
+                    publish_session(session, target)
+            except Exception as ecp:
+                errors.append(ecp)
+
+        threads = [threading.Thread(target=publish, args=(session,)) for session in sandboxes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        levels = {path.read_text() for path in target.iterdir()}
+        assert len(levels) == 1 and len(list(target.iterdir())) == 20
+        assert [path.name for path in target.parent.iterdir()] == ['B9.C0']   # nothing staged left
+
+    def test_merge_orders_parts_by_scenario(self, tmp_path):
+        from utils.evaluation_suite.parallel import merge_parts
+        report = tmp_path / 'evals_trace_x.jsonl'
+        (tmp_path / 'evals_trace_x.w1.jsonl').write_text('{"convo_id": "b", "n": 1}\n'
+                                                         '{"convo_id": "b", "n": 2}\n')
+        (tmp_path / 'evals_trace_x.w2.jsonl').write_text('{"convo_id": "a", "n": 1}\n')
+        merge_parts(report, ['a', 'b'])
+        assert [json.loads(line)['n'] for line in report.read_text().splitlines()] == [1, 1, 2]
+
+    def test_fake_llm_is_deterministic_and_schema_valid(self, engineer):
+        from pydantic import BaseModel
+        from utils.evaluation_suite.fake_llm import FakeLLM
+
+        class Detection(BaseModel):
+            flows: list[str]
+            confidence: float
+
+        schema = {'type': 'object', 'required': ['flows'], 'properties': {
+            'flows': {'type': 'array', 'items': {'type': 'string', 'enum': ['chat', 'outline']}}}}
+        fake = FakeLLM()
+        fake.install(engineer)
+        first = engineer('which flow?', schema=schema)
+        assert first == engineer('which flow?', schema=schema)
+        assert len(first['flows']) == 1 and first['flows'][0] in ('chat', 'outline')
+        assert isinstance(engineer('detect', schema=Detection), Detection)
+        answers = engineer.typesafe({'utterance': 'hi'}, {
+            'intent': {'type': 'choice', 'criteria': {'Draft': '', 'Converse': ''}},
+            'has_plan': {'type': 'noul'}})
+        assert answers['intent']['choice'] in ('Draft', 'Converse')
+        assert answers['has_plan'] == {'noul': 0.0}
+        assert fake.calls['typesafe'] == 1
+
+
 # ═══════════════════════════════════════════════════════════════════
 # Orchestrator system prompt — three tiers, frozen per session (changes.md §7)
 # ═══════════════════════════════════════════════════════════════════
@@ -795,6 +912,258 @@ class TestOrchestratorLoop:
 
 
 
+class TestToolDispatcher:
+    """One model response's tool calls: read-only tools fan out, writes stay serialized in model
+    order, and results come back in model order whatever finished first."""
+
+    def test_read_only_calls_overlap(self):
+        """Two reads meet at a barrier — run back to back they would time out instead."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def call_tool(name, args):
+            barrier.wait()
+            return {'_success': True, 'name': name}
+        dispatcher = ToolDispatcher(call_tool, read_only={'find_posts', 'read_section'})
+        results = dispatcher.run([('find_posts', {}), ('read_section', {})])
+        assert [res['name'] for res in results] == ['find_posts', 'read_section']
+
+    def test_writes_are_barriers(self):
+        events = []
+
+        def call_tool(name, args):
+            events.append(('start', name))
+            time.sleep(0.02 if name == 'read_a' else 0)
+            events.append(('end', name))
+            return {'_success': True, 'name': name}
+        dispatcher = ToolDispatcher(call_tool, read_only={'read_a', 'read_b', 'read_c'})
+        results = dispatcher.run([('read_a', {}), ('read_b', {}), ('update_post', {}),
+                                  ('read_c', {})])
+        assert [res['name'] for res in results] == ['read_a', 'read_b', 'update_post', 'read_c']
+        write = events.index(('start', 'update_post'))
+        assert {('end', 'read_a'), ('end', 'read_b')} <= set(events[:write])
+        assert events[write + 1] == ('end', 'update_post')   # the write ran alone
+        assert events.index(('start', 'read_c')) > write
+
+    def test_openai_loop_threads_results_in_model_order(self, engineer):
+        """The slow first read finishes last, yet its tool message still comes first."""
+        def tool_call(call_id, name):
+            return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments='{}'))
+        replies = [[tool_call('c1', 'find_posts'), tool_call('c2', 'read_section')], None]
+        sent = []
+
+        def create(**kwargs):
+            sent.append([dict(msg) for msg in kwargs['messages']])
+            msg = SimpleNamespace(content='done', tool_calls=replies.pop(0))
+            return SimpleNamespace(choices=[SimpleNamespace(message=msg)])
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        def call_tool(name, args):
+            time.sleep(0.05 if name == 'find_posts' else 0)
+            return {'_success': True, 'tool': name}
+        dispatcher = ToolDispatcher(call_tool, read_only={'find_posts', 'read_section'})
+        text, tool_log = engineer._openai_tool_loop(
+            client=client, system='', messages=[], model_id='m', tool_defs=[],
+            call_tool=dispatcher, max_tokens=16, max_num_calls=3,
+            completion_tokens_param=True, allow_streaming_fallback=False)
+        assert text == 'done'
+        assert [entry['tool'] for entry in tool_log] == ['find_posts', 'read_section']
+        assert [msg['tool_call_id'] for msg in sent[1] if msg['role'] == 'tool'] == ['c1', 'c2']
+
+    def test_policy_trace_keeps_model_order(self, orch_agent, monkeypatch):
+        """The slow first read finishes last, yet subagents.jsonl and `calls` list it first."""
+        orch_agent.world.open_session('trace-order')
+        pex = orch_agent.pex
+
+        def call_tool(name, params):
+            time.sleep(0.05 if name == 'find_posts' else 0)
+            return {'_success': True, '_error': ''}
+
+        def execute(state, context, tools):
+            dispatcher = ToolDispatcher(tools, read_only={'find_posts', 'read_section'})
+            dispatcher.run([('find_posts', {}), ('read_section', {}), ('update_post', {})])
+            return TaskArtifact(origin='chat')
+        monkeypatch.setattr(pex, 'call_tool', call_tool)
+        monkeypatch.setitem(pex._policies, 'Converse',
+                            SimpleNamespace(execute=execute, pop_completion=lambda: None))
+        flow = SimpleNamespace(intent='Converse', name=lambda: 'chat', status='Active')
+        pex.call_policy(flow)
+        orch_agent.world.journal.commit()
+        lines = (orch_agent.world.session_dir() / 'subagents.jsonl').read_text().splitlines()
+        record = json.loads(lines[-1])
+        assert [call['tool'] for call in record['calls']] == ['find_posts', 'read_section', 'update_post']
+        assert all(call['_success'] for call in record['calls'])
+
+    def test_tool_defs_declare_read_only(self, mock_agent):
+        pex = mock_agent.pex
+        for name in READ_ONLY_DOMAIN_TOOLS:
+            assert pex._get_tool_def(name)['read_only'] is True
+        for name in ('create_post', 'update_post', 'write_text', 'release_post'):
+            assert pex._get_tool_def(name)['read_only'] is False
+        assert 'read_only' not in pex._def_scratchpad()   # component tools always serialize
+
+
+class TestResponseCache:
+    """The opt-in content-addressed response cache in PromptEngineer.__call__."""
+
+    @staticmethod
+    def _engineer(minimal_config, **cache):
+        config = {**minimal_config, 'llm_cache': {'enabled': True, **cache}}
+        return PromptEngineer(config)
+
+    @staticmethod
+    def _count_gemini(engineer, monkeypatch):
+        calls = []
+
+        def fake(system, messages, model_id, max_tokens=4096, schema_dict=None):
+            calls.append(messages[-1]['content'])
+            return f'reply {len(calls)}'
+        monkeypatch.setattr(engineer, '_call_gemini', fake)
+        return calls
+
+    def test_disabled_by_default(self, engineer):
+        assert engineer.response_cache is None
+
+    def test_identical_requests_hit(self, minimal_config, monkeypatch):
+        engineer = self._engineer(minimal_config)
+        calls = self._count_gemini(engineer, monkeypatch)
+        assert engineer('hello', task='detect_flow') == 'reply 1'
+        assert engineer('hello', task='detect_flow') == 'reply 1'
+        assert engineer('hello', task='detect_flow', max_tokens=64) == 'reply 2'   # a new request
+        assert len(calls) == 2
+        stats = engineer.response_cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 2)
+        assert stats['by_task'] == {'detect_flow': {'hits': 1, 'misses': 2}}
+
+    def test_disk_tier_replays_across_engineers(self, minimal_config, monkeypatch, tmp_path):
+        first = self._engineer(minimal_config, path=str(tmp_path / 'llm.db'))
+        self._count_gemini(first, monkeypatch)
+        first('hello', task='fill_slots')
+        second = self._engineer(minimal_config, path=str(tmp_path / 'llm.db'))
+        calls = self._count_gemini(second, monkeypatch)
+        assert second('hello', task='fill_slots') == 'reply 1'
+        assert calls == []
+        assert second.response_cache.stats()['disk_hits'] == 1
+
+    def test_ttls_per_task(self, minimal_config, monkeypatch, tmp_path):
+        from backend.utilities import response_cache
+        engineer = self._engineer(minimal_config, path=str(tmp_path / 'llm.db'),
+                                  ttl_s={'default': 60, 'clarify': 0})
+        calls = self._count_gemini(engineer, monkeypatch)
+        engineer('q', task='clarify')
+        engineer('q', task='clarify')
+        assert len(calls) == 2                      # a zero TTL never caches
+        engineer('q', task='skill')
+        now = time.time()
+        monkeypatch.setattr(response_cache.time, 'time', lambda: now + 120)
+        engineer('q', task='skill')
+        assert len(calls) == 4                      # expired in memory and on disk
+
+    def test_lru_evicts_oldest(self, minimal_config, monkeypatch):
+        engineer = self._engineer(minimal_config, max_entries=2)
+        calls = self._count_gemini(engineer, monkeypatch)
+        for prompt in ('a', 'b', 'c', 'a'):
+            engineer(prompt)
+        assert calls == ['a', 'b', 'c', 'a']
+
+    def test_claude_rounds_round_trip(self, minimal_config, monkeypatch):
+        import anthropic
+        engineer = self._engineer(minimal_config)
+        message = anthropic.types.Message.model_validate({
+            'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': 'claude',
+            'content': [{'type': 'tool_use', 'id': 'toolu_1', 'name': 'find_posts',
+                         'input': {'query': 'x'}}],
+            'stop_reason': 'tool_use', 'stop_sequence': None,
+            'usage': {'input_tokens': 5, 'output_tokens': 3}})
+        calls = []
+        monkeypatch.setattr(engineer, '_call_claude',
+                            lambda *args, **kwargs: calls.append(1) or message)
+        msgs = [{'role': 'user', 'content': 'find x'}]
+        engineer('system', msgs, family='claude')
+        replay = engineer('system', [dict(msg) for msg in msgs], family='claude')
+        assert len(calls) == 1
+        assert replay == message and replay.content[0].input == {'query': 'x'}
+
+    def test_hit_streams_whole_text_once(self, minimal_config, monkeypatch):
+        engineer = self._engineer(minimal_config)
+        self._count_gemini(engineer, monkeypatch)
+        engineer('hello')
+        deltas = []
+        assert engineer('hello', on_text=deltas.append) == 'reply 1'
+        assert deltas == ['reply 1']
+
+
+class TestStreaming:
+    """Turns stream reply deltas and tool progress to `on_event`; the final payload is unchanged."""
+
+    @staticmethod
+    def _stream_script(agent, responses):
+        """Like `_script`, but the fake provider also streams each response's text blocks."""
+        queue = list(responses)
+
+        def call(system, messages, model_id, *, tools=None, max_tokens=4096, schema_dict=None,
+                 on_text=None):
+            response = queue.pop(0)
+            for block in response.content:
+                if on_text and block.type == 'text':
+                    for word in block.text.split(' '):
+                        on_text(word + ' ')
+            return response
+        agent.engineer._call_claude = call
+        return queue
+
+    def test_reply_streams_after_tool_progress(self, orch_agent):
+        self._stream_script(orch_agent, [
+            _response(_tool_block('scratchpad', {'op': 'read'})),
+            _response(_text_block('Here is the plan.'))])
+        events = []
+        result = orch_agent.take_turn('what is on the pad?', on_event=events.append)
+        assert result['message'] == 'Here is the plan.'
+        assert events[0] == {'stream': 'progress', 'tools': ['scratchpad']}
+        deltas = [event['text'] for event in events[1:] if event['stream'] == 'delta']
+        assert ''.join(deltas).strip() == 'Here is the plan.'
+        assert orch_agent.pex.on_event is None      # the listener never outlives its turn
+
+    def test_tool_round_preamble_is_closed_by_its_progress(self, orch_agent):
+        """The tracer's time-to-first-token restarts at each `progress`, so preamble text streamed
+        by a tool round must reach the listener before that round's progress event."""
+        self._stream_script(orch_agent, [
+            _response(_text_block('Let me check.'), _tool_block('scratchpad', {'op': 'read'})),
+            _response(_text_block('Here is the plan.'))])
+        events = []
+        orch_agent.take_turn('what is on the pad?', on_event=events.append)
+        progress = events.index({'stream': 'progress', 'tools': ['scratchpad']})
+        before = ''.join(event['text'] for event in events[:progress] if event['stream'] == 'delta')
+        after = ''.join(event['text'] for event in events[progress:] if event['stream'] == 'delta')
+        assert (before.strip(), after.strip()) == ('Let me check.', 'Here is the plan.')
+
+    def test_turn_without_listener_does_not_stream(self, orch_agent):
+        seen = []
+
+        def call(system, messages, model_id, *, tools=None, max_tokens=4096, schema_dict=None,
+                 **stream):
+            seen.append(stream)
+            return _response(_text_block('Done.'))
+        orch_agent.engineer._call_claude = call
+        assert orch_agent.take_turn('thanks')['message'] == 'Done.'
+        assert seen == [{}]
+
+    def test_async_stream_yields_chunks_for_other_families(self, engineer, monkeypatch):
+        import asyncio
+        import backend.components.prompt_engineer as pe
+
+        def call_gemini(system, messages, model_id, max_tokens=4096, schema_dict=None,
+                        on_text=None):
+            for chunk in ('one ', 'two ', 'three'):
+                on_text(chunk)
+            return 'one two three'
+        monkeypatch.setattr(pe, 'ACTIVE_FAMILY', 'gemini')
+        engineer._call_gemini = call_gemini
+
+        async def collect():
+            return [chunk async for chunk in engineer.stream('count to three')]
+        assert asyncio.run(collect()) == ['one ', 'two ', 'three']
+
+
 class TestOrchestratorClickTurns:
     """Round 2.16 (option b): no click bypass — every turn rides the agent loop. prepare()'s
     [click] note forces the agent's first round to run the stacked flow via manage_flows."""
@@ -1218,6 +1587,265 @@ class TestPostService:
         assert result['_error'] == 'not_found'
 
 
+class TestMetadataStore:
+    """The indexed in-process view over metadata.json: parse once per file version, row-level
+    writes, and the JSON file stays the source of truth."""
+
+    def test_reads_do_not_reparse_own_writes(self, tmp_db, monkeypatch):
+        import backend.utilities.services as svc_mod
+        post_id, _ = _seed_test_post(tmp_db, title='Cached Post')
+        svc = PostService()
+        calls = []
+        real_loads = svc_mod.json.loads
+        monkeypatch.setattr(svc_mod.json, 'loads', lambda *a, **kw: calls.append(1) or real_loads(*a, **kw))
+        for _ in range(5):
+            svc.get_title(post_id)
+            svc.find_posts(status='draft')
+        assert calls == []
+
+    def test_external_rewrite_is_picked_up(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Before Rewrite')
+        svc = PostService()
+        assert svc.get_title(post_id) == 'Before Rewrite'
+        meta_file = tmp_db / 'content' / 'metadata.json'
+        data = json.loads(meta_file.read_text())
+        data['entries'][0]['title'] = 'After Rewrite, Longer'
+        meta_file.write_text(json.dumps(data))
+        assert svc.get_title(post_id) == 'After Rewrite, Longer'
+
+    def test_row_level_put_and_remove_persist(self, tmp_db):
+        first, _ = _seed_test_post(tmp_db, title='First')
+        second, _ = _seed_test_post(tmp_db, title='Second')
+        svc = PostService()
+        ent = svc._get_entry(first)
+        ent['tags'] = ['kept']
+        svc._save_entry(ent)
+        svc._store.remove(second)
+        on_disk = json.loads((tmp_db / 'content' / 'metadata.json').read_text())['entries']
+        assert [e['post_id'] for e in on_disk] == [first]
+        assert on_disk[0]['tags'] == ['kept']
+
+    def test_returned_rows_are_copies(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Copy Me')
+        svc = PostService()
+        svc._get_entry(post_id)['tags'].append('leak')
+        svc._load_metadata()[0]['title'] = 'leak'
+        ent = svc._get_entry(post_id)
+        assert ent['tags'] == [] and ent['title'] == 'Copy Me'
+
+    def test_status_and_title_indexes(self, tmp_db):
+        _seed_test_post(tmp_db, title='Draft One')
+        _seed_test_post(tmp_db, title='', status='note', body='note body text')
+        svc = PostService()
+        assert [e['status'] for e in svc._store.select('note')] == ['note']
+        assert [e['title'] for e in svc._store.find_title('draft one')] == ['Draft One']
+
+    def test_put_updates_indexes_in_place(self, tmp_db, monkeypatch):
+        ids = [_seed_test_post(tmp_db, title=f'Post {idx}')[0] for idx in range(4)]
+        store = PostService()._store
+        store.entries()
+        monkeypatch.setattr(store, '_reindex', lambda: pytest.fail('put re-indexed every row'))
+        moved = store.get(ids[1])
+        moved.update(status='published', title='Renamed')
+        store.put(moved)
+        store.put({'post_id': 'fresh', 'title': 'Post 0', 'status': 'draft'})
+        indexes = (store._by_id, store._by_status, store._by_title)
+        monkeypatch.undo()
+        store._reindex()
+        assert indexes == (store._by_id, store._by_status, store._by_title)
+        assert [e['post_id'] for e in store.find_title('post 0')] == [ids[0], 'fresh']
+        assert [e['post_id'] for e in store.select('published')] == [ids[1]]
+
+
+class TestParsedPostCache:
+    """Parsed post bodies reused across tool calls: keyed by the body text, carried over section by
+    section when one section is rewritten."""
+
+    @staticmethod
+    def _walk_sections(content):
+        """The line-by-line parse `_extract_sections` replaced, as the reference."""
+        sections, current = [], None
+        for line in content.split('\n'):
+            if line.startswith('## '):
+                if current:
+                    sections.append(current)
+                title = line[3:].strip()
+                current = {'sec_id': ContentService._slugify(title), 'title': title, 'lines': []}
+            elif current is not None:
+                current['lines'].append(line)
+        if current:
+            sections.append(current)
+        return sections
+
+    def test_extract_sections_matches_line_walk(self):
+        samples = ['', 'preamble only', '## Solo', '## Solo\n', '## A\n## B', '## A\n\n## B\n',
+                   'intro\n## A \nbody\n### Sub\n##not heading\n\n## B\n- one\n- two\n\n',
+                   '## A\n  ## indented\ntext ## mid\n## C']
+        for content in samples:
+            assert ContentService._extract_sections(content) == self._walk_sections(content), content
+
+    def test_rewrite_resplits_only_the_changed_section(self, tmp_db, monkeypatch):
+        import backend.utilities.services as svc_mod
+        body = '## Intro\n\nFirst one. Second one.\n\n## Body\n\nAlpha here. Beta here. Gamma.\n'
+        post_id, _ = _seed_test_post(tmp_db, title='Parse Once', body=body)
+        post_svc, content_svc = PostService(), ContentService()
+        splits = []
+        real_split = svc_mod.split_sentences
+        monkeypatch.setattr(svc_mod, 'split_sentences', lambda text: splits.append(text) or real_split(text))
+        for _ in range(3):
+            post_svc.read_metadata(post_id)
+            post_svc.read_section(post_id, 'body', snip_id=1)
+        assert len(splits) == 2
+        splits.clear()
+        assert content_svc.revise_content(post_id, 'intro', 'Only one now.')['_success']
+        assert post_svc.read_section(post_id, 'body', snip_id=1)['content'] == 'Beta here.'
+        assert post_svc.read_section(post_id, 'intro')['sentence_count'] == 1
+        assert [text.strip() for text in splits] == ['Only one now.']
+
+    def test_outside_edit_is_picked_up(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Edited Outside', body='## Intro\n\nCats nap.\n')
+        svc = PostService()
+        assert svc.read_section(post_id, 'intro')['content'] == 'Cats nap.'
+        path = tmp_db / 'content' / svc._get_entry(post_id)['filename']
+        path.write_text(path.read_text().replace('Cats nap.', 'Dogs run.'))
+        assert svc.read_section(post_id, 'intro')['content'] == 'Dogs run.'
+
+    def test_word_count_after_write(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Counted', body='## Intro\n\nOne two three.\n')
+        svc = ContentService()
+        svc.revise_content(post_id, 'intro', 'One <b>two</b> three four.')
+        assert svc._get_entry(post_id)['word_count'] == 6
+
+
+class TestPreviewCache:
+    """The sidebar listing kept across PostService instances: rebuilt only after a change, with
+    version tokens for delta listings."""
+
+    def test_unchanged_library_reads_no_files(self, tmp_db, monkeypatch):
+        _seed_test_post(tmp_db, title='Draft A')
+        _seed_test_post(tmp_db, title='', status='note', body='a standing note')
+        first = PostService().list_preview()
+        reads = []
+        real_read = PostService._read_content
+        monkeypatch.setattr(PostService, '_read_content',
+                            lambda self, filename: reads.append(filename) or real_read(self, filename))
+        again = PostService().list_preview()
+        assert reads == []
+        assert again['items'] == first['items'] and again['version'] == first['version']
+        assert [item.get('content') for item in again['items']] == [None, 'a standing note']
+
+    def test_delta_since_token_holds_only_changed_rows(self, tmp_db):
+        first_id, _ = _seed_test_post(tmp_db, title='First', body='## Intro\n\nOld words.\n')
+        second_id, _ = _seed_test_post(tmp_db, title='Second')
+        token = PostService().list_preview()['version']
+        ContentService().revise_content(first_id, 'intro', 'New words entirely.')
+        delta = PostService().list_preview(since=token)
+        assert delta['delta'] is True
+        assert [item['post_id'] for item in delta['items']] == [first_id]
+        assert delta['items'][0]['preview'] == 'New words entirely.'
+        assert delta['order'] == [first_id, second_id]
+        unchanged = PostService().list_preview(since=delta['version'])
+        assert unchanged['items'] == [] and unchanged['version'] == delta['version']
+        assert 'delta' not in PostService().list_preview(since='stale-3')
+
+    def test_delete_shifts_rows_into_the_delta(self, tmp_db):
+        ids = [_seed_test_post(tmp_db, title=f'Post {idx}')[0] for idx in range(3)]
+        token = PostService().list_preview()['version']
+        PostService().delete_post(ids[0])
+        delta = PostService().list_preview(since=token)
+        assert delta['order'] == ids[1:]
+        assert {item['post_id'] for item in delta['items']} == set(ids[1:])
+
+    def test_note_write_and_outside_edit(self, tmp_db):
+        note_id, _ = _seed_test_post(tmp_db, title='', status='note', body='first draft of a note')
+        svc = PostService()
+        svc.list_preview()
+        path = tmp_db / 'content' / svc._get_entry(note_id)['filename']
+        path.write_text('edited outside the app', encoding='utf-8')
+        assert svc.list_preview()['items'][0]['content'] == 'first draft of a note'
+        assert svc.list_preview(refresh=True)['items'][0]['content'] == 'edited outside the app'
+        path.write_text('edited by update_note', encoding='utf-8')
+        svc._previews.invalidate(note_id)
+        assert svc.list_preview()['items'][0]['content'] == 'edited by update_note'
+
+    def test_returned_rows_are_copies(self, tmp_db):
+        _seed_test_post(tmp_db, title='Tagged')
+        PostService().list_preview()['items'][0]['metadata']['tags'].append('leak')
+        assert PostService().list_preview()['items'][0]['metadata']['tags'] == []
+
+
+class TestSearchIndex:
+    """The inverted index behind find_posts / search_notes: incremental upkeep by the mutators,
+    substring-superset candidates, and BM25 ranking."""
+
+    def test_find_posts_sees_revised_content(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Index Me')
+        ContentService().revise_content(post_id, 'introduction', 'Quantum gardening tips.')
+        result = PostService().find_posts(query='quantum garden')
+        assert [item['post_id'] for item in result['items']] == [post_id]
+        assert 'Quantum gardening' in result['items'][0]['preview_snippet']
+
+    def test_deleted_post_leaves_the_index(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Ephemeral Zebra')
+        svc = PostService()
+        assert svc.find_posts(query='zebra')['count'] == 1
+        svc.delete_post(post_id)
+        assert svc.find_posts(query='zebra')['count'] == 0
+        assert svc._index.search('zebra') == []
+
+    def test_metadata_token_substring_still_matches(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Gridlock Batteries')
+        result = PostService().find_posts(query='lock batter')
+        assert [item['post_id'] for item in result['items']] == [post_id]
+
+    def test_bm25_ranks_denser_match_first(self, tmp_db):
+        svc = PostService()
+        sparse = svc.create_post(title='Sparse', type='note', topic='one mention of kelp here')['post_id']
+        dense = svc.create_post(title='Dense', type='note', topic='kelp kelp kelp forests')['post_id']
+        result = svc.search_notes(query='kelp')
+        assert [item['post_id'] for item in result['items']] == [dense, sparse]
+
+    def test_index_syncs_with_outside_metadata_writes(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='', status='note', body='first draft words')
+        svc = PostService()
+        assert svc.search_notes(query='first draft')['count'] == 1
+        ent = svc._get_entry(post_id)
+        (tmp_db / 'content' / ent['filename']).write_text('rewritten by the router', encoding='utf-8')
+        entries = svc._load_metadata()
+        entries[0]['updated_at'] = svc._now()
+        svc._store.save(entries)  # bypasses the service hook, like a second writer
+        assert svc.search_notes(query='first draft')['count'] == 0
+        assert svc.search_notes(query='router')['count'] == 1
+
+    def test_queries_skip_sync_until_metadata_moves(self, tmp_db, monkeypatch):
+        _seed_test_post(tmp_db, title='Steady Library')
+        svc = PostService()
+        svc.find_posts(query='steady')
+        loads = []
+        monkeypatch.setattr(svc._store, 'entries', lambda: loads.append(1) or [])
+        for _ in range(3):
+            assert svc.find_posts(query='library')['count'] == 1
+        assert loads == []                              # no metadata copy per query
+
+    def test_note_edited_on_disk_is_reindexed(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='', status='note', body='original pelican notes')
+        svc = PostService()
+        assert svc.search_notes(query='pelican')['count'] == 1
+        ent = svc._get_entry(post_id)
+        (tmp_db / 'content' / ent['filename']).write_text('now about flamingos', encoding='utf-8')
+        svc._index.rescan_s = 0                         # the rescan window has passed
+        assert svc.search_notes(query='flamingo')['count'] == 1
+        assert svc._index.search('pelican') == []
+
+    def test_substring_expansion_uses_the_suffix_table(self, tmp_db):
+        post_id, _ = _seed_test_post(tmp_db, title='Unbelievable Aardvarks')
+        index = PostService()._index
+        index.refresh(None, PostService()._load_metadata, PostService()._read_content)
+        index._vocab = {}                               # expansion must not walk the vocabulary
+        assert index.search('believ vark') == [post_id]
+        assert index.search('aa') == [post_id] and index.search('zzz') == []
+
+
 # ═══════════════════════════════════════════════════════════════════
 # ContentService
 # ═══════════════════════════════════════════════════════════════════
@@ -1452,6 +2080,125 @@ class TestContentService:
         assert 'additions' in result
         assert 'deletions' in result
 
+class TestWebSearch:
+    @staticmethod
+    def _client(tmp_path, backend, **kwargs):
+        from backend.utilities.response_cache import ResponseCache
+        from backend.utilities.web_search import WebSearch
+        cache = ResponseCache(tmp_path / 'search.db', ttl_s={'web_search': 3600})
+        return WebSearch(backend, cache, **kwargs)
+
+    @staticmethod
+    def _tavily(handler):
+        import httpx
+        from backend.utilities.web_search import TavilyBackend
+        return TavilyBackend('test-key', transport=httpx.MockTransport(handler))
+
+    def test_normalized_queries_share_one_request(self, tmp_path):
+        from backend.utilities.web_search import FakeSearchBackend
+        backend = FakeSearchBackend()
+        client = self._client(tmp_path, backend)
+        first = client.search('Cheetah  Sprint speed', limit=3)
+        again = client.search('  cheetah sprint SPEED ', limit=3)
+        assert again == first and len(first) == 3
+        assert backend.calls == 1
+        client.search('cheetah sprint speed', limit=5)       # a different limit is a different entry
+        assert backend.calls == 2
+
+    def test_results_persist_across_clients(self, tmp_path):
+        from backend.utilities.web_search import FakeSearchBackend
+        corpus = [{'title': 'Cheetah physiology', 'url': 'https://a.example', 'content': 'Sprint muscles.'},
+                  {'title': 'Savanna grasses', 'url': 'https://b.example', 'content': 'Cheetah habitat.'}]
+        warm = self._client(tmp_path, FakeSearchBackend(corpus))
+        items = warm.search('cheetah sprint')
+        assert [item['url'] for item in items] == ['https://a.example', 'https://b.example']
+        backend = FakeSearchBackend(corpus)
+        cold = self._client(tmp_path, backend)
+        assert cold.search('Cheetah Sprint') == items
+        assert backend.calls == 0
+        assert cold.stats()['disk_hits'] == 1
+
+    def test_batch_runs_concurrently_and_dedupes(self, tmp_path):
+        from backend.utilities.web_search import FakeSearchBackend
+        backend = FakeSearchBackend(latency_s=0.1)
+        client = self._client(tmp_path, backend, max_concurrency=6)
+        queries = [f'topic {idx}' for idx in range(6)] + ['Topic 0']
+        start = time.perf_counter()
+        results = client.search_many(queries, limit=2)
+        assert time.perf_counter() - start < 0.4             # sequential would take 0.6s
+        assert backend.calls == 6
+        assert results[0] == results[-1] and results[0] is not results[-1]
+        assert [res[0]['title'] for res in results[:2]] == ['topic 0 (1)', 'topic 1 (1)']
+        client.close()
+
+    def test_async_batch_over_pooled_client(self, tmp_path):
+        import asyncio
+        import httpx
+        sent = []
+
+        def handler(request):
+            query = json.loads(request.content)['query']
+            sent.append(query)
+            if query == 'broken':
+                return httpx.Response(503)
+            return httpx.Response(200, json={'results': [
+                {'title': query, 'url': f'https://{query}.example', 'content': 'x' * 300}]})
+
+        client = self._client(tmp_path, self._tavily(handler))
+        results = asyncio.run(client.asearch_many(['alpha', 'broken', 'ALPHA', 'beta']))
+        assert sorted(sent) == ['alpha', 'beta', 'broken']
+        assert results[0] == results[2] == [{'title': 'alpha', 'url': 'https://alpha.example',
+                                             'snippet': 'x' * 200}]
+        assert str(results[1]) == 'Tavily API returned 503'
+        assert client.requests == 2                            # failures are not cached
+
+    def test_failed_search_is_retried(self, tmp_path):
+        import httpx
+        from backend.utilities.web_search import SearchError
+        statuses = [500, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={'results': []})
+
+        client = self._client(tmp_path, self._tavily(handler))
+        with pytest.raises(SearchError, match='500'):
+            client.search('retry me')
+        assert client.search('retry me') == []
+        assert statuses == []
+
+    def test_malformed_response_is_a_search_error(self, tmp_path):
+        import httpx
+        from backend.utilities.web_search import SearchError
+        bodies = {'html': b'<html>busy</html>', 'list': b'[1, 2]', 'items': b'{"results": ["x"]}',
+                  'good': b'{"results": [{"title": "ok", "url": "https://ok.example"}]}'}
+
+        def handler(request):
+            return httpx.Response(200, content=bodies[json.loads(request.content)['query']])
+
+        client = self._client(tmp_path, self._tavily(handler))
+        with pytest.raises(SearchError, match='malformed'):
+            client.search('html')
+        results = client.search_many(['html', 'list', 'items', 'good'])
+        assert [type(res).__name__ for res in results[:3]] == ['SearchError'] * 3
+        assert results[3] == [{'title': 'ok', 'url': 'https://ok.example', 'snippet': ''}]
+
+    def test_content_service_uses_fake_backend(self, tmp_db, monkeypatch):
+        monkeypatch.delenv('TAVILY_API_KEY', raising=False)
+        monkeypatch.delenv('HUGO_SEARCH_BACKEND', raising=False)
+        svc = ContentService()
+        assert svc.web_search('cheetahs')['_error'] == 'auth_error'
+
+        monkeypatch.setenv('HUGO_SEARCH_BACKEND', 'fake')
+        result = svc.web_search('cheetahs', limit=2)
+        assert result['_success'] is True
+        assert result['count'] == 2 and result['query'] == 'cheetahs'
+        assert set(result['items'][0]) == {'title', 'url', 'snippet'}
+        batch = svc.web_search_batch(['cheetahs', 'lions'], limit=2)
+        assert [res['query'] for res in batch['results']] == ['cheetahs', 'lions']
+        assert batch['results'][0]['items'] == result['items']
+        assert (tmp_db / '.search_cache.db').exists()
+
+
 # ═══════════════════════════════════════════════════════════════════
 # AnalysisService
 # ═══════════════════════════════════════════════════════════════════
@@ -1501,6 +2248,70 @@ class TestAnalysisService:
         assert result['_success'] is True
         assert 'Check for clarity' in result['guide']
 
+    def test_readability_figures(self, tmp_db):
+        text = 'Cheetahs sprint remarkably quickly! Researchers measured acceleration. Does endurance matter?'
+        result = AnalysisService().check_readability(text)
+        assert result == {'_success': True, 'flesch_kincaid_grade': 12.9, 'gunning_fog': 17.3,
+                          'avg_sentence_length': 3.3, 'avg_word_length': 8.4,
+                          'sentence_count': 3, 'score_label': 'advanced'}
+
+    def test_inspect_post_figures(self, tmp_db):
+        body = ('## Intro\n\nSee [the study](https://x.org) and ![chart](c.png).\nMore <b>bold</b> words.'
+                '\n\n### Deep Dive\n\nShort para.\n\n## Empty\n')
+        post_id, _ = _seed_test_post(tmp_db, title='Figures', body=body)
+        result = AnalysisService().inspect_post(post_id)
+        assert {key: result[key] for key in ('word_count', 'section_count', 'heading_depth', 'image_count',
+                'link_count', 'avg_paragraph_length', 'empty_sections')} == {
+            'word_count': 17, 'section_count': 2, 'heading_depth': 3, 'image_count': 1,
+            'link_count': 1, 'avg_paragraph_length': 3.4, 'empty_sections': ['empty']}
+
+    def test_stats_are_measured_once_per_content(self, tmp_db, monkeypatch):
+        from backend.utilities import text_stats as text_stats_module
+        target, _ = _seed_test_post(tmp_db, title='Target', body='## Intro\n\nOne short line here.\n')
+        ref, _ = _seed_test_post(tmp_db, title='Reference', body='## Intro\n\nA longer reference line.\n')
+        built = []
+        real_init = text_stats_module.TextStats.__init__
+        monkeypatch.setattr(text_stats_module.TextStats, '__init__',
+                            lambda self, text: built.append(text) or real_init(self, text))
+        svc = AnalysisService()
+        first = svc.compare_style(target, [ref])
+        assert svc.compare_style(target, [ref]) == first
+        svc.analyze_seo(ref, target_keyword='reference')
+        assert len(built) == 2
+        ContentService().revise_content(ref, 'intro', 'Rewritten reference line.')
+        assert svc.compare_style(target, [ref])['references'][0]['word_count'] == 5
+        assert len(built) == 3
+
+    def test_guide_read_once_until_edited(self, tmp_db):
+        svc = AnalysisService()
+        guide_path = svc._guides_dir / 'editor_guide.md'
+        guide_path.write_text('# Editor Guide\n\nCheck for clarity.')
+        for _ in range(4):
+            assert 'clarity' in svc.editor_review('draft text')['guide']
+        assert svc._references.reads == 1
+        guide_path.write_text('# Editor Guide\n\nCut every adverb, always.')
+        assert 'adverb' in svc.editor_review('draft text')['guide']
+        guide_path.unlink()
+        assert svc.editor_review('draft text')['_error'] == 'not_found'
+
+    def test_reference_profiles_skip_repeated_reads(self, tmp_db, monkeypatch):
+        target, _ = _seed_test_post(tmp_db, title='Target', body='## Intro\n\nOne short line here.\n')
+        refs = [_seed_test_post(tmp_db, title=f'Canon {idx}', body=f'## Intro\n\nCanon body {idx}.\n')[0]
+                for idx in range(3)]
+        svc = AnalysisService()
+        first = svc.compare_style(target, refs)
+        reads = []
+        real_read = AnalysisService._read_content
+        monkeypatch.setattr(AnalysisService, '_read_content',
+                            lambda self, filename: reads.append(filename) or real_read(self, filename))
+        assert svc.compare_style(target, refs) == first
+        assert reads == []
+        ContentService().revise_content(refs[1], 'intro', 'Canon body one, now rewritten at length.')
+        again = svc.compare_style(target, refs)
+        assert len(reads) == 1
+        assert again['references'][1]['word_count'] == 9
+        assert set(svc._references.stats()['profiles']) == {target, *refs}
+
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -1597,6 +2408,67 @@ class TestSnapshotInfra:
         assert bundle['content'][0]['sec_id'] == 'hungry-for-power'
         assert any('Original prose about power' in line for line in bundle['content'][0]['lines'])
 
+    @staticmethod
+    def _versions(count:int) -> list[list[dict]]:
+        """Whole-post section lists of a long post, each version editing one line of one section."""
+        sections = [{'sec_id': f'sec-{idx}', 'lines': [f'Sentence {line} of section {idx}.'
+                                                       for line in range(40)]} for idx in range(6)]
+        versions = []
+        for step in range(count):
+            sections = [dict(sec, lines=list(sec['lines'])) for sec in sections]
+            sections[step % len(sections)]['lines'][step] = f'Edited at step {step}.'
+            if step == 2:
+                sections.pop()                       # a removed section survives as full lines
+            versions.append(sections)
+        return versions
+
+    def test_older_snapshots_are_deltas_and_read_back_exactly(self, tmp_db):
+        svc = ToolService()
+        versions = self._versions(5)
+        ids = [svc.take_snapshot(post_id='post_a', turn_id=idx, flow_name='polish',
+                                 summary=f'turn {idx}', sections=sections)
+               for idx, sections in enumerate(versions)]
+        for snap_id, sections in zip(ids, versions):
+            assert svc.read_snapshot(snap_id)['content'] == sections
+        newest = json.loads((svc._snap_root / f'{ids[-1]}.json').read_text())
+        oldest = json.loads((svc._snap_root / f'{ids[0]}.json').read_text())
+        assert 'content' in newest and oldest['base'] == ids[1] and 'content' not in oldest
+        full_copies = sum(len(json.dumps({'content': sections})) for sections in versions)
+        assert svc._snapshots.disk_bytes() < full_copies / 2
+
+    def test_gc_and_delete_touch_only_affected_snapshots(self, tmp_db, monkeypatch):
+        from backend.utilities.snapshot_store import SnapshotStore
+        svc = ToolService()
+        for idx, sections in enumerate(self._versions(svc.max_snapshots)):
+            svc.take_snapshot(post_id='post_a', turn_id=idx, flow_name='polish',
+                              summary=f'turn {idx}', sections=sections)
+        loads = []
+        original = SnapshotStore._load
+        monkeypatch.setattr(SnapshotStore, '_load',
+                            lambda store, snap_id: loads.append(snap_id) or original(store, snap_id))
+        svc.take_snapshot(post_id='post_a', turn_id=99, flow_name='polish', summary='gc',
+                          sections=self._versions(1)[0])
+        assert loads == [f'snap_{svc.max_snapshots}']   # only the previous newest is re-encoded
+        assert len(svc.list_snapshots()) == svc.max_snapshots
+        assert not (svc._snap_root / 'snap_1.json').exists()
+        assert svc.read_snapshot(svc.list_snapshots()[-1]) is not None   # chain intact after GC
+        loads.clear()
+        assert svc._snapshots.remove_post('post_a') == svc.max_snapshots
+        assert loads == [] and svc.list_snapshots() == []
+        assert sorted(path.name for path in svc._snap_root.iterdir()) == ['manifest.json']
+
+    def test_manifestless_snapshot_dir_is_adopted(self, tmp_db):
+        svc = ToolService()
+        for idx in (3, 7):
+            (svc._snap_root / f'snap_{idx}.json').write_text(json.dumps({
+                'post_id': 'post_a', 'turn_id': idx, 'flow_name': 'polish', 'summary': 'old',
+                'content': [{'sec_id': 'intro', 'lines': [f'v{idx}']}]}))
+        assert svc.list_snapshots() == ['snap_7', 'snap_3']
+        assert svc.read_snapshot('snap_3')['content'][0]['lines'] == ['v3']
+        new_id = svc.take_snapshot(post_id='post_a', turn_id=8, flow_name='polish', summary='new',
+                                   sections=[{'sec_id': 'intro', 'lines': ['v8']}])
+        assert new_id == 'snap_8' and svc.read_snapshot('snap_7')['content'][0]['lines'] == ['v7']
+
 
 # ═══════════════════════════════════════════════════════════════════
 # Pillar 1 snapshot harness — DIY helper smoke tests
@@ -1922,6 +2794,47 @@ def test_loader_reads_flow_prompt():
     assert body and not body.startswith('---') and '## Process' in body
 
 
+class TestPromptRegistry:
+    """backend/utilities/prompt_registry.py: load and validate once, serve from memory, mtime
+    reload in dev mode, per-prompt token counts."""
+
+    def test_gets_do_no_file_io(self, tmp_path, monkeypatch):
+        from backend.utilities.prompt_registry import PromptRegistry
+        (tmp_path / 'outline.md').write_text('## Process\n\nOutline the post.', encoding='utf-8')
+        registry = PromptRegistry(tmp_path)
+
+        def no_io(*args, **kwargs):
+            raise AssertionError('prompt read from disk on the policy path')
+        monkeypatch.setattr(_Path, 'read_text', no_io)
+        monkeypatch.setattr(_Path, 'stat', no_io)
+        assert registry.get('outline').startswith('## Process')
+        with pytest.raises(FileNotFoundError):
+            registry.get('missing')
+
+    def test_hot_reload_follows_mtime(self, tmp_path):
+        import os
+        from backend.utilities.prompt_registry import PromptRegistry
+        path = tmp_path / 'outline.md'
+        path.write_text('first', encoding='utf-8')
+        registry = PromptRegistry(tmp_path, hot_reload=True)
+        path.write_text('second', encoding='utf-8')
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        assert registry.get('outline') == 'second' and registry.reloads == 1
+        assert registry.get('outline') == 'second' and registry.reloads == 1
+
+    def test_empty_prompt_fails_at_load(self, tmp_path):
+        from backend.utilities.prompt_registry import PromptRegistry
+        (tmp_path / 'blank.md').write_text('  \n', encoding='utf-8')
+        with pytest.raises(ValueError, match='empty'):
+            PromptRegistry(tmp_path)
+
+    def test_engineer_reports_token_counts(self):
+        stats = PromptEngineer.prompt_stats()
+        assert set(stats['flows']['prompts']) == set(_flow_files())
+        assert stats['flows']['prompts']['outline']['tokens'] > 0
+        assert stats['skills']['prompts']['plan']['tokens'] > 0
+
+
 def test_skill_system_ends_with_reminder():
     """The agentic reminder closes every assembled sub-agent system prompt, with or without a body."""
     flow = flow_classes['outline']()
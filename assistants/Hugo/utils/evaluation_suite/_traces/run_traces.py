@@ -13,13 +13,17 @@ hits the target, and a drop below it turns the gate red.
   python utils/evaluation_suite/_traces/run_traces.py                 # score corpus, grade vs baselines
   python utils/evaluation_suite/_traces/run_traces.py --record        # stamp the run into the baseline
   python utils/evaluation_suite/_traces/run_traces.py --ids B01.C01,B01.C08   # subset (human-read)
+  python utils/evaluation_suite/_traces/run_traces.py --workers 4     # 4 scenarios at a time, sandboxed
+  python utils/evaluation_suite/_traces/run_traces.py --fake-llm 300  # offline deterministic model, 300ms/call
 
 Wall times (per turn, per conversation, total) are printed in every run and read against the
 latency ideals in evaluation_suite.md (TTFT <= 5s | turn <= 10s | convo <= 60s | 8-scenario gate
-<= 10 min) — measured, never gated. TTFT prints n/a until streaming lands (step 6). The one gated
-latency metric is mean_turn_seconds (red past baseline +20%).
+<= 10 min) — measured, never gated. TTFT is the time to the first streamed reply delta (turns that
+stream nothing are left out of it). The one gated latency metric is mean_turn_seconds (red past
+baseline +20%).
 """
 import argparse
+import json
 import re
 import sys
 import time
@@ -33,7 +37,8 @@ if str(_HUGO_ROOT) not in sys.path:
 # harness flips schemas.config.EVAL_HARNESS + loads .env at import — wanted here.
 from utils.evaluation_suite.harness import (
     _build_agent, _seed_post, _clean_leftovers, _TURN_TIMEOUT_SEC, load_cases, sample,
-    seed_active_post, snapshot_post_ids, clean_created_posts)
+    seed_active_post, snapshot_post_ids, clean_created_posts, enable_llm_cache, enable_fake_llm)
+from utils.evaluation_suite.parallel import run_cases
 from utils.evaluation_suite.scoring import is_completed, tool_similarity
 from utils.evaluation_suite import scoring as gates
 from utils.evaluation_suite.trace_writer import (
@@ -72,15 +77,27 @@ def _install_tool_logger(agent) -> list:
     return log
 
 
-def _run_turn(agent, utterance:str) -> dict:
+def _run_turn(agent, utterance:str) -> tuple[dict, float | None]:
     """Run one user turn with a timeout guard, keeping the FULL result dict — completion needs
-    result['artifact']['origin'], not just the message."""
+    result['artifact']['origin'], not just the message. Also returns the time to the first
+    streamed reply delta in seconds (None when the turn streamed nothing). Only the round that
+    produces the reply counts: a `progress` event marks the round before it as a tool round, so
+    any preamble it streamed is discarded and the clock waits for the next round's first delta."""
+    start = time.time()
+    first_token = []
+
+    def on_event(event:dict):
+        if event.get('stream') == 'progress':
+            first_token.clear()
+        elif event.get('stream') == 'delta' and not first_token:
+            first_token.append(time.time() - start)
     with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(agent.take_turn, utterance)
+        future = executor.submit(agent.take_turn, utterance, on_event=on_event)
         try:
-            return future.result(timeout=_TURN_TIMEOUT_SEC)
+            result = future.result(timeout=_TURN_TIMEOUT_SEC)
         except FuturesTimeoutError:
-            return {'message': '(turn timed out)', 'artifact': None}
+            result = {'message': '(turn timed out)', 'artifact': None}
+    return result, (first_token[0] if first_token else None)
 
 
 def _normalize_post(post) -> dict:
@@ -117,7 +134,7 @@ def _top_pred_flow(agent):
     return pred[0]['name'] if pred else None
 
 
-def _run_case(case:dict, domain_tools:set, report_path:Path) -> tuple[int, int, list, list, list]:
+def _run_case(case:dict, domain_tools:set, report_path:Path) -> tuple[int, int, list, list, list, list]:
     """Run one scenario inside a content-library boundary that is restored even on failure."""
     before = snapshot_post_ids()
     try:
@@ -126,10 +143,10 @@ def _run_case(case:dict, domain_tools:set, report_path:Path) -> tuple[int, int,
         clean_created_posts(before)
 
 
-def _run_case_inner(case:dict, domain_tools:set, report_path:Path) -> tuple[int, int, list, list, list]:
+def _run_case_inner(case:dict, domain_tools:set, report_path:Path) -> tuple[int, int, list, list, list, list]:
     """Seed declared posts, run the user turns, score completion + tool similarity per turn. Returns
     (completed_user_turns, total_user_turns, per_turn_tool_similarities, per_turn_seconds,
-    trace_records)."""
+    trace_records, per_turn_ttft_seconds)."""
     seeded = []
     for entry in case.get('available_data', {}).get('posts', []):
         post = _normalize_post(entry)
@@ -140,7 +157,7 @@ def _run_case_inner(case:dict, domain_tools:set, report_path:Path) -> tuple[int,
     seed_active_post(agent, case, seeded)
     tool_log = _install_tool_logger(agent)
     completed = total = 0
-    sims, turn_secs, records = [], [], []
+    sims, turn_secs, records, ttfts = [], [], [], []
     for idx, turn in enumerate(case['turns']):
         if turn.get('role') != 'user':
             continue
@@ -148,9 +165,11 @@ def _run_case_inner(case:dict, domain_tools:set, report_path:Path) -> tuple[int,
         mark = len(tool_log)
         belief_before = belief_snapshot(agent)
         start = time.time()
-        result = _run_turn(agent, turn['utterance'])
+        result, ttft = _run_turn(agent, turn['utterance'])
         elapsed = time.time() - start
         turn_secs.append(elapsed)
+        if ttft is not None:
+            ttfts.append(ttft)
         turn_tools = tool_log[mark:]
         all_tools = [entry['name'] for entry in turn_tools]
         actual = [entry['name'] for entry in turn_tools if entry['name'] in domain_tools]
@@ -174,25 +193,28 @@ def _run_case_inner(case:dict, domain_tools:set, report_path:Path) -> tuple[int,
         records.append(record)
         belief_label = f"{_top_pred_flow(agent) or '-'} / {agent.world.state.confidence:.2f}"
         print(f"  {case['convo_id']} t{total}: {diagnosis} | complete={'yes' if ok else 'no'} "
-              f"| tools={sim:.2f} | belief={belief_label} | {elapsed:.1f}s")
+              f"| tools={sim:.2f} | belief={belief_label} | {elapsed:.1f}s"
+              f"{f' (ttft {ttft:.1f}s)' if ttft is not None else ''}")
     agent.close()
 
     for post_id, title in seeded:
         _clean_leftovers(post_id, title)
-    return completed, total, sims, turn_secs, records
+    return completed, total, sims, turn_secs, records, ttfts
 
 
-def _score_corpus(ids:list|None=None, report_path:Path|None=None) -> dict:
+def _score_corpus(ids:list|None=None, report_path:Path|None=None, workers:int=1,
+                  options:dict|None=None, sandbox:bool=False) -> dict:
     domain_tools = _domain_tools()
     cases = load_cases(ids)
     report_path = report_path or make_report_path('traces')
     sweep_start = time.time()
-    results = [_run_case(case, domain_tools, report_path) for case in cases]
+    results = run_cases(_run_case, cases, (domain_tools,), report_path, workers, options, sandbox)
     done = sum(r[0] for r in results)
     total = sum(r[1] for r in results)
     sims = [sim for r in results for sim in r[2]]
     turn_secs = [sec for r in results for sec in r[3]]
     records = [record for r in results for record in r[4]]
+    ttfts = [sec for r in results for sec in r[5]]
     for case, result in zip(cases, results):
         transcript = f"database/sessions/{case['convo_id']}/history.jsonl"
         print(f"{case['convo_id']}: {result[0]}/{result[1]} completed in "
@@ -202,8 +224,10 @@ def _score_corpus(ids:list|None=None, report_path:Path|None=None) -> dict:
     # convo <= 60s, 8-scenario gate <= 10 min). mean_turn_seconds alone gates, at baseline +20%.
     worst_convo = max(sum(r[3]) for r in results) if results else 0.0
     worst_turn = max(turn_secs) if turn_secs else 0.0
+    ttft = (f'TTFT mean {sum(ttfts) / len(ttfts):.1f}s worst {max(ttfts):.1f}s' if ttfts
+            else 'TTFT n/a (nothing streamed)')
     print(f'wall time: total {sweep_secs:.0f}s | worst convo {worst_convo:.0f}s | '
-          f'worst turn {worst_turn:.1f}s | TTFT n/a (no streaming) | {len(cases)} scenarios')
+          f'worst turn {worst_turn:.1f}s | {ttft} | {len(cases)} scenarios, {workers} worker(s)')
     return {
         'completion_rate': round(done / total, 4) if total else 0.0,
         'tool_match_rate': round(sum(sims) / len(sims), 4) if sims else 0.0,
@@ -221,7 +245,16 @@ def main():
     parser.add_argument('--sample', type=int, default=8, help='fresh sample size when no --ids given')
     parser.add_argument('--seed', default=None, help='seed for reproducible samples')
     parser.add_argument('--jsonl', action='store_true', help='accepted for compatibility; JSONL is always written')
+    parser.add_argument('--llm-cache', default='',
+                        help='SQLite file that records model responses and replays them on later runs')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='scenarios run concurrently, each worker in its own database/ sandbox')
+    parser.add_argument('--fake-llm', nargs='?', type=float, const=0.0, default=None, metavar='MS',
+                        help='offline deterministic model (optional per-call delay in ms)')
     args = parser.parse_args()
+    cache = enable_llm_cache(args.llm_cache) if args.llm_cache else None
+    fake = enable_fake_llm(args.fake_llm) if args.fake_llm is not None else None
+    options = {'llm_cache': args.llm_cache, 'fake_llm_ms': args.fake_llm}
 
     explicit = [cid.strip() for cid in args.ids.split(',') if cid.strip()]
     if explicit:
@@ -233,13 +266,17 @@ def main():
     report_path = make_report_path(args.level)
     print(f"trace ids: {','.join(ids) if ids is not None else 'ALL'}")
     print(f"trace report: {report_path.relative_to(_HUGO_ROOT)}")
-    metrics = _score_corpus(ids, report_path)
+    metrics = _score_corpus(ids, report_path, args.workers, options)
     diagnoses = metrics.pop('_diagnoses')
     print(f"completion_rate={metrics['completion_rate']} "
           f"tool_match_rate={metrics['tool_match_rate']} "
           f"mean_turn_seconds={metrics['mean_turn_seconds']}")
     if diagnoses:
         print(f"diagnoses: {diagnoses}")
+    if cache is not None and args.workers <= 1:
+        print(f"llm cache: {cache.stats()}")
+    if fake is not None and args.workers <= 1:
+        print(f"fake llm calls: {dict(fake.calls)}")
     if subset:
         return  # dev / chosen subsets are read by a human, not graded against the train baseline
 
@@ -0,0 +1,131 @@
+"""Deterministic local stand-in for every model call an eval Agent makes (`--fake-llm`).
+
+`FakeLLM.install(engineer)` swaps the PromptEngineer's provider methods (`_call_claude` and the
+other families, their tool loops) and the TypeSafe System-1 call for local functions. Each reply is
+derived from a SHA-256 of the request: plain prompts get a short tagged sentence, schema-constrained
+prompts get the smallest object that validates against the schema (one pick per enum array, picks
+varying with the hash), TypeSafe gets a low-NOUL answer set. The same scenario therefore produces
+the same run every time — offline, free, and with no API keys — which is what the parallel runner
+needs to be benchmarked. `delay_ms` sleeps on every call so runs keep a provider-like wall-clock
+shape.
+
+The agent never calls a tool under the fake (every round ends with text), so completion and tool
+scores from a fake run measure the harness, not the agent.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+
+
+def _digest(*parts) -> str:
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def instance_for(schema:dict, seed:int, defs:dict|None=None):
+    """The smallest value that validates against a JSON schema; `seed` picks among enum options."""
+    defs = defs if defs is not None else schema.get('$defs', {})
+    if '$ref' in schema:
+        return instance_for(defs[schema['$ref'].rsplit('/', 1)[-1]], seed, defs)
+    if 'enum' in schema:
+        return schema['enum'][seed % len(schema['enum'])]
+    if 'const' in schema:
+        return schema['const']
+    for key in ('anyOf', 'oneOf'):
+        if key in schema:
+            return instance_for(schema[key][0], seed, defs)
+    kind = schema.get('type')
+    if isinstance(kind, list):
+        kind = next((name for name in kind if name != 'null'), 'null')
+    match kind:
+        case 'object':
+            props = schema.get('properties', {})
+            return {name: instance_for(props[name], seed + idx, defs)
+                    for idx, name in enumerate(schema.get('required', list(props)))}
+        case 'array':
+            items = schema.get('items', {})
+            count = max(schema.get('minItems', 0), 1 if 'enum' in items else 0)   # a pick, not []
+            return [instance_for(items, seed + idx, defs) for idx in range(count)]
+        case 'string':  return ''
+        case 'integer': return 0
+        case 'number':  return 0.0
+        case 'boolean': return False
+        case 'null':    return None
+    return {}
+
+
+class FakeLLM:
+
+    def __init__(self, delay_ms:float=0.0):
+        self.delay_s = delay_ms / 1000
+        self.calls:Counter = Counter()
+        self._lock = threading.Lock()
+
+    def install(self, engineer):
+        engineer._call_claude = self.call_claude
+        engineer._call_gemini = engineer._call_gpt = engineer._call_together = self.call_text
+        engineer._call_gemini_with_tools = self.call_with_tools
+        engineer._call_gpt_with_tools = self.call_with_tools
+        engineer._call_together_with_tools = self.call_with_tools
+        engineer.typesafe = self.typesafe
+
+        async def atypesafe(document:dict, questions:dict) -> dict:
+            return self.typesafe(document, questions)
+        engineer.atypesafe = atypesafe
+        return engineer
+
+    # -- Provider stand-ins -------------------------------------------------
+
+    def call_claude(self, system, messages, model_id, *, tools=None, max_tokens=4096,
+                    schema_dict=None, on_text=None):
+        import anthropic
+        text = self._reply('claude', system, messages, schema_dict, on_text)
+        return anthropic.types.Message.model_validate({
+            'id': f'msg_fake_{_digest(system, messages)[:12]}', 'type': 'message',
+            'role': 'assistant', 'model': model_id, 'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': len(str(messages)) // 4, 'output_tokens': len(text) // 4}})
+
+    def call_text(self, system, messages, model_id, max_tokens=4096, schema_dict=None, on_text=None):
+        return self._reply('text', system, messages, schema_dict, on_text)
+
+    def call_with_tools(self, system, msgs, model_id, tool_defs, call_tool, max_tokens,
+                        max_num_calls, schema_dict=None):
+        return self._reply('tools', system, msgs, schema_dict, None), []
+
+    def typesafe(self, document:dict, questions:dict) -> dict:
+        self._tick('typesafe')
+        seed = int(_digest(document)[:8], 16)
+        answers = {}
+        for name, question in questions.items():
+            match question.get('type'):
+                case 'choice':
+                    options = list(question.get('criteria', {}))
+                    answers[name] = {'choice': options[seed % len(options)] if options else ''}
+                case 'noul':  answers[name] = {'noul': 0.0}
+                case 'score': answers[name] = {'score': 0.5}
+                case _:       answers[name] = {}
+        return answers
+
+    # -- Helpers ------------------------------------------------------------
+
+    def _reply(self, kind:str, system, messages, schema_dict, on_text) -> str:
+        self._tick(kind)
+        digest = _digest(system, messages, schema_dict)
+        if schema_dict is not None:
+            text = json.dumps(instance_for(schema_dict, int(digest[:8], 16)))
+        else:
+            text = f'[fake {digest[:8]}] Done — here is what I found.'
+        if on_text:
+            on_text(text)
+        return text
+
+    def _tick(self, kind:str):
+        with self._lock:
+            self.calls[kind] += 1
+        if self.delay_s:
+            time.sleep(self.delay_s)
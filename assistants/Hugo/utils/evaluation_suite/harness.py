@@ -72,9 +72,8 @@ def _clean_leftovers(post_id:str, title:str):
     from backend.utilities.services import PostService
     svc = PostService()
     svc.delete_post(post_id)
-    for entry in svc.list_preview().get('items', []):
-        if entry.get('title', '').lower() == title.lower():
-            svc.delete_post(entry['post_id'])
+    for entry in svc._store.find_title(title):
+        svc.delete_post(entry['post_id'])
 
 
 def snapshot_post_ids() -> set[str]:
@@ -92,6 +91,35 @@ def clean_created_posts(before:set[str]):
         service.delete_post(post_id)
 
 
+# One response cache shared by every harness-built Agent once `enable_llm_cache` runs (None = live calls).
+_LLM_CACHE = None
+
+
+def enable_llm_cache(path) -> object:
+    """Serve every harness-built Agent's model calls from one persistent response cache at `path`.
+    Entries never expire, so re-running the same ids replays the first run offline and
+    deterministically; anything not yet recorded is fetched live and added. Returns the cache so the
+    runner can print its hit/miss counters."""
+    global _LLM_CACHE
+    from backend.utilities.response_cache import ResponseCache
+    _LLM_CACHE = ResponseCache(Path(path).resolve(), max_entries=4096, ttl_s={'default': None})
+    return _LLM_CACHE
+
+
+# The deterministic local model every harness-built Agent uses once `enable_fake_llm` runs (None = real).
+_FAKE_LLM = None
+
+
+def enable_fake_llm(delay_ms:float=0.0) -> object:
+    """Route every harness-built Agent's model and TypeSafe calls to the offline `FakeLLM`, sleeping
+    `delay_ms` per call. Runs become free and repeatable; use it to benchmark the runner, not the
+    agent. Returns the fake so the runner can print its call counts."""
+    global _FAKE_LLM
+    from utils.evaluation_suite.fake_llm import FakeLLM
+    _FAKE_LLM = FakeLLM(delay_ms)
+    return _FAKE_LLM
+
+
 def _build_agent(session_id:str|None=None):
     """Orchestrator-path Agent with debug=True. Pass a `session_id` (the convo_id) to name the
     session dir after the scenario, so its transcript persists at a findable
@@ -103,6 +131,10 @@ def _build_agent(session_id:str|None=None):
     agent_mod.load_config = lambda: load_config(overrides={'debug': True})
     agent = agent_mod.Assistant(username='trace_user')
     agent_mod.load_config = orig_load
+    if _LLM_CACHE is not None:
+        agent.engineer.response_cache = _LLM_CACHE
+    if _FAKE_LLM is not None:
+        _FAKE_LLM.install(agent.engineer)
     if session_id:
         agent.world.open_session(session_id)   # bind the scenario-named dir
         agent.world.reset()                     # clear any stale run so the transcript starts fresh
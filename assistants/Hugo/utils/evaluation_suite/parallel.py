@@ -0,0 +1,124 @@
+"""Worker-pool runner for the live tiers (Traces and Evals) — `--workers N`.
+
+Scenarios are independent conversations, so they can run side by side. Each worker is a spawned
+process with its own copy of `database/` in a temp sandbox: the services, session dirs and L2
+preference store are re-rooted there before any Agent is built, so `_seed_post`, the
+`clean_created_posts` boundary and every session write stay private to the worker. A worker runs its
+scenarios one after another, exactly like the sequential runner.
+
+Trace records go to a per-worker part file next to the report (`<report>.w<pid>.jsonl`); once every
+scenario finishes the parts are merged into the report in scenario order and removed. Each finished
+scenario's session dir is swapped into the real `database/sessions/<convo_id>/`, so transcript
+paths printed by the runners keep pointing at a file that exists. With one worker (and no
+`sandbox`), nothing is sandboxed and scenarios run in-process against `database/` as before.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.evaluation_suite import harness
+
+_DATABASE = harness._HUGO_ROOT / 'database'
+_SESSIONS = _DATABASE / 'sessions'
+
+_SANDBOX:Path|None = None        # this worker's database/ copy (set by _init_worker)
+
+
+def run_cases(run_case, cases:list, args:tuple, trace_path:Path|None, workers:int=1,
+              options:dict|None=None, sandbox:bool=False) -> list:
+    """`run_case(case, *args, trace_path)` for every case, results in case order. `run_case` must be
+    a module-level function (it is pickled into the workers). `options` replays the harness switches
+    (`llm_cache`, `fake_llm_ms`) inside each worker, since workers do not share the parent's globals.
+    `sandbox` keeps a single worker off the real database/ too."""
+    if not cases:
+        return []
+    if workers <= 1 and not sandbox:
+        return [run_case(case, *args, trace_path) for case in cases]
+    sandbox_root = Path(tempfile.mkdtemp(prefix='hugo_eval_'))
+    context = multiprocessing.get_context('spawn')
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(cases)), mp_context=context,
+                                 initializer=_init_worker,
+                                 initargs=(str(sandbox_root), options or {})) as pool:
+            futures = [pool.submit(_run_in_sandbox, run_case, case, args, trace_path)
+                       for case in cases]
+            results = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(sandbox_root, ignore_errors=True)
+        if trace_path is not None:
+            merge_parts(trace_path, [case['convo_id'] for case in cases])
+    return results
+
+
+def merge_parts(trace_path:Path, order:list[str]):
+    """Fold every `<report>.w*.jsonl` part into `trace_path`, scenario by scenario in `order`."""
+    parts = sorted(trace_path.parent.glob(f'{trace_path.stem}.w*.jsonl'))
+    rank = {convo_id: idx for idx, convo_id in enumerate(order)}
+    lines = []
+    for part in parts:
+        lines += [line for line in part.read_text(encoding='utf-8').splitlines() if line.strip()]
+    lines.sort(key=lambda line: rank.get(json.loads(line).get('convo_id'), len(rank)))  # stable
+    if lines:
+        with trace_path.open('a', encoding='utf-8') as handle:
+            handle.write(''.join(line + '\n' for line in lines))
+    for part in parts:
+        part.unlink()
+
+
+# -- Worker side ---------------------------------------------------------
+
+def _init_worker(sandbox_root:str, options:dict):
+    """Copy database/ into a fresh sandbox and re-root every module-level path into it."""
+    global _SANDBOX
+    from backend.components import user_preferences, world
+    from backend.utilities import services
+    sandbox = Path(tempfile.mkdtemp(dir=sandbox_root, prefix='worker_')) / 'database'
+    shutil.copytree(_DATABASE, sandbox, ignore=shutil.ignore_patterns('sessions', '__pycache__'))
+    services._DB_DIR = sandbox
+    world._SESSIONS_DIR = sandbox / 'sessions'
+    user_preferences._MEMORY_DIR = sandbox / 'memory'
+    _SANDBOX = sandbox
+    if options.get('llm_cache'):
+        harness.enable_llm_cache(options['llm_cache'])
+    if options.get('fake_llm_ms') is not None:
+        harness.enable_fake_llm(options['fake_llm_ms'])
+
+
+def _run_in_sandbox(run_case, case:dict, args:tuple, trace_path:Path|None):
+    part = trace_path.with_name(f'{trace_path.stem}.w{os.getpid()}.jsonl') if trace_path else None
+    try:
+        return run_case(case, *args, part)
+    finally:
+        session = _SANDBOX / 'sessions' / case['convo_id']
+        if session.exists():
+            publish_session(session, _SESSIONS / case['convo_id'])
+        sys.stdout.flush()
+
+
+def publish_session(session:Path, target:Path):
+    """Swap a finished sandbox session into `target` whole. `--workers N` runs the trace and eval
+    levels side by side over the same ids, so two workers can publish one convo_id at once: each
+    stages a full copy next to the target and renames it into place, retiring whatever is there
+    first. The last rename wins and the directory is never a mix of both runs."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staged = Path(tempfile.mkdtemp(dir=target.parent, prefix=f'.{target.name}.'))
+    shutil.copytree(session, staged, dirs_exist_ok=True)
+    retired = staged.with_name(staged.name + '.old')
+    while True:
+        try:
+            os.replace(staged, target)           # atomic while target is absent (or empty)
+            return
+        except OSError:
+            pass
+        try:
+            os.replace(target, retired)
+        except FileNotFoundError:                # another worker retired it first; retry
+            continue
+        shutil.rmtree(retired, ignore_errors=True)
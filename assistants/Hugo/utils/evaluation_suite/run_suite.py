@@ -24,10 +24,16 @@ MODULES is an optional comma list (nlu, pex, mem) or 'all' (the default when the
   python utils/evaluation_suite/run_suite.py --traces          # trace-replay tier only
   python utils/evaluation_suite/run_suite.py --evals           # E2E eval tier only
   python utils/evaluation_suite/run_suite.py --all             # everything (all levels, all modules)
+  python utils/evaluation_suite/run_suite.py --workers 4       # levels side by side, 4 scenarios at a time
+
+`--workers N` (N > 1) starts every requested level at once — the live tiers sandbox each scenario
+worker's database/, so they no longer collide with each other or the tests — and prints each
+level's output as one block, in ladder order, once it finishes.
 """
 import argparse
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 _SUITE_DIR = Path(__file__).resolve().parent          # utils/evaluation_suite
@@ -50,6 +56,10 @@ def _modules(value:str) -> list:
     return [name.strip() for name in value.split(',') if name.strip()]
 
 
+def _worker_args(args) -> list:
+    return ['--workers', str(args.workers)] if args.workers > 1 else []
+
+
 def _selection_args(args) -> list:
     """Resolve suite-level live-tier selection once so traces and evals inspect the same cases."""
     if args.ids:
@@ -65,7 +75,7 @@ def _commands(args) -> list:
     """Build the (label, argv) list for the requested levels, in ladder order."""
     cmds = []
     run_live = args.traces or args.evals or args.combined_live
-    live_selection = _selection_args(args) if run_live else []
+    live_selection = [*_selection_args(args), *_worker_args(args)] if run_live else []
     if args.tests is not False:
         files = [f'{_TESTS}/{name}_unit_tests.py' for name in _modules(args.tests)]
         cmds.append(('tests (deterministic)',
@@ -83,6 +93,27 @@ def _commands(args) -> list:
     return cmds
 
 
+def _run_levels(cmds:list, concurrent:bool=False):
+    """Yield (label, exit code) per level in ladder order. Sequential levels stream their output;
+    concurrent ones all start at once and each prints as a block when it is its turn."""
+    if not concurrent:
+        for label, argv in cmds:
+            print(f'\n===== {label} =====', flush=True)
+            yield label, subprocess.call(argv, cwd=_HUGO_ROOT)
+        return
+    procs = []
+    for label, argv in cmds:        # spool to files, not pipes, so no level stalls on a full pipe
+        spool = tempfile.TemporaryFile(mode='w+')
+        procs.append((label, spool, subprocess.Popen(argv, cwd=_HUGO_ROOT, stdout=spool,
+                                                     stderr=subprocess.STDOUT, text=True)))
+    for label, spool, proc in procs:
+        code = proc.wait()
+        spool.seek(0)
+        print(f'\n===== {label} =====\n{spool.read()}', end='', flush=True)
+        spool.close()
+        yield label, code
+
+
 def _prune_trace_reports(keep:int):
     if keep < 0:
         return
@@ -112,6 +143,8 @@ def main():
     parser.add_argument('--seed', default=None, help='seed for reproducible traces/evals samples')
     parser.add_argument('--keep-traces', type=int, default=128,
                         help='keep only the most recent N trace JSONL files after the suite run')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='run levels concurrently and live scenarios N at a time (sandboxed)')
     parser.add_argument('--all', action='store_true', help='every level, every module')
     args = parser.parse_args()
 
@@ -127,9 +160,7 @@ def main():
         args.combined_live = True
 
     failures = []
-    for label, argv in _commands(args):
-        print(f'\n===== {label} =====', flush=True)
-        code = subprocess.call(argv, cwd=_HUGO_ROOT)
+    for label, code in _run_levels(_commands(args), concurrent=args.workers > 1):
         print(f'----- {label}: {"PASS" if code == 0 else "FAIL"} (exit {code}) -----')
         if code != 0:
             failures.append(label)
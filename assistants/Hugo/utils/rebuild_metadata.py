@@ -1,7 +1,8 @@
 """Rebuild metadata.json from disk content.
 
 Recomputes preview, word_count, and section_ids for every entry. With --apply, the index is synced
-to disk: new files are added and entries for missing files are removed.
+to disk: new files are added and entries for missing files are removed, and the full-text search
+index is rebuilt from scratch.
 
 Usage:
     python utils/rebuild_metadata.py # dry-run (shows changes) python utils/rebuild_metadata.py
@@ -70,6 +71,9 @@ def rebuild(apply=False):
     if apply:
         svc._save_metadata(entries)
         print('metadata.json written.')
+        # Content may have been edited on disk behind the services' back — re-index all of it.
+        indexed = svc._index.rebuild(entries, svc._read_content)
+        print(f'Search index rebuilt ({indexed} documents).')
     else:
         print('Dry run — pass --apply to write changes.')
 